@@ -0,0 +1,162 @@
+"""Benchmark compression of stored file contents.
+
+Compares the number of BSON bytes stored in the blobs collection and the
+latency for resolving the contents of a page of files when storing contents
+uncompressed versus compressed with each available codec.
+
+Usage:
+    python -m benchmarks.bench_compression [--files 2000] [--file-size 8000]
+
+Set environment variable `MONGO_URI` (e.g., `mongodb://localhost:27017`) to
+benchmark against a MongoDB instance; otherwise `mongomock` is used, which
+reports byte counts faithfully, but latencies only indicatively.
+"""
+
+import argparse
+from copy import deepcopy
+import os
+from statistics import median
+import time
+from typing import (List, Optional, Tuple)
+
+import bson
+
+from trs_filer.ga4gh.trs.endpoints.codecs import (
+    CODECS,
+    ContentCodec,
+)
+from trs_filer.ga4gh.trs.endpoints.files import (
+    resolve_contents,
+    store_files,
+)
+from tests.mock_data import MOCK_DESCRIPTOR_FILE
+
+TEMPLATE = """\
+cwlVersion: v1.0
+class: CommandLineTool
+id: tool_{i}
+baseCommand: [echo]
+inputs:
+  message_{i}:
+    type: string
+    inputBinding:
+      position: 1
+outputs:
+  output_{i}:
+    type: stdout
+"""
+
+
+def get_collections():
+    """Get empty benchmark collections for files and blobs."""
+    uri = os.environ.get('MONGO_URI')
+    if uri:
+        import pymongo
+        client = pymongo.MongoClient(uri)
+    else:
+        import mongomock
+        client = mongomock.MongoClient()
+    db = client['trs_filer_benchmarks']
+    for name in ('files', 'blobs'):
+        db[name].drop()
+    return db['files'], db['blobs']
+
+
+def make_content(i: int, file_size: int) -> str:
+    """Create distinct, descriptor-like file content of about given size."""
+    parts: List[str] = []
+    size = 0
+    while size < file_size:
+        parts.append(TEMPLATE.format(i=f"{i}_{len(parts)}"))
+        size += len(parts[-1])
+    return ''.join(parts)[:file_size]
+
+
+def populate(
+    db_coll_files,
+    db_coll_blobs,
+    codec: Optional[str],
+    n_files: int,
+    file_size: int,
+) -> None:
+    """Store files with distinct contents."""
+    files = []
+    for i in range(n_files):
+        _file = deepcopy(MOCK_DESCRIPTOR_FILE)
+        _file['tool_file']['path'] = f"path_{i}.cwl"
+        _file['file_wrapper']['content'] = make_content(i, file_size)
+        files.append(_file)
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id='tool',
+        version_id='version',
+        files=files,
+        codec=ContentCodec(codec=codec),
+    )
+
+
+def read(db_coll_files, db_coll_blobs, limit: int) -> List:
+    """Read a page of files with contents."""
+    return list(resolve_contents(
+        db_coll_blobs=db_coll_blobs,
+        files=db_coll_files.find({}, {'_id': False}).limit(limit),
+    ))
+
+
+def run(
+    codec: Optional[str],
+    n_files: int,
+    file_size: int,
+    limit: int,
+    repeats: int,
+) -> Tuple[int, float]:
+    """Return bytes stored and median latency per page."""
+    db_coll_files, db_coll_blobs = get_collections()
+    populate(db_coll_files, db_coll_blobs, codec, n_files, file_size)
+    n_bytes = sum(
+        len(bson.BSON.encode(blob)) for blob in db_coll_blobs.find()
+    )
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        read(db_coll_files, db_coll_blobs, limit)
+        timings.append(time.perf_counter() - start)
+    db_coll_files.drop()
+    db_coll_blobs.drop()
+    return n_bytes, median(timings)
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--file-size', type=int, default=8000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    codecs: List[Optional[str]] = [None]
+    for name in CODECS:
+        try:
+            ContentCodec(codec=name)
+        except ValueError as exc:
+            print(f"Skipping codec '{name}': {exc}")
+            continue
+        codecs.append(name)
+
+    print(f"{'codec':<8}{'bytes stored':>16}{'ratio':>8}{'ms/page':>12}")
+    baseline = None
+    for codec in codecs:
+        n_bytes, latency = run(
+            codec, args.files, args.file_size, args.limit, args.repeats
+        )
+        baseline = baseline or n_bytes
+        print(
+            f"{codec or 'none':<8}{n_bytes:>16}{baseline / n_bytes:>8.1f}"
+            f"{latency * 1000:>12.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark excluding version files when reading tool pages.
+
+Compares the number of BSON bytes returned by the database and the latency
+per page for reading full tool documents and then dropping version files in
+Python (previous behavior) versus excluding them via a server-side projection.
+
+Usage:
+    python -m benchmarks.bench_projection [--tools 2000] [--limit 1000]
+
+Set environment variable `MONGO_URI` (e.g., `mongodb://localhost:27017`) to
+benchmark against a MongoDB instance; otherwise `mongomock` is used, which
+reports byte counts faithfully, but latencies only indicatively.
+"""
+
+import argparse
+from copy import deepcopy
+import os
+from statistics import median
+import time
+from typing import (Callable, Dict, List, Tuple)
+
+import bson
+
+from trs_filer.ga4gh.trs.server import PROJECTION_TOOLS
+from tests.mock_data import (
+    MOCK_DESCRIPTOR_FILE,
+    MOCK_TOOL,
+)
+
+
+def get_collection():
+    """Get empty benchmark collection."""
+    uri = os.environ.get('MONGO_URI')
+    if uri:
+        import pymongo
+        client = pymongo.MongoClient(uri)
+    else:
+        import mongomock
+        client = mongomock.MongoClient()
+    coll = client['trs_filer_benchmarks']['projection']
+    coll.drop()
+    return coll
+
+
+def populate(coll, n_tools: int, n_files: int, file_size: int) -> None:
+    """Insert tools with large embedded descriptor files."""
+    docs = []
+    for i in range(n_tools):
+        tool = deepcopy(MOCK_TOOL)
+        tool['id'] = f"tool_{i}"
+        files = []
+        for j in range(n_files):
+            _file = deepcopy(MOCK_DESCRIPTOR_FILE)
+            _file['tool_file']['path'] = f"path_{j}.cwl"
+            _file['file_wrapper']['content'] = 'x' * file_size
+            files.append(_file)
+        tool['versions'][0]['files'] = files
+        docs.append(tool)
+    coll.insert_many(docs)
+
+
+def read_python_drop(coll, limit: int) -> Tuple[List[Dict], int]:
+    """Read full documents and drop files in Python."""
+    docs = list(coll.find({}, {'_id': False}).sort('_id', 1).limit(limit))
+    n_bytes = sum(len(bson.BSON.encode(doc)) for doc in docs)
+    for doc in docs:
+        for version in doc.get('versions', []):
+            version.pop('files', None)
+    return docs, n_bytes
+
+
+def read_projection(coll, limit: int) -> Tuple[List[Dict], int]:
+    """Read documents with files excluded by the database."""
+    docs = list(
+        coll.find({}, {**PROJECTION_TOOLS, '_id': False})
+        .sort('_id', 1).limit(limit)
+    )
+    n_bytes = sum(len(bson.BSON.encode(doc)) for doc in docs)
+    return docs, n_bytes
+
+
+def run(read: Callable, coll, limit: int, repeats: int) -> Tuple[int, float]:
+    """Return bytes read and median latency per page."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        __, n_bytes = read(coll, limit)
+        timings.append(time.perf_counter() - start)
+    return n_bytes, median(timings)
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tools', type=int, default=2000)
+    parser.add_argument('--files', type=int, default=10)
+    parser.add_argument('--file-size', type=int, default=10000)
+    parser.add_argument('--limit', type=int, default=1000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    coll = get_collection()
+    populate(coll, args.tools, args.files, args.file_size)
+    results = {
+        'drop in Python': run(
+            read_python_drop, coll, args.limit, args.repeats
+        ),
+        'projection': run(read_projection, coll, args.limit, args.repeats),
+    }
+    print(f"{'method':<16}{'bytes/page':>14}{'ms/page':>12}")
+    for method, (n_bytes, latency) in results.items():
+        print(f"{method:<16}{n_bytes:>14}{latency * 1000:>12.1f}")
+    coll.drop()
+
+
+if __name__ == '__main__':
+    main()
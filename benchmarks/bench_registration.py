@@ -0,0 +1,137 @@
+"""Benchmark registering tools one by one versus in batches.
+
+Compares the throughput (tools per second) of registering tools individually,
+as via `POST /tools`, versus in batches written with unordered bulk writes,
+as via `POST /tools:batchRegister`.
+
+Usage:
+    python -m benchmarks.bench_registration [--tools 1000] [--batch-size 100]
+
+Set environment variable `MONGO_URI` (e.g., `mongodb://localhost:27017`) to
+benchmark against a MongoDB instance; otherwise `mongomock` is used, which
+has no network round trips, so that the speedup is only indicative.
+"""
+
+import argparse
+from copy import deepcopy
+import os
+import time
+from typing import (Callable, Dict, List)
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+
+from trs_filer.custom_config import CustomConfig
+from trs_filer.ga4gh.trs.endpoints.register_objects import (
+    RegisterTool,
+    RegisterTools,
+)
+from tests.mock_data import (
+    CUSTOM_CONFIG,
+    MOCK_TOOL,
+    MONGO_CONFIG,
+)
+
+COLLECTIONS = (
+    'tools',
+    'toolclasses',
+    'files',
+    'blobs',
+    'facets',
+    'generations',
+)
+
+
+def get_app() -> Flask:
+    """Get app with empty benchmark collections."""
+    uri = os.environ.get('MONGO_URI')
+    if uri:
+        import pymongo
+        client = pymongo.MongoClient(uri)
+    else:
+        import mongomock
+        client = mongomock.MongoClient()
+    db = client['trs_filer_benchmarks']
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    for name in COLLECTIONS:
+        db[name].drop()
+        app.config.foca.db.dbs['trsStore'].collections[name].client = db[name]
+    db['tools'].create_index('id', unique=True)
+    db['toolclasses'].create_index('id', unique=True)
+    return app
+
+
+def make_tools(n_tools: int, with_files: bool) -> List[Dict]:
+    """Create tool payloads, each with a distinct tool class."""
+    tools = []
+    for i in range(n_tools):
+        tool = deepcopy(MOCK_TOOL)
+        tool['toolclass']['id'] = f"class_{i}"
+        if not with_files:
+            for version in tool['versions']:
+                version['files'] = []
+        tools.append(tool)
+    return tools
+
+
+def register_single(tools: List[Dict], batch_size: int) -> None:
+    """Register tools one by one."""
+    for tool in tools:
+        RegisterTool(data=tool).register_metadata()
+
+
+def register_bulk(tools: List[Dict], batch_size: int) -> None:
+    """Register tools in batches."""
+    for start in range(0, len(tools), batch_size):
+        results = RegisterTools(
+            items=[{'tool': tool} for tool in tools[start:start + batch_size]]
+        ).register_metadata()
+        assert not any('error' in result for result in results)
+
+
+def run(
+    register: Callable,
+    n_tools: int,
+    batch_size: int,
+    with_files: bool,
+) -> float:
+    """Return throughput in tools per second."""
+    app = get_app()
+    tools = make_tools(n_tools, with_files)
+    with app.app_context():
+        start = time.perf_counter()
+        register(tools, batch_size)
+        elapsed = time.perf_counter() - start
+    return n_tools / elapsed
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tools', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--with-files', action='store_true')
+    args = parser.parse_args()
+
+    results = {
+        'single': run(
+            register_single, args.tools, args.batch_size, args.with_files
+        ),
+        'bulk': run(
+            register_bulk, args.tools, args.batch_size, args.with_files
+        ),
+    }
+    print(f"{'method':<10}{'tools/s':>12}{'speedup':>10}")
+    for method, throughput in results.items():
+        print(
+            f"{method:<10}{throughput:>12.1f}"
+            f"{throughput / results['single']:>10.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
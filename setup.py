@@ -50,4 +50,9 @@ setup(
         "Tracker": "https://github.com/elixir-cloud-aai/trs-filer/issues",
     },
     install_requires=install_requires,
+    entry_points={
+        'console_scripts': [
+            'trs-filer = trs_filer.cli:main',
+        ],
+    },
 )
@@ -0,0 +1,94 @@
+"""Tests for streamed zip archives of tool version files."""
+
+from io import BytesIO
+from zipfile import ZipFile
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+
+from tests.mock_data import (
+    CUSTOM_CONFIG,
+    MOCK_FILES,
+    MOCK_ID,
+    MOCK_ID_2,
+    MONGO_CONFIG,
+)
+from trs_filer.custom_config import CustomConfig
+from trs_filer.ga4gh.trs.endpoints.archives import (
+    ArchiveCache,
+    get_archive_cache,
+    stream_zip,
+)
+
+ENTRIES = [
+    (_f['tool_file']['path'], _f['file_wrapper']['content'])
+    for _f in MOCK_FILES
+]
+
+
+def test_stream_zip():
+    """Test for building a zip archive incrementally."""
+    chunks = list(stream_zip(iter(ENTRIES)))
+    assert len(chunks) == len(ENTRIES) + 1
+    archive = ZipFile(BytesIO(b''.join(chunks)))
+    assert archive.namelist() == [path for path, _ in ENTRIES]
+    for path, content in ENTRIES:
+        assert archive.read(path) == content.encode()
+
+
+def test_stream_zip_empty():
+    """Test for building a zip archive without entries."""
+    archive = ZipFile(BytesIO(b''.join(stream_zip([]))))
+    assert archive.namelist() == []
+
+
+class TestArchiveCache:
+    """Tests for `ArchiveCache` class."""
+
+    def test_store_get(self, tmp_path):
+        """Test for caching an archive."""
+        cache = ArchiveCache(path=str(tmp_path))
+        assert cache.get(MOCK_ID) is None
+        data = b''.join(cache.store(MOCK_ID, stream_zip(ENTRIES)))
+        assert cache.get(MOCK_ID).read_bytes() == data
+
+    def test_store_incomplete(self, tmp_path):
+        """Test for not caching a partially consumed archive."""
+        cache = ArchiveCache(path=str(tmp_path))
+        chunks = cache.store(MOCK_ID, stream_zip(ENTRIES))
+        next(chunks)
+        chunks.close()
+        assert cache.get(MOCK_ID) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_store_size(self, tmp_path):
+        """Test for removing archives in excess of the cache size."""
+        cache = ArchiveCache(path=str(tmp_path), size=1)
+        b''.join(cache.store(MOCK_ID, stream_zip(ENTRIES)))
+        b''.join(cache.store(MOCK_ID_2, stream_zip(ENTRIES)))
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_disabled(self, tmp_path):
+        """Test for passing through archives with caching disabled."""
+        cache = ArchiveCache(path=str(tmp_path), size=0)
+        data = b''.join(cache.store(MOCK_ID, stream_zip(ENTRIES)))
+        assert data == b''.join(stream_zip(ENTRIES))
+        assert cache.get(MOCK_ID) is None
+        assert list(tmp_path.iterdir()) == []
+
+
+def test_get_archive_cache(tmp_path):
+    """Test for getting the archive cache of the app."""
+    app = Flask(__name__)
+    custom = CustomConfig(**CUSTOM_CONFIG)
+    custom.archive_cache.path = str(tmp_path)
+    custom.archive_cache.size = 1
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=custom,
+    )
+    with app.app_context():
+        cache = get_archive_cache()
+        assert cache is get_archive_cache()
+        assert str(cache.path) == str(tmp_path)
+        assert cache.size == 1
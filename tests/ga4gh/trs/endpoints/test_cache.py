@@ -0,0 +1,100 @@
+"""Tests for caching tool and version lookups."""
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+
+from tests.mock_data import (
+    CUSTOM_CONFIG,
+    MOCK_ID,
+    MOCK_ID_2,
+    MOCK_TOOL_CLASS,
+    MONGO_CONFIG,
+)
+from trs_filer.custom_config import CustomConfig
+from trs_filer.ga4gh.trs.endpoints.cache import (
+    get_tool_cache,
+    LRUCache,
+)
+
+
+class TestLRUCache:
+    """Tests for `LRUCache` class."""
+
+    def test_get_set(self):
+        """Test for retrieving cached entries."""
+        cache = LRUCache()
+        assert cache.get((MOCK_ID, None)) is None
+        cache.set((MOCK_ID, None), MOCK_TOOL_CLASS)
+        assert cache.get((MOCK_ID, None)) == MOCK_TOOL_CLASS
+        assert cache.stats == {'hits': 1, 'misses': 1, 'entries': 1}
+
+    def test_get_returns_copy(self):
+        """Test that modifying retrieved values leaves the cache intact."""
+        cache = LRUCache()
+        cache.set((MOCK_ID, None), {'id': MOCK_ID})
+        cache.get((MOCK_ID, None))['id'] = MOCK_ID_2
+        assert cache.get((MOCK_ID, None)) == {'id': MOCK_ID}
+
+    def test_eviction(self):
+        """Test for evicting least recently used entries."""
+        cache = LRUCache(size=2)
+        cache.set((MOCK_ID, None), 1)
+        cache.set((MOCK_ID, MOCK_ID), 2)
+        cache.get((MOCK_ID, None))
+        cache.set((MOCK_ID_2, None), 3)
+        assert cache.get((MOCK_ID, MOCK_ID)) is None
+        assert cache.get((MOCK_ID, None)) == 1
+        assert cache.get((MOCK_ID_2, None)) == 3
+
+    def test_expiry(self):
+        """Test for expiring entries."""
+        cache = LRUCache(ttl=-1)
+        cache.set((MOCK_ID, None), 1)
+        assert cache.get((MOCK_ID, None)) is None
+        assert cache.stats['entries'] == 0
+
+    def test_disabled(self):
+        """Test for disabling the cache."""
+        cache = LRUCache(size=0)
+        cache.set((MOCK_ID, None), 1)
+        assert cache.get((MOCK_ID, None)) is None
+
+    def test_invalidate(self):
+        """Test for invalidating all entries of a tool."""
+        cache = LRUCache()
+        cache.set((MOCK_ID, None), 1)
+        cache.set((MOCK_ID, MOCK_ID), 2)
+        cache.set((MOCK_ID_2, None), 3)
+        cache.invalidate(MOCK_ID)
+        assert cache.get((MOCK_ID, None)) is None
+        assert cache.get((MOCK_ID, MOCK_ID)) is None
+        assert cache.get((MOCK_ID_2, None)) == 3
+
+    def test_clear(self):
+        """Test for removing all entries."""
+        cache = LRUCache()
+        cache.set((MOCK_ID, None), 1)
+        cache.clear()
+        assert cache.get((MOCK_ID, None)) is None
+
+
+def test_get_tool_cache():
+    """Test for getting the tool cache configured for an app."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    app.config.foca.custom.tool_cache.size = 1
+    with app.app_context():
+        cache = get_tool_cache()
+        assert cache.size == 1
+        assert get_tool_cache() is cache
+
+
+def test_get_tool_cache_default():
+    """Test for getting the tool cache of an app without custom config."""
+    app = Flask(__name__)
+    app.config.foca = Config(db=MongoConfig(**MONGO_CONFIG))
+    with app.app_context():
+        assert isinstance(get_tool_cache(), LRUCache)
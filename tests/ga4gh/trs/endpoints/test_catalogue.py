@@ -0,0 +1,121 @@
+"""Tests for the process-local catalogue of tool classes."""
+
+from copy import deepcopy
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+
+from tests.mock_data import (
+    CUSTOM_CONFIG,
+    MOCK_ID,
+    MOCK_TOOL_CLASS,
+    MONGO_CONFIG,
+)
+from trs_filer.custom_config import CustomConfig
+from trs_filer.ga4gh.trs.endpoints.catalogue import (
+    GENERATION_KEY,
+    get_generation,
+    get_tool_class_catalogue,
+    increment_generation,
+    ToolClassCatalogue,
+)
+
+
+def _catalogue(check_interval=0):
+    """Create catalogue with in-memory database collections."""
+    return ToolClassCatalogue(
+        db_coll_classes=mongomock.MongoClient().db.toolclasses,
+        db_coll_generations=mongomock.MongoClient().db.generations,
+        check_interval=check_interval,
+    )
+
+
+def test_generation():
+    """Test for reading and incrementing generation counters."""
+    db_coll_generations = mongomock.MongoClient().db.collection
+    assert get_generation(db_coll_generations, GENERATION_KEY) == 0
+    assert increment_generation(db_coll_generations, GENERATION_KEY) == 1
+    assert increment_generation(db_coll_generations, GENERATION_KEY) == 2
+    assert get_generation(db_coll_generations, GENERATION_KEY) == 2
+    assert get_generation(db_coll_generations, MOCK_ID) == 0
+
+
+def test_get():
+    """Test for looking up tool classes."""
+    catalogue = _catalogue()
+    catalogue.db_coll_classes.insert_one(deepcopy(MOCK_TOOL_CLASS))
+    assert catalogue.get(id=MOCK_ID) == MOCK_TOOL_CLASS
+    assert catalogue.get(id=MOCK_ID + MOCK_ID) is None
+    assert catalogue.get_all() == [MOCK_TOOL_CLASS]
+    catalogue.get(id=MOCK_ID)['name'] = MOCK_ID
+    assert catalogue.get(id=MOCK_ID) == MOCK_TOOL_CLASS
+
+
+def test_refresh_generation():
+    """Test for reloading tool classes only when the generation changes."""
+    catalogue = _catalogue()
+    catalogue.get_all()
+    catalogue.db_coll_classes.insert_one(deepcopy(MOCK_TOOL_CLASS))
+    assert catalogue.get(id=MOCK_ID) is None
+    assert catalogue.loads == 1
+    increment_generation(catalogue.db_coll_generations, GENERATION_KEY)
+    assert catalogue.get(id=MOCK_ID) == MOCK_TOOL_CLASS
+    assert catalogue.get_all() == [MOCK_TOOL_CLASS]
+    assert catalogue.loads == 2
+    assert catalogue.generation == 1
+
+
+def test_refresh_check_interval():
+    """Test for checking the stored generation at most once per interval."""
+    catalogue = _catalogue(check_interval=3600)
+    catalogue.get_all()
+    catalogue.db_coll_classes.insert_one(deepcopy(MOCK_TOOL_CLASS))
+    increment_generation(catalogue.db_coll_generations, GENERATION_KEY)
+    assert catalogue.get(id=MOCK_ID) is None
+    assert catalogue.get(id=MOCK_ID, validate=True) == MOCK_TOOL_CLASS
+
+
+def test_is_current():
+    """Test for checking whether tool classes are stored as given."""
+    catalogue = _catalogue(check_interval=3600)
+    catalogue.db_coll_classes.insert_one(deepcopy(MOCK_TOOL_CLASS))
+    assert catalogue.is_current({**MOCK_TOOL_CLASS, '_id': MOCK_ID})
+    assert not catalogue.is_current({**MOCK_TOOL_CLASS, 'name': MOCK_ID})
+    assert not catalogue.is_current({**MOCK_TOOL_CLASS, 'id': MOCK_ID * 2})
+
+
+def test_invalidate():
+    """Test for marking tool classes as changed across catalogues."""
+    catalogue = _catalogue(check_interval=3600)
+    other = ToolClassCatalogue(
+        db_coll_classes=catalogue.db_coll_classes,
+        db_coll_generations=catalogue.db_coll_generations,
+    )
+    assert other.get_all() == []
+    catalogue.db_coll_classes.insert_one(deepcopy(MOCK_TOOL_CLASS))
+    catalogue.invalidate()
+    assert catalogue.get(id=MOCK_ID) == MOCK_TOOL_CLASS
+    assert other.get(id=MOCK_ID, validate=True) == MOCK_TOOL_CLASS
+    assert get_generation(
+        catalogue.db_coll_generations, GENERATION_KEY,
+    ) == 1
+
+
+def test_get_tool_class_catalogue():
+    """Test for getting the catalogue of the current app."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**{
+            **CUSTOM_CONFIG,
+            'toolclass_catalogue': {'check_interval': 5},
+        }),
+    )
+    for name in ('toolclasses', 'generations'):
+        app.config.foca.db.dbs['trsStore'].collections[name] \
+            .client = mongomock.MongoClient().db[name]
+    with app.app_context():
+        catalogue = get_tool_class_catalogue()
+        assert catalogue is get_tool_class_catalogue()
+    assert catalogue.check_interval == 5
@@ -0,0 +1,81 @@
+"""Tests for compression of stored file contents."""
+
+import sys
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import pytest
+
+from tests.mock_data import (
+    CUSTOM_CONFIG,
+    MOCK_ID,
+    MONGO_CONFIG,
+)
+from trs_filer.custom_config import CustomConfig
+from trs_filer.ga4gh.trs.endpoints.codecs import (
+    ContentCodec,
+    decode_content,
+    get_content_codec,
+)
+
+CONTENT = "cwlVersion: v1.0\nclass: CommandLineTool\n" * 100
+
+
+class TestContentCodec:
+    """Tests for `ContentCodec` class."""
+
+    @pytest.mark.parametrize('codec', ['zlib', 'gzip'])
+    def test_encode(self, codec):
+        """Test for compressing contents above the threshold."""
+        obj = ContentCodec(codec=codec).encode(CONTENT)
+        assert obj['codec'] == codec
+        assert len(obj['content']) < len(CONTENT)
+        assert decode_content(obj) == CONTENT
+
+    def test_encode_below_threshold(self):
+        """Test that small contents are stored uncompressed."""
+        codec = ContentCodec(threshold=len(CONTENT) + 1)
+        assert codec.encode(CONTENT) == {'content': CONTENT}
+
+    def test_encode_incompressible(self):
+        """Test that contents are stored uncompressed if compression does not
+        reduce their size.
+        """
+        codec = ContentCodec(threshold=0)
+        assert codec.encode(MOCK_ID) == {'content': MOCK_ID}
+
+    def test_encode_disabled(self):
+        """Test that contents are stored uncompressed if no codec is set."""
+        codec = ContentCodec(codec=None)
+        assert codec.encode(CONTENT) == {'content': CONTENT}
+
+    def test_init_unknown_codec(self):
+        """Test for setting an unknown codec."""
+        with pytest.raises(ValueError):
+            ContentCodec(codec=MOCK_ID)
+
+    def test_init_zstd_unavailable(self, monkeypatch):
+        """Test for setting codec `zstd` without package `zstandard`."""
+        monkeypatch.setitem(sys.modules, 'zstandard', None)
+        with pytest.raises(ValueError):
+            ContentCodec(codec='zstd')
+
+
+def test_decode_content():
+    """Test for decoding uncompressed contents."""
+    assert decode_content({'content': CONTENT}) == CONTENT
+
+
+def test_get_content_codec():
+    """Test for getting the content codec of the app."""
+    app = Flask(__name__)
+    custom = CustomConfig(**CUSTOM_CONFIG)
+    custom.compression.codec = 'gzip'
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=custom,
+    )
+    with app.app_context():
+        codec = get_content_codec()
+        assert codec is get_content_codec()
+        assert codec.codec == 'gzip'
@@ -0,0 +1,70 @@
+"""Tests for the registration context."""
+
+import string
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+
+from tests.mock_data import (
+    CUSTOM_CONFIG,
+    CUSTOM_CONFIG_ULID,
+    MOCK_ID_ONE_CHAR,
+    MONGO_CONFIG,
+)
+from trs_filer.custom_config import (CustomConfig, IdConfig)
+from trs_filer.ga4gh.trs.endpoints.context import (
+    compile_charset,
+    get_registration_context,
+    IdSpec,
+    RegistrationContext,
+)
+
+
+def test_compile_charset():
+    """Test for compiling character set expressions and literals."""
+    assert compile_charset('string.digits') == string.digits
+    assert compile_charset('string.ascii_lowercase + string.digits') == \
+        string.ascii_lowercase + string.digits
+    assert compile_charset('CBAC') == 'ABC'
+    assert compile_charset('9876543210') == string.digits
+
+
+def test_id_spec():
+    """Test for generating identifiers from compiled settings."""
+    ids = IdSpec.from_config(IdConfig(charset=MOCK_ID_ONE_CHAR, length=3))
+    assert ids == IdSpec(charset='A', length=3, strategy='random')
+    assert ids.generate() == 'AAA'
+    ids = IdSpec.from_config(IdConfig(strategy='ulid'))
+    assert len(ids.generate()) == 26
+
+
+def test_registration_context():
+    """Test for compiling the registration context."""
+    conf = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG_ULID),
+    )
+    conf.db.dbs['trsStore'].collections['tools'].client = \
+        mongomock.MongoClient().db.collection
+    context = RegistrationContext.from_config(conf=conf)
+    assert context.tools_url == 'http://1.2.3.4:80/ga4gh/trs/v2/tools'
+    assert context.tool_ids.charset == string.digits
+    assert context.version_ids.strategy == 'ulid'
+    assert context.tool_meta_version_init == 1
+    assert context.tool_class_validation is False
+    assert context.db_coll_tools is \
+        conf.db.dbs['trsStore'].collections['tools'].client
+
+
+def test_get_registration_context():
+    """Test for getting the registration context of the current app."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    with app.app_context():
+        context = get_registration_context()
+        assert context is get_registration_context()
+    assert context.tool_ids.strategy == 'random'
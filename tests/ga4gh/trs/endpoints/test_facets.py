@@ -0,0 +1,132 @@
+"""Tests for materialized counts of tools per facet value."""
+
+import mongomock
+
+from trs_filer.ga4gh.trs.endpoints.facets import (
+    compute_facets,
+    get_facet_values,
+    get_facets,
+    rebuild_facets,
+    update_facets,
+)
+
+TOOL_1 = {
+    'id': 'tool_1',
+    'organization': 'org_1',
+    'toolclass': {'id': 'class_1', 'name': 'CommandLineTool'},
+    'versions': [
+        {
+            'id': 'v1',
+            'descriptor_type': ['CWL', 'WDL'],
+            'images': [
+                {'registry_host': 'quay.io'},
+                {'registry_host': 'quay.io'},
+            ],
+        },
+        {
+            'id': 'v2',
+            'descriptor_type': ['CWL'],
+        },
+    ],
+}
+TOOL_2 = {
+    'id': 'tool_2',
+    'organization': 'org_2',
+    'toolclass': {'id': 'class_1', 'name': 'CommandLineTool'},
+    'versions': [
+        {
+            'id': 'v1',
+            'descriptor_type': ['NFL'],
+            'images': [{'registry_host': 'docker.io'}],
+        },
+    ],
+}
+
+
+def _counts(db_coll_facets):
+    """Get materialized counts as returned by `compute_facets()`."""
+    return {
+        facet: {count['value']: count['count'] for count in counts}
+        for facet, counts in get_facets(db_coll_facets).items()
+    }
+
+
+def test_get_facet_values():
+    """Test for getting distinct facet values of a tool."""
+    assert get_facet_values(TOOL_1) == {
+        'toolClass': ['CommandLineTool'],
+        'descriptorType': ['CWL', 'WDL'],
+        'organization': ['org_1'],
+        'registry': ['quay.io'],
+    }
+    assert get_facet_values(None) == {
+        'toolClass': [],
+        'descriptorType': [],
+        'organization': [],
+        'registry': [],
+    }
+
+
+def test_update_facets():
+    """Test for updating counts when tools are added, changed and deleted."""
+    db_coll_facets = mongomock.MongoClient().db.facets
+    update_facets(db_coll_facets, before=[None, None], after=[TOOL_1, TOOL_2])
+    assert _counts(db_coll_facets) == {
+        'toolClass': {'CommandLineTool': 2},
+        'descriptorType': {'CWL': 1, 'WDL': 1, 'NFL': 1},
+        'organization': {'org_1': 1, 'org_2': 1},
+        'registry': {'quay.io': 1, 'docker.io': 1},
+    }
+
+    # drop version 'v1' of first tool; values no longer used are removed
+    changed = {**TOOL_1, 'versions': TOOL_1['versions'][1:]}
+    update_facets(db_coll_facets, before=[TOOL_1], after=[changed])
+    update_facets(db_coll_facets, before=[TOOL_2])
+    assert _counts(db_coll_facets) == {
+        'toolClass': {'CommandLineTool': 1},
+        'descriptorType': {'CWL': 1},
+        'organization': {'org_1': 1},
+        'registry': {},
+    }
+    assert db_coll_facets.count_documents({}) == 3
+
+
+def test_compute_facets():
+    """Test for counting tools with an aggregation over all tools."""
+    db_coll_tools = mongomock.MongoClient().db.tools
+    db_coll_tools.insert_many([dict(TOOL_1), dict(TOOL_2)])
+    db_coll_facets = mongomock.MongoClient().db.facets
+    update_facets(db_coll_facets, after=[TOOL_1, TOOL_2])
+    assert compute_facets(db_coll_tools) == _counts(db_coll_facets)
+
+
+def test_rebuild_facets():
+    """Test for materializing counts only if not done before, or forced."""
+    db_coll_tools = mongomock.MongoClient().db.tools
+    db_coll_facets = mongomock.MongoClient().db.facets
+    assert not rebuild_facets(db_coll_tools, db_coll_facets)
+    db_coll_tools.insert_one(dict(TOOL_1))
+    assert rebuild_facets(db_coll_tools, db_coll_facets)
+    db_coll_tools.insert_one(dict(TOOL_2))
+    assert not rebuild_facets(db_coll_tools, db_coll_facets)
+    assert _counts(db_coll_facets)['organization'] == {'org_1': 1}
+    assert rebuild_facets(db_coll_tools, db_coll_facets, force=True)
+    assert _counts(db_coll_facets) == compute_facets(db_coll_tools)
+
+
+def test_get_facets():
+    """Test for ordering counts by decreasing frequency, then by value."""
+    db_coll_facets = mongomock.MongoClient().db.facets
+    update_facets(
+        db_coll_facets,
+        after=[TOOL_2, TOOL_1, {**TOOL_1, 'id': 'tool_3'}],
+    )
+    assert get_facets(db_coll_facets)['organization'] == [
+        {'value': 'org_1', 'count': 2},
+        {'value': 'org_2', 'count': 1},
+    ]
+    assert get_facets(db_coll_facets)['descriptorType'] == [
+        {'value': 'CWL', 'count': 2},
+        {'value': 'WDL', 'count': 2},
+        {'value': 'NFL', 'count': 1},
+    ]
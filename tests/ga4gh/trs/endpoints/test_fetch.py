@@ -0,0 +1,141 @@
+"""Tests for concurrent retrieval of file contents from URLs."""
+
+from http.server import (BaseHTTPRequestHandler, ThreadingHTTPServer)
+from threading import Thread
+import time
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import pytest
+
+from tests.mock_data import (
+    CUSTOM_CONFIG,
+    MOCK_ID,
+    MONGO_CONFIG,
+)
+from trs_filer.custom_config import CustomConfig
+from trs_filer.errors.exceptions import FetchError
+from trs_filer.ga4gh.trs.endpoints.fetch import (
+    FileFetcher,
+    get_file_fetcher,
+)
+
+DELAY = 0.3
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Stand-in for remote servers hosting tool files."""
+
+    def do_GET(self):
+        if self.path.startswith('/delay'):
+            time.sleep(DELAY)
+        if self.path == '/missing':
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path == '/drip':
+            self.send_response(200)
+            self.end_headers()
+            for _ in range(20):
+                self.wfile.write(b'x')
+                self.wfile.flush()
+                time.sleep(DELAY / 3)
+            return
+        content = (
+            b'x' * 1024 if self.path == '/large'
+            else f"{MOCK_ID}{self.path}".encode()
+        )
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        if self.path != '/large':
+            self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    """Run local HTTP server; yields its base URL."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    thread = Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestFileFetcher:
+    """Tests for `FileFetcher` class."""
+
+    def test_fetch_all(self, server):
+        """Test for retrieving multiple files."""
+        fetcher = FileFetcher()
+        urls = [f"{server}/file{i}" for i in range(3)]
+        contents = fetcher.fetch_all(urls + urls[:1])
+        assert contents == {
+            url: f"{MOCK_ID}/file{i}" for i, url in enumerate(urls)
+        }
+
+    def test_fetch_all_empty(self):
+        """Test for retrieving no files."""
+        assert FileFetcher().fetch_all([]) == {}
+
+    def test_fetch_all_concurrent(self, server):
+        """Test for retrieving files concurrently."""
+        fetcher = FileFetcher(workers=4)
+        urls = [f"{server}/delay{i}" for i in range(4)]
+        start = time.monotonic()
+        contents = fetcher.fetch_all(urls)
+        assert len(contents) == len(urls)
+        assert time.monotonic() - start < DELAY * len(urls) * 0.75
+
+    def test_fetch_all_timeout(self, server):
+        """Test for aborting requests that receive no data in time."""
+        fetcher = FileFetcher(timeout=DELAY / 3)
+        with pytest.raises(FetchError):
+            fetcher.fetch_all([f"{server}/delay"])
+
+    def test_fetch_all_total_timeout(self, server):
+        """Test for aborting retrieval that takes too long overall."""
+        fetcher = FileFetcher(total_timeout=DELAY)
+        start = time.monotonic()
+        with pytest.raises(FetchError):
+            fetcher.fetch_all([f"{server}/drip", f"{server}/file"])
+        assert time.monotonic() - start < DELAY * 3
+
+    def test_fetch_all_max_size(self, server):
+        """Test for rejecting files that exceed the maximum size."""
+        fetcher = FileFetcher(max_size=100)
+        assert fetcher.fetch_all([f"{server}/file"])
+        with pytest.raises(FetchError):
+            fetcher.fetch_all([f"{server}/large"])
+        fetcher = FileFetcher(max_size=10)
+        with pytest.raises(FetchError):
+            fetcher.fetch_all([f"{server}/file"])
+
+    def test_fetch_all_error(self, server):
+        """Test for retrieving unavailable files."""
+        fetcher = FileFetcher()
+        with pytest.raises(FetchError):
+            fetcher.fetch_all([f"{server}/missing", f"{server}/file"])
+        with pytest.raises(FetchError):
+            fetcher.fetch_all([MOCK_ID])
+
+
+def test_get_file_fetcher():
+    """Test for getting the file fetcher of the app."""
+    app = Flask(__name__)
+    custom = CustomConfig(**CUSTOM_CONFIG)
+    custom.fetch.max_size = 1
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=custom,
+    )
+    with app.app_context():
+        fetcher = get_file_fetcher()
+        assert fetcher is get_file_fetcher()
+        assert fetcher.max_size == 1
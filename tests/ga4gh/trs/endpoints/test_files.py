@@ -0,0 +1,355 @@
+"""Tests for storing tool version files."""
+
+from copy import deepcopy
+from unittest.mock import patch
+
+import mongomock
+
+from tests.mock_data import (
+    MOCK_DESCRIPTOR_FILE,
+    MOCK_FILES,
+    MOCK_ID,
+    MOCK_ID_2,
+    MOCK_TOOL_VERSION_ID,
+)
+from trs_filer.ga4gh.trs.endpoints.codecs import ContentCodec
+from trs_filer.ga4gh.trs.endpoints.files import (
+    collect_blobs,
+    content_digest,
+    delete_files,
+    migrate_blobs,
+    migrate_files,
+    resolve_contents,
+    store_files,
+)
+
+CONTENT = MOCK_DESCRIPTOR_FILE['file_wrapper']['content']
+
+
+def test_store_files():
+    """Test for storing files of a tool version."""
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=deepcopy(MOCK_FILES),
+    )
+    assert db_coll_files.count_documents({}) == len(MOCK_FILES)
+    data = db_coll_files.find_one(
+        filter={'tool_file.file_type': 'PRIMARY_DESCRIPTOR'},
+        projection={'_id': False},
+    )
+    file_wrapper = deepcopy(MOCK_DESCRIPTOR_FILE['file_wrapper'])
+    del file_wrapper['content']
+    assert data == {
+        **MOCK_DESCRIPTOR_FILE,
+        'file_wrapper': file_wrapper,
+        'tool_id': MOCK_ID,
+        'version_id': MOCK_ID,
+        'blob': content_digest(CONTENT),
+    }
+    assert list(db_coll_blobs.find()) == [{
+        '_id': content_digest(CONTENT),
+        'content': CONTENT,
+        'refcount': len(MOCK_FILES),
+    }]
+
+
+def test_store_files_replace():
+    """Test for replacing files of a tool version."""
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=deepcopy(MOCK_FILES),
+    )
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID_2,
+        files=deepcopy(MOCK_FILES),
+    )
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=[deepcopy(MOCK_DESCRIPTOR_FILE)],
+    )
+    assert db_coll_files.count_documents({'version_id': MOCK_ID}) == 1
+    assert db_coll_files.count_documents({'version_id': MOCK_ID_2}) == \
+        len(MOCK_FILES)
+    assert db_coll_blobs.find_one()['refcount'] == len(MOCK_FILES) + 1
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=[],
+    )
+    assert db_coll_files.count_documents({'version_id': MOCK_ID}) == 0
+    assert db_coll_blobs.find_one()['refcount'] == len(MOCK_FILES)
+
+
+def test_store_files_changed_content():
+    """Test for replacing the content of a file."""
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    _file = deepcopy(MOCK_DESCRIPTOR_FILE)
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=[_file],
+    )
+    _file['file_wrapper']['content'] = MOCK_ID_2
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=[_file],
+    )
+    assert list(db_coll_blobs.find()) == [{
+        '_id': content_digest(MOCK_ID_2),
+        'content': MOCK_ID_2,
+        'refcount': 1,
+    }]
+
+
+def test_store_files_compressed():
+    """Test for storing compressed file contents."""
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    _file = deepcopy(MOCK_DESCRIPTOR_FILE)
+    _file['file_wrapper']['content'] = CONTENT * 1000
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=[_file],
+        codec=ContentCodec(codec='zlib'),
+    )
+    blob = db_coll_blobs.find_one()
+    assert blob['codec'] == 'zlib'
+    assert len(blob['content']) < len(CONTENT * 1000)
+    data = next(resolve_contents(
+        db_coll_blobs=db_coll_blobs,
+        files=db_coll_files.find(projection={'_id': False}),
+    ))
+    assert data['file_wrapper'] == _file['file_wrapper']
+
+
+def test_delete_files():
+    """Test for deleting files of a tool version and of a tool."""
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    for version_id in (MOCK_ID, MOCK_ID_2):
+        store_files(
+            db_coll_files=db_coll_files,
+            db_coll_blobs=db_coll_blobs,
+            tool_id=MOCK_ID,
+            version_id=version_id,
+            files=deepcopy(MOCK_FILES),
+        )
+    assert delete_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID_2,
+    ) == len(MOCK_FILES)
+    assert delete_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+    ) == len(MOCK_FILES)
+    assert db_coll_files.count_documents({}) == 0
+    assert db_coll_blobs.count_documents({}) == 0
+
+
+def test_delete_files_keep_versions():
+    """Test for deleting files of all but the given tool versions."""
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    for version_id in (MOCK_ID, MOCK_ID_2):
+        store_files(
+            db_coll_files=db_coll_files,
+            db_coll_blobs=db_coll_blobs,
+            tool_id=MOCK_ID,
+            version_id=version_id,
+            files=deepcopy(MOCK_FILES),
+        )
+    assert delete_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        keep_versions=[MOCK_ID],
+    ) == len(MOCK_FILES)
+    assert db_coll_files.count_documents({'version_id': MOCK_ID}) == \
+        len(MOCK_FILES)
+    assert db_coll_blobs.find_one()['refcount'] == len(MOCK_FILES)
+
+
+def test_collect_blobs():
+    """Test that referenced contents are not collected."""
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=deepcopy(MOCK_FILES),
+    )
+    db_coll_blobs.update_many({}, {'$set': {'refcount': 0}})
+    db_coll_blobs.insert_one({'_id': MOCK_ID, 'refcount': 0})
+    assert collect_blobs(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+    ) == 1
+    assert db_coll_blobs.count_documents({}) == 1
+
+
+def test_resolve_contents():
+    """Test for adding contents to file objects."""
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=deepcopy(MOCK_FILES),
+    )
+    embedded = deepcopy(MOCK_DESCRIPTOR_FILE)
+    embedded['file_wrapper']['content'] = MOCK_ID_2
+    files = list(resolve_contents(
+        db_coll_blobs=db_coll_blobs,
+        files=list(db_coll_files.find(projection={'_id': False})) + [embedded],
+        batch_size=2,
+    ))
+    assert len(files) == len(MOCK_FILES) + 1
+    assert all('blob' not in _f for _f in files)
+    assert [_f['file_wrapper']['content'] for _f in files] == \
+        [CONTENT] * len(MOCK_FILES) + [MOCK_ID_2]
+
+
+def test_migrate_files():
+    """Test for moving files embedded in tool documents."""
+    db_coll_tools = mongomock.MongoClient().db.collection
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    tool = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool['id'] = MOCK_ID
+    db_coll_tools.insert_one(tool)
+
+    assert migrate_files(
+        db_coll_tools=db_coll_tools,
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+    ) == 1
+    data = db_coll_tools.find_one({'id': MOCK_ID})
+    assert 'files' not in data['versions'][0]
+    assert db_coll_files.count_documents({
+        'tool_id': MOCK_ID,
+        'version_id': MOCK_ID,
+    }) == len(MOCK_FILES)
+    assert migrate_files(
+        db_coll_tools=db_coll_tools,
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+    ) == 0
+
+
+def test_migrate_files_existing():
+    """Test for moving files that have already been partly stored."""
+    db_coll_tools = mongomock.MongoClient().db.collection
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    tool = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool['id'] = MOCK_ID
+    db_coll_tools.insert_one(tool)
+    newer = deepcopy(MOCK_DESCRIPTOR_FILE)
+    newer['file_wrapper']['content'] = 'newer'
+    store_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=[newer],
+    )
+
+    assert migrate_files(
+        db_coll_tools=db_coll_tools,
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+    ) == 1
+    assert db_coll_files.count_documents({
+        'tool_id': MOCK_ID,
+        'version_id': MOCK_ID,
+    }) == len(MOCK_FILES)
+    assert db_coll_files.count_documents({'_migrating': True}) == 0
+    assert db_coll_files.count_documents(
+        {'blob': content_digest('newer')}
+    ) == 1
+    assert db_coll_blobs.find_one(
+        {'_id': content_digest('newer')}
+    )['refcount'] == 1
+    assert db_coll_blobs.find_one(
+        {'_id': content_digest(CONTENT)}
+    )['refcount'] == len(MOCK_FILES) - 1
+
+
+def test_migrate_files_changed():
+    """Test for skipping tools that change during migration."""
+    db_coll_tools = mongomock.MongoClient().db.collection
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    tool = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool['id'] = MOCK_ID
+    db_coll_tools.insert_one(tool)
+
+    with patch.object(db_coll_tools, 'update_one') as update_one:
+        update_one.return_value.modified_count = 0
+        assert migrate_files(
+            db_coll_tools=db_coll_tools,
+            db_coll_files=db_coll_files,
+            db_coll_blobs=db_coll_blobs,
+        ) == 0
+    data = db_coll_tools.find_one({'id': MOCK_ID})
+    assert 'files' in data['versions'][0]
+    assert db_coll_files.count_documents({}) == 0
+    assert db_coll_blobs.count_documents({}) == 0
+
+
+def test_migrate_blobs():
+    """Test for moving contents embedded in file objects."""
+    db_coll_files = mongomock.MongoClient().db.collection
+    db_coll_blobs = mongomock.MongoClient().db.collection
+    db_coll_files.insert_many([
+        {**deepcopy(_file), 'tool_id': MOCK_ID, 'version_id': MOCK_ID}
+        for _file in MOCK_FILES
+    ])
+
+    assert migrate_blobs(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+    ) == len(MOCK_FILES)
+    assert db_coll_files.count_documents({
+        'blob': content_digest(CONTENT),
+        'file_wrapper.content': {'$exists': False},
+    }) == len(MOCK_FILES)
+    assert db_coll_blobs.find_one()['refcount'] == len(MOCK_FILES)
+    assert migrate_blobs(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+    ) == 0
@@ -0,0 +1,115 @@
+"""Tests for compiling `GET /tools` filter parameters."""
+
+from copy import deepcopy
+
+import mongomock
+import pytest
+
+from tests.mock_data import (
+    MOCK_ID,
+    MOCK_ID_2,
+    MOCK_IMAGES,
+    MOCK_TOOL_VERSION_ID,
+)
+from trs_filer.ga4gh.trs.endpoints.filters import compile_tools_filter
+
+AUTHOR = MOCK_TOOL_VERSION_ID['versions'][0]['author'][0]
+DESCRIPTOR_TYPE = MOCK_TOOL_VERSION_ID['versions'][0]['descriptor_type'][0]
+IMAGE_NAME = MOCK_IMAGES[0]['image_name']
+REGISTRY = MOCK_IMAGES[0]['registry_host']
+
+
+def test_compile_tools_filter_none():
+    """Test for compiling filter without any parameters."""
+    assert compile_tools_filter() == {}
+
+
+def test_compile_tools_filter_single():
+    """Test for compiling filter with a single tool-level parameter."""
+    assert compile_tools_filter(checker=False) == {'has_checker': False}
+
+
+def test_compile_tools_filter_single_version():
+    """Test for compiling filter with a single version-level parameter."""
+    assert compile_tools_filter(author=AUTHOR) == {
+        'versions': {'$elemMatch': {'author': AUTHOR}},
+    }
+
+
+def test_compile_tools_filter_version_predicates_merged():
+    """Test for compiling filter with all version-level parameters; none of
+    them may overwrite another.
+    """
+    assert compile_tools_filter(
+        descriptorType=DESCRIPTOR_TYPE,
+        registry=REGISTRY,
+        name=IMAGE_NAME,
+        author=AUTHOR,
+    ) == {
+        'versions': {
+            '$elemMatch': {
+                'images': {
+                    '$elemMatch': {
+                        'image_name': IMAGE_NAME,
+                        'registry_host': REGISTRY,
+                    },
+                },
+                'author': AUTHOR,
+                'descriptor_type': DESCRIPTOR_TYPE,
+            },
+        },
+    }
+
+
+def test_compile_tools_filter_order():
+    """Test for compiling filter with clauses in a fixed order."""
+    filt = compile_tools_filter(
+        checker=True,
+        toolClass=MOCK_ID,
+        author=AUTHOR,
+        alias=MOCK_ID,
+        id=MOCK_ID,
+    )
+    assert [list(clause)[0] for clause in filt['$and']] == [
+        'id',
+        'aliases',
+        'versions',
+        'toolclass.name',
+        'has_checker',
+    ]
+
+
+@pytest.mark.parametrize('params, expected', [
+    ({}, [MOCK_ID, MOCK_ID_2]),
+    ({'author': AUTHOR}, [MOCK_ID, MOCK_ID_2]),
+    ({'author': AUTHOR, 'descriptorType': DESCRIPTOR_TYPE}, [MOCK_ID]),
+    ({'registry': REGISTRY, 'name': IMAGE_NAME}, [MOCK_ID]),
+    ({'registry': REGISTRY, 'descriptorType': 'WDL'}, [MOCK_ID_2]),
+    ({'author': AUTHOR, 'descriptorType': 'WDL', 'name': IMAGE_NAME}, []),
+    ({'id': MOCK_ID_2, 'alias': 'alias_1', 'checker': True}, [MOCK_ID_2]),
+    ({'id': MOCK_ID_2, 'toolClass': MOCK_ID}, []),
+])
+def test_compile_tools_filter_query(params, expected):
+    """Test for querying tools with combinations of filter parameters."""
+    coll = mongomock.MongoClient().db.collection
+    tool_1 = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool_1['id'] = MOCK_ID
+    # only one version satisfies both `author` & `descriptorType` predicates,
+    # only one image satisfies both `registry` & `name` predicates
+    tool_2 = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool_2['id'] = MOCK_ID_2
+    tool_2['versions'][0]['descriptor_type'] = ['WDL']
+    tool_2['versions'][0]['author'] = []
+    tool_2['versions'][0]['images'] = [
+        {'registry_host': REGISTRY, 'image_name': MOCK_ID},
+        {'registry_host': MOCK_ID, 'image_name': IMAGE_NAME},
+    ]
+    tool_2['versions'].append(deepcopy(MOCK_TOOL_VERSION_ID['versions'][0]))
+    tool_2['versions'][1]['descriptor_type'] = []
+    tool_2['versions'][1]['images'] = []
+    for tool in [tool_1, tool_2]:
+        tool.pop('_id', None)
+    coll.insert_many([tool_1, tool_2])
+
+    res = coll.find(compile_tools_filter(**params)).sort('_id', 1)
+    assert [tool['id'] for tool in res] == expected
@@ -0,0 +1,236 @@
+"""Tests for background jobs retrieving file contents."""
+
+from copy import deepcopy
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+import pytest
+
+from tests.mock_data import (
+    CUSTOM_CONFIG,
+    MOCK_DESCRIPTOR_FILE,
+    MOCK_ID,
+    MOCK_ID_2,
+    MOCK_TOOL_VERSION_ID,
+    MONGO_CONFIG,
+)
+from trs_filer.custom_config import CustomConfig
+from trs_filer.errors.exceptions import (
+    FetchError,
+    NotFound,
+)
+from trs_filer.ga4gh.trs.endpoints.fetch import FileFetcher
+from trs_filer.ga4gh.trs.endpoints.files import content_digest
+from trs_filer.ga4gh.trs.endpoints.jobs import (
+    get_job,
+    get_job_executor,
+    recover_jobs,
+    run_job,
+    STATE_COMPLETE,
+    STATE_FAILED,
+    STATE_QUEUED,
+    STATE_RUNNING,
+    submit_job,
+)
+from trs_filer.ga4gh.trs.endpoints.utils import compute_etag
+
+
+def _raise(exception) -> None:
+    """General purpose exception raiser."""
+    raise exception
+
+
+def _create_app() -> Flask:
+    """Create app with a tool whose descriptor is only referenced by URL."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    for coll in ('tools', 'files', 'blobs', 'jobs'):
+        app.config.foca.db.dbs['trsStore'].collections[coll] \
+            .client = mongomock.MongoClient().db.collection
+    tool = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool['id'] = MOCK_ID
+    tool['versions'][0]['id'] = MOCK_ID
+    tool['versions'][0]['_etag'] = MOCK_ID
+    tool['_etag'] = MOCK_ID
+    del tool['versions'][0]['files']
+    _file = deepcopy(MOCK_DESCRIPTOR_FILE)
+    del _file['file_wrapper']['content']
+    _file['file_wrapper']['url'] = MOCK_ID
+    _file['_etag'] = compute_etag(_file)
+    dbs = app.config.foca.db.dbs['trsStore']
+    dbs.collections['tools'].client.insert_one(tool)
+    dbs.collections['files'].client.insert_one(
+        {**_file, 'tool_id': MOCK_ID, 'version_id': MOCK_ID}
+    )
+    dbs.collections['jobs'].client.insert_one({
+        'id': MOCK_ID,
+        'state': STATE_QUEUED,
+        'tool_id': MOCK_ID,
+        'version_ids': [MOCK_ID],
+    })
+    return app
+
+
+def test_run_job(monkeypatch):
+    """Test for retrieving file contents in a job."""
+    app = _create_app()
+    monkeypatch.setattr(
+        FileFetcher,
+        'fetch',
+        lambda *args, **kwargs: MOCK_ID_2,
+    )
+    run_job(app=app, job_id=MOCK_ID)
+    dbs = app.config.foca.db.dbs['trsStore']
+    job = dbs.collections['jobs'].client.find_one({'id': MOCK_ID})
+    assert job['state'] == STATE_COMPLETE
+    _file = dbs.collections['files'].client.find_one()
+    assert _file['blob'] == content_digest(MOCK_ID_2)
+    assert dbs.collections['blobs'].client.find_one(
+        {'_id': _file['blob']},
+    )['content'] == MOCK_ID_2
+    _file['file_wrapper']['content'] = MOCK_ID_2
+    assert _file['_etag'] == compute_etag({
+        k: v for k, v in _file.items()
+        if k not in ('tool_id', 'version_id', 'blob')
+    })
+    tool = dbs.collections['tools'].client.find_one()
+    version = deepcopy(tool['versions'][0])
+    del _file['_id'], _file['tool_id'], _file['version_id'], _file['blob']
+    del _file['file_wrapper']['content']
+    version_etag = compute_etag({**version, 'files': [_file]})
+    assert tool['versions'][0]['_etag'] == version_etag
+    assert tool['_etag'] == compute_etag({
+        'tool': MOCK_ID,
+        'version': version_etag,
+    })
+
+
+def test_run_job_replaced_file(monkeypatch):
+    """Test that files replaced in the meantime are left untouched."""
+    app = _create_app()
+    dbs = app.config.foca.db.dbs['trsStore']
+
+    def _fetch(*args, **kwargs):
+        dbs.collections['files'].client.update_one(
+            {}, {'$set': {'_etag': MOCK_ID}},
+        )
+        return MOCK_ID_2
+
+    monkeypatch.setattr(FileFetcher, 'fetch', _fetch)
+    run_job(app=app, job_id=MOCK_ID)
+    _file = dbs.collections['files'].client.find_one()
+    assert 'blob' not in _file
+    assert dbs.collections['blobs'].client.count_documents({}) == 0
+    tool = dbs.collections['tools'].client.find_one()
+    assert tool['_etag'] == MOCK_ID
+    assert tool['versions'][0]['_etag'] == MOCK_ID
+
+
+def test_run_job_fetch_error(monkeypatch):
+    """Test for a job failing to retrieve file contents."""
+    app = _create_app()
+    monkeypatch.setattr(
+        FileFetcher,
+        'fetch',
+        lambda *args, **kwargs: _raise(FetchError(MOCK_ID_2)),
+    )
+    run_job(app=app, job_id=MOCK_ID)
+    with app.app_context():
+        job = get_job(id=MOCK_ID)
+    assert job['state'] == STATE_FAILED
+    assert job['error'] == MOCK_ID_2
+
+
+def test_run_job_not_queued(monkeypatch):
+    """Test that jobs are not run more than once."""
+    app = _create_app()
+    dbs = app.config.foca.db.dbs['trsStore']
+    dbs.collections['jobs'].client.update_one(
+        {}, {'$set': {'state': STATE_COMPLETE}},
+    )
+    monkeypatch.setattr(
+        FileFetcher,
+        'fetch',
+        lambda *args, **kwargs: _raise(FetchError),
+    )
+    run_job(app=app, job_id=MOCK_ID)
+    with app.app_context():
+        assert get_job(id=MOCK_ID)['state'] == STATE_COMPLETE
+
+
+def test_submit_job(monkeypatch):
+    """Test for submitting a job to the worker pool."""
+    app = _create_app()
+    dbs = app.config.foca.db.dbs['trsStore']
+    dbs.collections['jobs'].client.delete_many({})
+    monkeypatch.setattr(
+        FileFetcher,
+        'fetch',
+        lambda *args, **kwargs: MOCK_ID_2,
+    )
+    with app.app_context():
+        job = submit_job(tool_id=MOCK_ID, version_ids=[MOCK_ID])
+        assert job['state'] == STATE_QUEUED
+        assert '_id' not in job
+        get_job_executor().shutdown(wait=True)
+        assert get_job(id=job['id'])['state'] == STATE_COMPLETE
+
+
+def test_recover_jobs(monkeypatch):
+    """Test for resubmitting abandoned jobs."""
+    app = _create_app()
+    dbs = app.config.foca.db.dbs['trsStore']
+    dbs.collections['jobs'].client.insert_many([
+        {
+            'id': MOCK_ID_2,
+            'state': STATE_RUNNING,
+            'tool_id': MOCK_ID,
+            'version_ids': [MOCK_ID],
+            'updated_at': '2000-01-01T00:00:00Z',
+        },
+        {
+            'id': 'running',
+            'state': STATE_RUNNING,
+            'tool_id': MOCK_ID,
+            'version_ids': [MOCK_ID],
+            'updated_at': '9999-01-01T00:00:00Z',
+        },
+    ])
+    monkeypatch.setattr(
+        FileFetcher,
+        'fetch',
+        lambda *args, **kwargs: MOCK_ID_2,
+    )
+    assert recover_jobs(app=app) == 2
+    with app.app_context():
+        get_job_executor().shutdown(wait=True)
+        assert get_job(id=MOCK_ID)['state'] == STATE_COMPLETE
+        assert get_job(id=MOCK_ID_2)['state'] == STATE_COMPLETE
+        assert get_job(id='running')['state'] == STATE_RUNNING
+
+
+def test_get_job_not_found():
+    """Test for getting an unavailable job."""
+    app = _create_app()
+    with app.app_context():
+        with pytest.raises(NotFound):
+            get_job(id=MOCK_ID_2)
+
+
+def test_get_job_executor():
+    """Test for getting the worker pool of the app."""
+    app = Flask(__name__)
+    custom = CustomConfig(**CUSTOM_CONFIG)
+    custom.jobs.workers = 1
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=custom,
+    )
+    with app.app_context():
+        executor = get_job_executor()
+        assert executor is get_job_executor()
+        assert executor._max_workers == 1
@@ -9,13 +9,13 @@ from foca.models.config import (Config, MongoConfig)
 import mongomock
 from pymongo.errors import DuplicateKeyError
 import pytest
-import requests
 
 from tests.mock_data import (
     CUSTOM_CONFIG,
     CUSTOM_CONFIG_CHARSET_LITERAL,
     CUSTOM_CONFIG_ONE_ID,
     CUSTOM_CONFIG_TOOL_CLASS_VALIDATION,
+    CUSTOM_CONFIG_ULID,
     MOCK_CONTAINER_FILE,
     MOCK_DESCRIPTOR_FILE,
     MOCK_DESCRIPTOR_SEC_FILE,
@@ -32,11 +32,14 @@ from tests.mock_data import (
 )
 from trs_filer.errors.exceptions import (
     BadRequest,
+    FetchError,
     InternalServerError,
     NotFound,
 )
+from trs_filer.ga4gh.trs.endpoints.fetch import FileFetcher
 from trs_filer.ga4gh.trs.endpoints.register_objects import (
     RegisterTool,
+    RegisterTools,
     RegisterToolVersion,
 )
 from trs_filer.custom_config import CustomConfig
@@ -76,7 +79,7 @@ class TestRegisterTool:
         with app.app_context():
             tool = RegisterTool(data=data)
             tool.process_metadata()
-            assert isinstance(tool.id_charset, str)
+            assert tool.ids.charset == MOCK_ID_ONE_CHAR
 
     def test_register_metadata(self):
         """Test for creating a tool with a randomly assigned identifier."""
@@ -87,8 +90,16 @@ class TestRegisterTool:
         )
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['files'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['facets'] \
+            .client = MagicMock()
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
 
         data = deepcopy(MOCK_TOOL_VERSION_ID)
         with app.app_context():
@@ -105,6 +116,12 @@ class TestRegisterTool:
         )
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['files'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['facets'] \
+            .client = MagicMock()
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = MagicMock()
 
@@ -125,6 +142,12 @@ class TestRegisterTool:
         mock_resp["id"] = MOCK_ID
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['files'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['facets'] \
+            .client = MagicMock()
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = MagicMock()
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
@@ -206,8 +229,18 @@ class TestRegisterTool:
         )
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client = MagicMock()
-        app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+        app.config.foca.db.dbs['trsStore'].collections['files'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['blobs'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['facets'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+            .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+            .client.insert_one(deepcopy(MOCK_TOOL_VERSION_ID['toolclass']))
 
         data = deepcopy(MOCK_TOOL_VERSION_ID)
         with app.app_context():
@@ -226,6 +259,8 @@ class TestRegisterTool:
             .client = mongomock.MongoClient().db.collection
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
 
         data = deepcopy(MOCK_TOOL_VERSION_ID)
         data['toolclass']['id'] = MOCK_ID + MOCK_ID
@@ -235,7 +270,9 @@ class TestRegisterTool:
                 tool.register_metadata()
 
     def test_register_metadata_without_tool_class_identifier(self):
-        """Test for creating a tool with tool class without an identifier."""
+        """Test for creating a tool with tool class without an identifier;
+        the generated identifier is unknown.
+        """
         app = Flask(__name__)
         app.config.foca = Config(
             db=MongoConfig(**MONGO_CONFIG),
@@ -243,15 +280,23 @@ class TestRegisterTool:
         )
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['files'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['facets'] \
+            .client = MagicMock()
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
 
         data = deepcopy(MOCK_TOOL_VERSION_ID)
         data["toolclass"].pop("id")
         with app.app_context():
-            tool = RegisterTool(data=data)
-            tool.register_metadata()
-            assert isinstance(tool.data['id'], str)
+            with pytest.raises(BadRequest):
+                tool = RegisterTool(data=data)
+                tool.register_metadata()
 
     def test_register_metadata_tool_duplicate_key(self):
         """Test for creating a tool; duplicate key error occurs."""
@@ -263,8 +308,16 @@ class TestRegisterTool:
         mock_resp = MagicMock(side_effect=[DuplicateKeyError(''), None])
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['files'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['facets'] \
+            .client = MagicMock()
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client.insert_one = mock_resp
 
@@ -275,6 +328,36 @@ class TestRegisterTool:
             tool.register_metadata()
             assert isinstance(tool.data['id'], str)
 
+    def test_register_metadata_duplicate_key_regenerate(self, monkeypatch):
+        """Test for creating a tool; generated identifier is taken."""
+        app = Flask(__name__)
+        app.config.foca = Config(
+            db=MongoConfig(**MONGO_CONFIG),
+            custom=CustomConfig(**CUSTOM_CONFIG),
+        )
+        for coll in (
+            'tools', 'files', 'blobs', 'facets', 'toolclasses', 'generations',
+        ):
+            app.config.foca.db.dbs['trsStore'].collections[coll] \
+                .client = mongomock.MongoClient().db[coll]
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.create_index('id', unique=True)
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.insert_one({**MOCK_TOOL_VERSION_ID, 'id': MOCK_ID})
+        ids = iter([MOCK_ID] + [f"id{i}" for i in range(10)])
+        monkeypatch.setattr(
+            'trs_filer.ga4gh.trs.endpoints.context.generate_id',
+            lambda **kwargs: next(ids),
+        )
+
+        data = deepcopy(MOCK_TOOL)
+        with app.app_context():
+            tool = RegisterTool(data=data)
+            tool.register_metadata()
+            assert tool.data['id'] not in (None, MOCK_ID)
+        assert app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.count_documents({}) == 2
+
     def test_register_metadata_duplicate_keys_repeated(self):
         """Test for creating a tool; running out of unique identifiers."""
         app = Flask(__name__)
@@ -286,8 +369,18 @@ class TestRegisterTool:
         mock_resp["id"] = MOCK_ID_ONE_CHAR
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['files'] \
+            .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+            .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['facets'] \
+            .client = mongomock.MongoClient().db.collection
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.create_index('id', unique=True)
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client.insert_one(mock_resp)
 
@@ -301,6 +394,104 @@ class TestRegisterTool:
                 print(tool.data['id'])
 
 
+class TestRegisterTools:
+    """Tests for `RegisterTools` class."""
+
+    @staticmethod
+    def _app(custom_config=CUSTOM_CONFIG):
+        """Create app with in-memory database collections."""
+        app = Flask(__name__)
+        app.config.foca = Config(
+            db=MongoConfig(**MONGO_CONFIG),
+            custom=CustomConfig(**custom_config),
+        )
+        for name in [
+            'tools', 'files', 'blobs', 'toolclasses', 'facets', 'generations',
+        ]:
+            app.config.foca.db.dbs['trsStore'].collections[name] \
+                .client = mongomock.MongoClient().db[name]
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.create_index('id', unique=True)
+        return app
+
+    def test_register_metadata(self):
+        """Test for creating and replacing tools; invalid tools are reported
+        per item.
+        """
+        app = self._app()
+        invalid = deepcopy(MOCK_TOOL_DUPLICATE_VERSION_IDS)
+        items = [
+            {'tool': deepcopy(MOCK_TOOL)},
+            {'id': MOCK_ID, 'tool': deepcopy(MOCK_TOOL_VERSION_ID)},
+            {'id': MOCK_ID, 'tool': deepcopy(MOCK_TOOL)},
+            {'tool': invalid},
+        ]
+        with app.app_context():
+            results = RegisterTools(items=items).register_metadata()
+            db = app.config.foca.db.dbs['trsStore']
+            assert isinstance(results[0]['id'], str)
+            assert results[1] == {'id': MOCK_ID}
+            assert results[2]['id'] == MOCK_ID
+            assert results[2]['error']['code'] == 400
+            assert 'id' not in results[3]
+            assert results[3]['error']['code'] == 400
+            assert db.collections['tools'].client.count_documents({}) == 2
+            assert db.collections['toolclasses'].client.count_documents(
+                {'id': MOCK_TOOL['toolclass']['id']}
+            ) == 1
+            assert db.collections['files'].client.count_documents(
+                {'tool_id': MOCK_ID}
+            ) == len(MOCK_VERSION_ID['files'])
+
+            items = [{'id': MOCK_ID, 'tool': deepcopy(MOCK_TOOL)}]
+            assert RegisterTools(items=items).register_metadata() == \
+                [{'id': MOCK_ID}]
+            assert db.collections['files'].client.count_documents(
+                {'tool_id': MOCK_ID, 'version_id': MOCK_VERSION_ID['id']}
+            ) == 0
+
+    def test_register_metadata_with_tool_class_validation(self):
+        """Test for creating tools with tool class validation failing for one
+        of them.
+        """
+        app = self._app(custom_config=CUSTOM_CONFIG_TOOL_CLASS_VALIDATION)
+        unknown = deepcopy(MOCK_TOOL)
+        unknown['toolclass']['id'] = MOCK_ID + MOCK_ID
+        items = [{'tool': deepcopy(MOCK_TOOL)}, {'tool': unknown}]
+        with app.app_context():
+            app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+                .client.insert_one(deepcopy(MOCK_TOOL['toolclass']))
+            results = RegisterTools(items=items).register_metadata()
+            assert 'error' not in results[0]
+            assert results[1]['error']['code'] == 400
+
+    def test_register_metadata_duplicate_keys_repeated(self):
+        """Test for creating tools; running out of unique identifiers."""
+        app = self._app(custom_config=CUSTOM_CONFIG_ONE_ID)
+        mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+        mock_resp['id'] = MOCK_ID_ONE_CHAR
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.insert_one(mock_resp)
+
+        items = [{'tool': deepcopy(MOCK_TOOL)}]
+        with app.app_context():
+            results = RegisterTools(items=items).register_metadata()
+            assert results[0]['error']['code'] == 500
+
+    def test_register_metadata_ulid(self):
+        """Test for creating tools with time-ordered identifiers."""
+        app = self._app(custom_config=CUSTOM_CONFIG_ULID)
+        items = [{'tool': deepcopy(MOCK_TOOL)} for __ in range(20)]
+        with app.app_context():
+            results = RegisterTools(items=items).register_metadata()
+        ids = [result['id'] for result in results]
+        assert ids == sorted(set(ids))
+        db_coll_tools = app.config.foca.db.dbs['trsStore'] \
+            .collections['tools'].client
+        tool = db_coll_tools.find_one({'id': ids[0]})
+        assert len(tool['id']) == len(tool['versions'][0]['id']) == 26
+
+
 class TestRegisterToolVersion:
     """Tests for `RegisterToolVersion` class."""
 
@@ -330,7 +521,7 @@ class TestRegisterToolVersion:
         with app.app_context():
             tool = RegisterToolVersion(data=data, id=MOCK_ID)
             tool.process_metadata()
-            assert isinstance(tool.id_charset, str)
+            assert tool.ids.charset == MOCK_ID_ONE_CHAR
 
     def test_process_files_invalid_descriptor_type(self):
         """Test for processing files with an invalid descriptor type."""
@@ -434,13 +625,11 @@ class TestRegisterToolVersion:
             custom=CustomConfig(**CUSTOM_CONFIG_CHARSET_LITERAL),
         )
 
-        class MockResponse:
-            text = MOCK_ID
-
-            def __init__(*args, **kwargs):
-                pass
-
-        monkeypatch.setattr('requests.get', MockResponse)
+        monkeypatch.setattr(
+            FileFetcher,
+            'fetch',
+            lambda *args, **kwargs: MOCK_ID,
+        )
         data = deepcopy(MOCK_VERSION_NO_ID)
         mock_file = deepcopy(MOCK_CONTAINER_FILE)
         del mock_file['file_wrapper']['content']
@@ -449,6 +638,7 @@ class TestRegisterToolVersion:
             tool = RegisterToolVersion(data=data, id=MOCK_ID)
             tool.data['files'] = [mock_file]
             tool.process_files()
+            assert mock_file['file_wrapper']['content'] == MOCK_ID
 
     def test_process_files_no_content_invalid_url(self, monkeypatch):
         """Test for processing files with no content provided and an invalid
@@ -461,8 +651,9 @@ class TestRegisterToolVersion:
         )
 
         monkeypatch.setattr(
-            'requests.get',
-            lambda *args, **kwargs: _raise(requests.exceptions.ConnectionError)
+            FileFetcher,
+            'fetch',
+            lambda *args, **kwargs: _raise(FetchError),
         )
         data = deepcopy(MOCK_VERSION_NO_ID)
         mock_file = deepcopy(MOCK_CONTAINER_FILE)
@@ -474,6 +665,34 @@ class TestRegisterToolVersion:
                 tool.data['files'] = [mock_file]
                 tool.process_files()
 
+    def test_process_files_defer_content(self, monkeypatch):
+        """Test for processing files with retrieval of contents deferred."""
+        app = Flask(__name__)
+        app.config.foca = Config(
+            db=MongoConfig(**MONGO_CONFIG),
+            custom=CustomConfig(**CUSTOM_CONFIG_CHARSET_LITERAL),
+        )
+
+        monkeypatch.setattr(
+            FileFetcher,
+            'fetch',
+            lambda *args, **kwargs: _raise(FetchError),
+        )
+        data = deepcopy(MOCK_VERSION_NO_ID)
+        mock_file = deepcopy(MOCK_CONTAINER_FILE)
+        del mock_file['file_wrapper']['content']
+        mock_file['file_wrapper']['url'] = MOCK_ID
+        with app.app_context():
+            tool = RegisterToolVersion(
+                data=data,
+                id=MOCK_ID,
+                defer_content=True,
+            )
+            tool.data['files'] = [mock_file]
+            tool.process_files()
+            assert 'content' not in mock_file['file_wrapper']
+            assert '_etag' in mock_file
+
     def test_register_metadata(self):
         """Test for creating a version with a randomly assigned identifier."""
         app = Flask(__name__)
@@ -485,6 +704,12 @@ class TestRegisterToolVersion:
         mock_resp["id"] = MOCK_ID
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['files'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['facets'] \
+            .client = MagicMock()
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client.insert_one(mock_resp)
 
@@ -503,6 +728,12 @@ class TestRegisterToolVersion:
         )
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['files'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['facets'] \
+            .client = MagicMock()
 
         data = deepcopy(MOCK_VERSION_NO_ID)
         with app.app_context():
@@ -525,6 +756,12 @@ class TestRegisterToolVersion:
         mock_resp["id"] = MOCK_ID
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['files'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+            .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['facets'] \
+            .client = MagicMock()
         app.config.foca.db.dbs['trsStore'].collections['tools'] \
             .client.insert_one(mock_resp)
 
@@ -559,6 +796,39 @@ class TestRegisterToolVersion:
                 version = RegisterToolVersion(data=data, id=MOCK_ID)
                 version.register_metadata()
 
+    def test_register_metadata_duplicate_key_regenerate(self, monkeypatch):
+        """Test for creating a version; generated identifier is taken."""
+        app = Flask(__name__)
+        app.config.foca = Config(
+            db=MongoConfig(**MONGO_CONFIG),
+            custom=CustomConfig(**CUSTOM_CONFIG),
+        )
+        for coll in ('tools', 'files', 'blobs', 'facets'):
+            app.config.foca.db.dbs['trsStore'].collections[coll] \
+                .client = mongomock.MongoClient().db[coll]
+        mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+        mock_resp["id"] = MOCK_ID
+        mock_resp["versions"][0]["id"] = MOCK_ID
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.insert_one(mock_resp)
+        ids = iter([MOCK_ID, MOCK_ID_ONE_CHAR])
+        monkeypatch.setattr(
+            'trs_filer.ga4gh.trs.endpoints.context.generate_id',
+            lambda **kwargs: next(ids),
+        )
+
+        data = deepcopy(MOCK_VERSION_NO_ID)
+        with app.app_context():
+            version = RegisterToolVersion(data=data, id=MOCK_ID)
+            version.register_metadata()
+            assert version.data['id'] == MOCK_ID_ONE_CHAR
+        tool = app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.find_one({'id': MOCK_ID})
+        assert [v['id'] for v in tool['versions']] == [
+            MOCK_ID,
+            MOCK_ID_ONE_CHAR,
+        ]
+
     def test_register_metadata_tool_na(self):
         """Test for creating/updating a version; tool not available."""
         app = Flask(__name__)
@@ -56,7 +56,7 @@ class TestRegisterToolClass:
         with app.app_context():
             tool = RegisterToolClass(data)
             tool.process_metadata()
-            assert isinstance(tool.id_charset, str)
+            assert tool.ids.charset == MOCK_ID_ONE_CHAR
 
     def test_register_metadata(self):
         """Test for creating a tool class with a randomly assigned identifier.
@@ -68,6 +68,8 @@ class TestRegisterToolClass:
         )
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
 
         data = deepcopy(MOCK_TOOL_CLASS)
         with app.app_context():
@@ -84,6 +86,8 @@ class TestRegisterToolClass:
         )
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
 
         data = deepcopy(MOCK_TOOL_CLASS)
         with app.app_context():
@@ -101,6 +105,8 @@ class TestRegisterToolClass:
         mock_resp = deepcopy(MOCK_TOOL_CLASS)
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client.insert_one(mock_resp)
 
@@ -121,6 +127,8 @@ class TestRegisterToolClass:
         mock_resp = MagicMock(side_effect=[DuplicateKeyError(''), None])
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = MagicMock()
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client.insert_one = mock_resp
 
@@ -143,6 +151,10 @@ class TestRegisterToolClass:
         mock_resp["id"] = MOCK_ID_ONE_CHAR
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+            .client.create_index('id', unique=True)
         app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
             .client.insert_one(mock_resp)
 
@@ -154,3 +166,54 @@ class TestRegisterToolClass:
                 version.register_metadata()
                 version = RegisterToolClass(data=data)
                 version.register_metadata()
+
+    def test_register_metadata_duplicate_key_regenerate(self, monkeypatch):
+        """Test for creating a tool class; generated identifier is taken."""
+        app = Flask(__name__)
+        app.config.foca = Config(
+            db=MongoConfig(**MONGO_CONFIG),
+            custom=CustomConfig(**CUSTOM_CONFIG),
+        )
+        app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+            .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+            .client.create_index('id', unique=True)
+        app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+            .client.insert_one({**MOCK_TOOL_CLASS, 'id': MOCK_ID})
+        ids = iter([MOCK_ID, MOCK_ID_ONE_CHAR])
+        monkeypatch.setattr(
+            'trs_filer.ga4gh.trs.endpoints.context.generate_id',
+            lambda **kwargs: next(ids),
+        )
+
+        data = deepcopy(MOCK_TOOL_CLASS)
+        del data['id']
+        with app.app_context():
+            tool_class = RegisterToolClass(data=data)
+            tool_class.register_metadata()
+            assert tool_class.data['id'] == MOCK_ID_ONE_CHAR
+
+    def test_register_metadata_unchanged(self):
+        """Test for registering an existing tool class again, unchanged."""
+        app = Flask(__name__)
+        app.config.foca = Config(
+            db=MongoConfig(**MONGO_CONFIG),
+            custom=CustomConfig(**CUSTOM_CONFIG),
+        )
+        app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+            .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client = mongomock.MongoClient().db.collection
+        app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+            .client.insert_one(deepcopy(MOCK_TOOL_CLASS))
+
+        data = deepcopy(MOCK_TOOL_CLASS)
+        del data['id']
+        with app.app_context():
+            for __ in range(2):
+                tool_class = RegisterToolClass(data=deepcopy(data), id=MOCK_ID)
+                tool_class.register_metadata()
+        assert app.config.foca.db.dbs['trsStore'].collections['generations'] \
+            .client.find_one() is None
@@ -0,0 +1,56 @@
+"""Tests for full-text search over tool metadata."""
+
+from bson import ObjectId
+import pytest
+
+from trs_filer.ga4gh.trs.endpoints.search import (
+    compile_search_pipeline,
+    decode_search_cursor,
+    encode_search_cursor,
+    SCORE_FIELD,
+)
+
+OBJECT_ID = ObjectId()
+
+
+def test_compile_search_pipeline():
+    """Test for compiling a search for the first page of results."""
+    pipeline = compile_search_pipeline(
+        q='bwa "read alignment" -mem',
+        filt={'organization': 'org'},
+        limit=10,
+        projection={'versions.files': False},
+    )
+    assert pipeline == [
+        {'$match': {
+            '$text': {'$search': 'bwa "read alignment" -mem'},
+            'organization': 'org',
+        }},
+        {'$addFields': {SCORE_FIELD: {'$meta': 'textScore'}}},
+        {'$sort': {SCORE_FIELD: -1, '_id': 1}},
+        {'$limit': 10},
+        {'$project': {'versions.files': False}},
+    ]
+
+
+def test_compile_search_pipeline_after():
+    """Test for compiling a search resuming after a given result."""
+    pipeline = compile_search_pipeline(q='bwa', after=(0.75, OBJECT_ID))
+    assert pipeline[2] == {'$match': {'$or': [
+        {SCORE_FIELD: {'$lt': 0.75}},
+        {SCORE_FIELD: 0.75, '_id': {'$gt': OBJECT_ID}},
+    ]}}
+    assert pipeline[-1] == {'$limit': 1000}
+
+
+def test_search_cursor():
+    """Test for encoding and decoding search pagination cursors."""
+    cursor = encode_search_cursor(score=1.25, object_id=OBJECT_ID)
+    assert decode_search_cursor(cursor) == (1.25, OBJECT_ID)
+
+
+@pytest.mark.parametrize('cursor', ['%', 'AAAA', 'ü'])
+def test_decode_search_cursor_invalid(cursor):
+    """Test for decoding malformed search pagination cursors."""
+    with pytest.raises(ValueError):
+        decode_search_cursor(cursor)
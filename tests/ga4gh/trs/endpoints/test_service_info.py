@@ -1,6 +1,7 @@
 """Tests for getting/setting service info."""
 
 from copy import deepcopy
+import json
 import string  # noqa: F401
 import pytest
 
@@ -16,8 +17,11 @@ from tests.mock_data import (
     SERVICE_INFO_CONFIG,
 )
 from trs_filer.ga4gh.trs.endpoints.service_info import (
+    get_service_info_cache,
     RegisterServiceInfo,
+    ServiceInfoCache,
 )
+from trs_filer.ga4gh.trs.endpoints.utils import compute_etag
 from trs_filer.errors.exceptions import NotFound
 from trs_filer.custom_config import CustomConfig
 
@@ -172,3 +176,61 @@ class TestRegisterServiceInfo:
             service_info = RegisterServiceInfo()
             headers = service_info._get_headers()
             assert headers == HEADERS_SERVICE_INFO
+
+
+class TestServiceInfoCache:
+    """Tests for `ServiceInfoCache` class."""
+
+    def test_get(self):
+        """Test for serving service info from the cache."""
+        app = Flask(__name__)
+        db_coll_info = mongomock.MongoClient().db.collection
+        db_coll_info.insert_one(deepcopy(SERVICE_INFO_CONFIG))
+        cache = ServiceInfoCache(db_coll_info=db_coll_info, ttl=3600)
+
+        with app.app_context():
+            body, etag = cache.get()
+            db_coll_info.delete_many({})
+            assert cache.get() == (body, etag)
+        assert json.loads(body) == SERVICE_INFO_CONFIG
+        assert etag == compute_etag(SERVICE_INFO_CONFIG)
+        assert cache.loads == 1
+
+    def test_get_ttl(self):
+        """Test for reading service info again after it expired."""
+        app = Flask(__name__)
+        db_coll_info = mongomock.MongoClient().db.collection
+        db_coll_info.insert_one(deepcopy(SERVICE_INFO_CONFIG))
+        cache = ServiceInfoCache(db_coll_info=db_coll_info, ttl=0)
+
+        with app.app_context():
+            cache.get()
+            db_coll_info.delete_many({})
+            with pytest.raises(NotFound):
+                cache.get()
+        assert cache.loads == 1
+
+    def test_invalidate(self):
+        """Test for reading service info again after it was written."""
+        app = Flask(__name__)
+        app.config.foca = Config(
+            db=MongoConfig(**MONGO_CONFIG),
+            custom=CustomConfig(**CUSTOM_CONFIG),
+        )
+        app.config.foca.db.dbs['trsStore'].collections['service_info'] \
+            .client = mongomock.MongoClient().db.collection
+        data = {**deepcopy(SERVICE_INFO_CONFIG), 'name': 'new'}
+
+        with app.app_context():
+            service_info = RegisterServiceInfo()
+            service_info.set_service_info_from_app_context(
+                data=deepcopy(SERVICE_INFO_CONFIG),
+            )
+            cache = get_service_info_cache()
+            assert cache is get_service_info_cache()
+            __, etag = cache.get()
+            service_info.set_service_info_from_app_context(data=data)
+            body, new_etag = cache.get()
+        assert json.loads(body) == data
+        assert new_etag != etag
+        assert cache.loads == 2
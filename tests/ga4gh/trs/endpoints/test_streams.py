@@ -0,0 +1,38 @@
+"""Tests for incremental serialization of database records."""
+
+import json
+
+import pytest
+
+from trs_filer.ga4gh.trs.endpoints.streams import (
+    stream_json_array,
+    stream_ndjson,
+)
+
+RECORDS = [{'id': str(i), 'name': f"tool_{i}"} for i in range(5)]
+
+
+@pytest.mark.parametrize('records', [RECORDS, []])
+def test_stream_json_array(records):
+    """Test for serializing records as JSON array."""
+    chunks = list(stream_json_array(records=iter(records), batch_size=2))
+    assert json.loads(b''.join(chunks)) == records
+
+
+def test_stream_json_array_batches():
+    """Test that one chunk is yielded per batch of records."""
+    chunks = list(stream_json_array(records=iter(RECORDS), batch_size=2))
+    assert len(chunks) == 4
+
+
+def test_stream_ndjson():
+    """Test for serializing records as newline-delimited JSON."""
+    chunks = list(stream_ndjson(records=iter(RECORDS), batch_size=2))
+    assert len(chunks) == 3
+    lines = b''.join(chunks).decode('utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+
+
+def test_stream_ndjson_empty():
+    """Test for serializing no records as newline-delimited JSON."""
+    assert list(stream_ndjson(records=iter([]))) == []
@@ -1,9 +1,114 @@
 """Test for endpoint controller utility functions."""
 
-from tests.mock_data import MOCK_ID_ONE_CHAR
-from trs_filer.ga4gh.trs.endpoints.utils import generate_id
+from bson import ObjectId
+from flask import Flask
+import pytest
+
+from tests.mock_data import (
+    MOCK_ID,
+    MOCK_ID_ONE_CHAR,
+)
+from trs_filer.ga4gh.trs.endpoints.utils import (
+    compute_etag,
+    decode_cursor,
+    encode_cursor,
+    generate_id,
+    get_if_none_match,
+    is_not_modified,
+    iter_batches,
+    not_modified,
+    ULID_CHARSET,
+    ULID_LENGTH,
+    UlidGenerator,
+)
 
 
 def test_generate_id():
     """Test for generating random ID with literal character set."""
     assert generate_id(charset=MOCK_ID_ONE_CHAR, length=6) == "AAAAAA"
+
+
+def test_generate_id_ulid():
+    """Test for generating time-ordered IDs."""
+    ids = [
+        generate_id(charset=MOCK_ID_ONE_CHAR, length=6, strategy='ulid')
+        for __ in range(1000)
+    ]
+    assert ids == sorted(set(ids))
+    assert all(len(id) == ULID_LENGTH for id in ids)
+    assert set(''.join(ids)) <= set(ULID_CHARSET)
+
+
+def test_ulid_generator(monkeypatch):
+    """Test for generating ULIDs within a millisecond and with the clock
+    set back.
+    """
+    generate = UlidGenerator()
+    monkeypatch.setattr('time.time_ns', lambda: 2000000000000000000)
+    first = generate()
+    second = generate()
+    assert first[:10] == second[:10]
+    assert first < second
+    monkeypatch.setattr('time.time_ns', lambda: 1000000000000000000)
+    third = generate()
+    assert third[:10] == first[:10]
+    assert second < third
+    generate.reset()
+    assert generate() < first
+
+
+def test_iter_batches():
+    """Test for grouping items into batches."""
+    assert list(iter_batches(items=range(5), batch_size=2)) == \
+        [[0, 1], [2, 3], [4]]
+    assert list(iter_batches(items=[], batch_size=2)) == []
+
+
+def test_encode_decode_cursor():
+    """Test for round-tripping a pagination cursor."""
+    object_id = ObjectId()
+    cursor = encode_cursor(object_id)
+    assert isinstance(cursor, str)
+    assert decode_cursor(cursor) == object_id
+
+
+def test_decode_cursor_invalid():
+    """Test for decoding a malformed pagination cursor."""
+    with pytest.raises(ValueError):
+        decode_cursor(MOCK_ID)
+
+
+def test_compute_etag():
+    """Test for computing entity tags independent of key order and internal
+    fields.
+    """
+    etag = compute_etag({'id': MOCK_ID, 'name': MOCK_ID_ONE_CHAR})
+    assert etag == compute_etag({
+        'name': MOCK_ID_ONE_CHAR,
+        'id': MOCK_ID,
+        '_etag': MOCK_ID,
+    })
+    assert etag != compute_etag({'id': MOCK_ID})
+
+
+def test_conditional_request():
+    """Test for evaluating the `If-None-Match` header of a request."""
+    app = Flask(__name__)
+    etag = compute_etag({'id': MOCK_ID})
+    with app.test_request_context(headers={'If-None-Match': f'W/"{etag}"'}):
+        assert get_if_none_match() == [etag]
+        assert is_not_modified(etag)
+        assert not is_not_modified(MOCK_ID)
+        assert not is_not_modified(None)
+        res = not_modified(etag)
+        assert res.status_code == 304
+        assert res.get_etag() == (etag, False)
+    with app.test_request_context():
+        assert get_if_none_match() == []
+        assert not is_not_modified(etag)
+
+
+def test_conditional_request_no_request_context():
+    """Test for evaluating conditional requests outside of a request."""
+    assert get_if_none_match() == []
+    assert not is_not_modified(MOCK_ID)
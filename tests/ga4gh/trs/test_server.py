@@ -1,11 +1,16 @@
 """Unit tests for endpoint controllers."""
 
 from copy import deepcopy
+from io import BytesIO
+import json
+from zipfile import ZipFile
 
+from bson import ObjectId
 from flask import Flask
 from flask import (request)
 from foca.models.config import (Config, MongoConfig)
 import mongomock
+from pymongo.errors import OperationFailure
 import pytest
 
 from tests.mock_data import (
@@ -31,10 +36,21 @@ from tests.mock_data import (
     TEST_OFFSET,
     TEST_OFFSET_2,
 )
+from trs_filer.ga4gh.trs.endpoints.facets import compute_facets
+from trs_filer.ga4gh.trs.endpoints.files import store_files
+from trs_filer.ga4gh.trs.endpoints.search import (
+    decode_search_cursor,
+    SCORE_FIELD,
+)
+from trs_filer.ga4gh.trs.endpoints.service_info import (
+    get_service_info_cache,
+)
+from trs_filer.ga4gh.trs.endpoints.utils import compute_etag
 from trs_filer.ga4gh.trs.server import (
     deleteTool,
     deleteToolClass,
     deleteToolVersion,
+    getJob,
     getServiceInfo,
     postServiceInfo,
     postTool,
@@ -44,6 +60,9 @@ from trs_filer.ga4gh.trs.server import (
     putToolClass,
     putToolVersion,
     toolClassesGet,
+    toolsBatchGet,
+    toolsBatchRegister,
+    toolsFacetsGet,
     toolsGet,
     toolsIdGet,
     toolsIdVersionsGet,
@@ -53,6 +72,7 @@ from trs_filer.ga4gh.trs.server import (
     toolsIdVersionsVersionIdTypeDescriptorGet,
     toolsIdVersionsVersionIdTypeDescriptorRelativePathGet,
     toolsIdVersionsVersionIdTypeTestsGet,
+    toolsSearchGet,
 )
 from trs_filer.errors.exceptions import (
     BadRequest,
@@ -74,6 +94,8 @@ def test_toolClassesGet():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client.insert_one(mock_resp)
 
@@ -225,6 +247,139 @@ def test_toolsGet_pagination_negativeOffset():
         assert res == ([], '422', HEADERS_PAGINATION_RESULT)
 
 
+def test_toolsGet_cursor():
+    """Test for getting a list of all available tools; cursor-based
+    pagination.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    for _id in [MOCK_ID, MOCK_ID_2]:
+        mock_resp = deepcopy(MOCK_VERSION_NO_ID)
+        mock_resp['id'] = _id
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.insert_one(mock_resp)
+
+    with app.test_request_context():
+        res, code, headers = toolsGet.__wrapped__(
+            limit=TEST_LIMIT,
+            cursor="",
+        )
+        assert [r['id'] for r in res] == [MOCK_ID]
+        assert code == '200'
+        assert headers['current_offset'] == ""
+        assert headers['next_page'].startswith(
+            f"{request.base_url}?cursor="
+        )
+        next_cursor = headers['next_page'].split('cursor=')[1].split('&')[0]
+        res, code, headers = toolsGet.__wrapped__(
+            limit=TEST_LIMIT,
+            offset=TEST_OFFSET,
+            cursor=next_cursor,
+        )
+        assert [r['id'] for r in res] == [MOCK_ID_2]
+        assert headers['current_offset'] == next_cursor
+        last_cursor = headers['next_page'].split('cursor=')[1].split('&')[0]
+        res, code, headers = toolsGet.__wrapped__(
+            limit=TEST_LIMIT,
+            cursor=last_cursor,
+        )
+        assert res == []
+        assert headers['next_page'].split('cursor=')[1].split('&')[0] == \
+            last_cursor
+
+
+def test_toolsGet_stream():
+    """Test for getting a streamed JSON array of tools; cursor-based
+    pagination.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    for _id in [MOCK_ID, MOCK_ID_2]:
+        mock_resp = deepcopy(MOCK_VERSION_NO_ID)
+        mock_resp['id'] = _id
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.insert_one(mock_resp)
+
+    with app.test_request_context():
+        res = toolsGet.__wrapped__(
+            limit=TEST_LIMIT,
+            cursor="",
+            stream=True,
+        )
+        assert res.mimetype == 'application/json'
+        data = json.loads(b''.join(res.response))
+        assert [r['id'] for r in data] == [MOCK_ID]
+        next_cursor = res.headers['next_page'] \
+            .split('cursor=')[1].split('&')[0]
+        res = toolsGet.__wrapped__(
+            limit=TEST_LIMIT,
+            cursor=next_cursor,
+            stream=True,
+        )
+        data = json.loads(b''.join(res.response))
+        assert [r['id'] for r in data] == [MOCK_ID_2]
+        last_cursor = res.headers['next_page'] \
+            .split('cursor=')[1].split('&')[0]
+        res = toolsGet.__wrapped__(
+            limit=TEST_LIMIT,
+            cursor=last_cursor,
+            stream=True,
+        )
+        assert json.loads(b''.join(res.response)) == []
+        assert res.headers['next_page'].split('cursor=')[1].split('&')[0] \
+            == last_cursor
+
+
+def test_toolsGet_ndjson():
+    """Test for getting tools as newline-delimited JSON."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    for _id in [MOCK_ID, MOCK_ID_2]:
+        mock_resp = deepcopy(MOCK_VERSION_NO_ID)
+        mock_resp['id'] = _id
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.insert_one(mock_resp)
+
+    with app.test_request_context(
+        headers={'Accept': 'application/x-ndjson'},
+    ):
+        res = toolsGet.__wrapped__(
+            limit=DEFAULT_LIMIT,
+            offset=DEFAULT_OFFSET,
+        )
+        assert res.mimetype == 'application/x-ndjson'
+        assert res.headers['current_offset'] == str(DEFAULT_OFFSET)
+        lines = b''.join(res.response).decode('utf-8').splitlines()
+        assert [json.loads(line)['id'] for line in lines] == \
+            [MOCK_ID, MOCK_ID_2]
+
+
+def test_toolsGet_cursor_BadRequest():
+    """Test for getting a list of all available tools; malformed cursor."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+
+    with app.test_request_context():
+        with pytest.raises(BadRequest):
+            toolsGet.__wrapped__(cursor=MOCK_ID)
+
+
 def test_toolsGet_filters():
     """Test for getting a list of all available tools; all defined filters
     specified.
@@ -273,6 +428,161 @@ def test_toolsGet_filters():
         assert res == ([data], '200', HEADERS_PAGINATION_RESULT)
 
 
+# GET /tools/facets
+def test_toolsFacetsGet():
+    """Test for counting tools per facet value while tools and versions are
+    added and deleted.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    for coll in (
+        'tools', 'files', 'blobs', 'facets', 'toolclasses', 'generations',
+    ):
+        app.config.foca.db.dbs['trsStore'].collections[coll] \
+            .client = mongomock.MongoClient().db.collection
+    db_coll_tools = app.config.foca.db.dbs['trsStore'] \
+        .collections['tools'].client
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client.insert_one({'_id': 'migration.facets'})
+
+    def expected():
+        return {
+            facet: [
+                {'value': value, 'count': count}
+                for value, count in sorted(counts.items())
+            ]
+            for facet, counts in compute_facets(db_coll_tools).items()
+        }
+
+    tool = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool['versions'][0]['descriptor_type'] = ['WDL']
+    with app.test_request_context(json=tool):
+        tool_id = postTool.__wrapped__()
+    version = deepcopy(MOCK_VERSION_NO_ID)
+    version['images'][0]['registry_host'] = 'quay.io'
+    with app.test_request_context(json=version):
+        version_id = postToolVersion.__wrapped__(id=tool_id)
+    with app.app_context():
+        res = toolsFacetsGet.__wrapped__()
+        assert res == expected()
+        assert res['descriptorType'] == [
+            {'value': 'CWL', 'count': 1},
+            {'value': 'WDL', 'count': 1},
+        ]
+        deleteToolVersion.__wrapped__(id=tool_id, version_id=version_id)
+        assert toolsFacetsGet.__wrapped__() == expected()
+        deleteTool.__wrapped__(id=tool_id)
+        assert toolsFacetsGet.__wrapped__() == {
+            'toolClass': [],
+            'descriptorType': [],
+            'organization': [],
+            'registry': [],
+        }
+
+
+def test_toolsFacetsGet_not_materialized():
+    """Test for counting tools per facet value before the counts have been
+    materialized.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    for coll in ('tools', 'facets', 'generations'):
+        app.config.foca.db.dbs['trsStore'].collections[coll] \
+            .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_one(deepcopy(MOCK_TOOL_VERSION_ID))
+
+    with app.app_context():
+        res = toolsFacetsGet.__wrapped__()
+        assert res['descriptorType'] == [{'value': 'CWL', 'count': 1}]
+
+
+# GET /tools/search
+def _search_app(monkeypatch, records):
+    """Set up app whose tools collection returns the given search results.
+
+    `mongomock` does not implement text search; the aggregation pipeline is
+    recorded instead.
+    """
+    pipelines = []
+
+    def aggregate(self, pipeline, *args, **kwargs):
+        pipelines.append(pipeline)
+        return iter(deepcopy(records))
+
+    monkeypatch.setattr(
+        'mongomock.collection.Collection.aggregate',
+        aggregate,
+    )
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    return app, pipelines
+
+
+def test_toolsSearchGet(monkeypatch):
+    """Test for searching tools; filters and cursor-based pagination."""
+    object_id = ObjectId()
+    record = deepcopy(MOCK_VERSION_NO_ID)
+    record['id'] = MOCK_ID
+    app, pipelines = _search_app(
+        monkeypatch=monkeypatch,
+        records=[{**record, '_id': object_id, SCORE_FIELD: 1.5}],
+    )
+    with app.test_request_context():
+        res, code, headers = toolsSearchGet.__wrapped__(
+            q='name',
+            organization='organization',
+            limit=TEST_LIMIT,
+        )
+        assert res == [record]
+        assert code == '200'
+        assert headers['current_offset'] == ''
+        next_cursor = headers['next_page'].split('cursor=')[1].split('&')[0]
+        assert decode_search_cursor(next_cursor) == (1.5, object_id)
+        assert pipelines[0][0] == {'$match': {
+            '$text': {'$search': 'name'},
+            'organization': 'organization',
+        }}
+
+        toolsSearchGet.__wrapped__(q='name', cursor=next_cursor)
+        assert {'$match': {'$or': [
+            {SCORE_FIELD: {'$lt': 1.5}},
+            {SCORE_FIELD: 1.5, '_id': {'$gt': object_id}},
+        ]}} in pipelines[1]
+
+
+def test_toolsSearchGet_BadRequest(monkeypatch):
+    """Test for searching tools; malformed cursor."""
+    app, __ = _search_app(monkeypatch=monkeypatch, records=[])
+    with app.test_request_context():
+        with pytest.raises(BadRequest):
+            toolsSearchGet.__wrapped__(q='name', cursor=MOCK_ID)
+
+
+def test_toolsSearchGet_InternalServerError(monkeypatch):
+    """Test for searching tools; text index missing."""
+    def aggregate(self, pipeline, *args, **kwargs):
+        raise OperationFailure('text index required for $text query')
+
+    app, __ = _search_app(monkeypatch=monkeypatch, records=[])
+    monkeypatch.setattr(
+        'mongomock.collection.Collection.aggregate',
+        aggregate,
+    )
+    with app.test_request_context():
+        with pytest.raises(InternalServerError):
+            toolsSearchGet.__wrapped__(q='name')
+
+
 # GET /tools/{id}
 def test_toolsIdGet():
     """Test for getting a tool associated with a given identifier."""
@@ -315,6 +625,73 @@ def test_toolsIdGet_NotFound():
             toolsIdGet.__wrapped__(id=MOCK_ID + MOCK_ID)
 
 
+def test_toolsIdGet_cached():
+    """Test for getting a tool from the cache; the cache is invalidated when
+    the tool is deleted.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+    mock_resp['id'] = MOCK_ID
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['facets'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_one(mock_resp)
+    del mock_resp['_id']
+    del mock_resp['versions'][0]['files']
+
+    with app.app_context():
+        toolsIdGet.__wrapped__(id=MOCK_ID)
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.update_one({'id': MOCK_ID}, {'$set': {'name': MOCK_ID}})
+        res = toolsIdGet.__wrapped__(id=MOCK_ID)
+        assert res == mock_resp
+        deleteTool.__wrapped__(id=MOCK_ID)
+        with pytest.raises(NotFound):
+            toolsIdGet.__wrapped__(id=MOCK_ID)
+
+
+def test_toolsIdGet_not_modified():
+    """Test for conditionally getting a tool with a current entity tag."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+    mock_resp['id'] = MOCK_ID
+    mock_resp['_etag'] = MOCK_ID_2
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_one(mock_resp)
+
+    headers = {'If-None-Match': f'"{MOCK_ID_2}"'}
+    with app.test_request_context(headers=headers):
+        res = toolsIdGet.__wrapped__(id=MOCK_ID)
+        assert res.status_code == 304
+        assert res.get_etag() == (MOCK_ID_2, False)
+        res = toolsIdVersionsGet.__wrapped__(id=MOCK_ID)
+        assert res.status_code == 304
+    with app.test_request_context():
+        res = toolsIdGet.__wrapped__(id=MOCK_ID)
+        assert '_etag' not in res
+    with app.test_request_context(headers=headers):
+        res = toolsIdGet.__wrapped__(id=MOCK_ID)
+        assert res.status_code == 304
+    headers = {'If-None-Match': f'"{MOCK_ID}"'}
+    with app.test_request_context(headers=headers):
+        res = toolsIdGet.__wrapped__(id=MOCK_ID)
+        assert res['id'] == MOCK_ID
+
+
 # GET /tools/{id}/versions
 def test_toolsIdVersionsGet():
     """Test for getting tool versions associated with a given identifier."""
@@ -382,6 +759,36 @@ def test_toolsIdVersionsVersionIdGet():
         assert res == mock_resp["versions"][0]
 
 
+def test_toolsIdVersionsVersionIdGet_not_modified():
+    """Test for conditionally getting a specific version of a tool with a
+    current entity tag.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+    mock_resp['id'] = MOCK_ID
+    mock_resp['versions'][0]['_etag'] = MOCK_ID_2
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_one(mock_resp)
+
+    with app.test_request_context(headers={'If-None-Match': MOCK_ID}):
+        res = toolsIdVersionsVersionIdGet.__wrapped__(
+            id=MOCK_ID,
+            version_id=MOCK_ID,
+        )
+        assert '_etag' not in res
+    with app.test_request_context(headers={'If-None-Match': MOCK_ID_2}):
+        res = toolsIdVersionsVersionIdGet.__wrapped__(
+            id=MOCK_ID,
+            version_id=MOCK_ID,
+        )
+        assert res.status_code == 304
+
+
 def test_toolsIdVersionsVersionIdGet_tool_NotFound():
     """Test for getting a specific version of a tool associated with given tool
     and version identifiers when a tool with the specified identifier is not
@@ -430,6 +837,70 @@ def test_toolsIdVersionsVersionIdGet_version_NotFound():
             )
 
 
+# POST /tools:batchGet
+def test_toolsBatchGet():
+    """Test for getting multiple tools and tool versions, including ones that
+    are not available.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    for _id in [MOCK_ID, MOCK_ID_2]:
+        mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+        mock_resp['id'] = _id
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.insert_one(mock_resp)
+    batch = {
+        'items': [
+            {'id': MOCK_ID},
+            {'id': MOCK_ID_2, 'version_id': MOCK_ID},
+            {'id': MOCK_ID, 'version_id': MOCK_ID_2},
+            {'id': MOCK_ID + MOCK_ID},
+        ],
+    }
+
+    with app.app_context():
+        res = toolsBatchGet.__wrapped__(batch=deepcopy(batch))
+        assert [item['id'] for item in res['items']] == \
+            [item['id'] for item in batch['items']]
+        assert res['items'][0]['tool'] == toolsIdGet.__wrapped__(id=MOCK_ID)
+        assert res['items'][1]['version_id'] == MOCK_ID
+        assert res['items'][1]['version'] == \
+            toolsIdVersionsVersionIdGet.__wrapped__(
+                id=MOCK_ID_2,
+                version_id=MOCK_ID,
+            )
+        for item in res['items'][2:]:
+            assert item['error']['code'] == 404
+            assert 'tool' not in item and 'version' not in item
+
+
+def test_toolsBatchGet_cached():
+    """Test for getting multiple tools from the cache."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+    mock_resp['id'] = MOCK_ID
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_one(mock_resp)
+    batch = {'items': [{'id': MOCK_ID}, {'id': MOCK_ID}]}
+
+    with app.app_context():
+        res = toolsBatchGet.__wrapped__(batch=batch)
+        app.config.foca.db.dbs['trsStore'].collections['tools'] \
+            .client.update_one({'id': MOCK_ID}, {'$set': {'name': MOCK_ID}})
+        assert toolsBatchGet.__wrapped__(batch=batch) == res
+        assert res['items'][0] == res['items'][1]
+        assert toolsIdGet.__wrapped__(id=MOCK_ID) == res['items'][0]['tool']
+
+
 # GET /tools/{id}/versions/{version_id}/containerfile
 def test_toolsIdVersionsVersionIdContainerfileGet():
     """Test for getting container files associated with a specific tool version
@@ -443,8 +914,19 @@ def test_toolsIdVersionsVersionIdContainerfileGet():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client.insert_many([
+            {**_file, 'tool_id': MOCK_ID, 'version_id': MOCK_ID}
+            for _file in mock_resp['versions'][0]['files']
+        ])
 
     with app.app_context():
         res = toolsIdVersionsVersionIdContainerfileGet.__wrapped__(
@@ -467,6 +949,12 @@ def test_toolsIdVersionsVersionIdContainerfileGet_tool_na_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -491,6 +979,12 @@ def test_toolsIdVersionsVersionIdContainerfileGet_version_na_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -517,6 +1011,12 @@ def test_toolsIdVersionsVersionIdContainerfileGet_no_containerfile_NotFound():
 
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -543,8 +1043,55 @@ def test_toolsIdVersionsVersionIdTypeDescriptorGet():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client.insert_many([
+            {**_file, 'tool_id': MOCK_ID, 'version_id': MOCK_ID}
+            for _file in mock_resp['versions'][0]['files']
+        ])
+
+    with app.app_context():
+        res = toolsIdVersionsVersionIdTypeDescriptorGet.__wrapped__(
+            type='CWL',
+            id=MOCK_ID,
+            version_id=MOCK_ID,
+        )
+        assert res == MOCK_DESCRIPTOR_FILE["file_wrapper"]
+
+
+def test_toolsIdVersionsVersionIdTypeDescriptorGet_blob():
+    """Test for getting `PRIMARY_DESCRIPTOR` wrapper whose content is stored
+    separately.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    store_files(
+        db_coll_files=app.config.foca.db.dbs['trsStore']
+        .collections['files'].client,
+        db_coll_blobs=app.config.foca.db.dbs['trsStore']
+        .collections['blobs'].client,
+        tool_id=MOCK_ID,
+        version_id=MOCK_ID,
+        files=mock_resp['versions'][0]['files'],
+    )
 
     with app.app_context():
         res = toolsIdVersionsVersionIdTypeDescriptorGet.__wrapped__(
@@ -555,6 +1102,90 @@ def test_toolsIdVersionsVersionIdTypeDescriptorGet():
         assert res == MOCK_DESCRIPTOR_FILE["file_wrapper"]
 
 
+def test_toolsIdVersionsVersionIdTypeDescriptorGet_embedded():
+    """Test for getting `PRIMARY_DESCRIPTOR` wrapper of a tool whose files
+    are not migrated yet.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    for coll in ('tools', 'files', 'blobs', 'generations'):
+        app.config.foca.db.dbs['trsStore'].collections[coll] \
+            .client = mongomock.MongoClient().db.collection
+    mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+    mock_resp['id'] = MOCK_ID
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_one(mock_resp)
+
+    with app.app_context():
+        res = toolsIdVersionsVersionIdTypeDescriptorGet.__wrapped__(
+            type='CWL',
+            id=MOCK_ID,
+            version_id=MOCK_ID,
+        )
+        assert res == MOCK_DESCRIPTOR_FILE['file_wrapper']
+    data = app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.find_one({'id': MOCK_ID})
+    assert 'files' not in data['versions'][0]
+
+
+def test_toolsIdVersionsVersionIdTypeDescriptorGet_not_modified():
+    """Test for conditionally getting `PRIMARY_DESCRIPTOR` wrapper with a
+    current entity tag.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG)
+    )
+    mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+    mock_resp['id'] = MOCK_ID
+    for _file in mock_resp['versions'][0]['files']:
+        _file['_etag'] = _file['tool_file']['path']
+    app.config.foca.db.dbs['trsStore'] \
+        .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_one(mock_resp)
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client.insert_many([
+            {**_file, 'tool_id': MOCK_ID, 'version_id': MOCK_ID}
+            for _file in mock_resp['versions'][0]['files']
+        ])
+
+    etag = MOCK_DESCRIPTOR_FILE['tool_file']['path']
+    with app.test_request_context(headers={'If-None-Match': f'"{etag}"'}):
+        res = toolsIdVersionsVersionIdTypeDescriptorGet.__wrapped__(
+            type='CWL',
+            id=MOCK_ID,
+            version_id=MOCK_ID,
+        )
+        assert res.status_code == 304
+        res = toolsIdVersionsVersionIdTypeDescriptorRelativePathGet \
+            .__wrapped__(
+                type='CWL',
+                id=MOCK_ID,
+                version_id=MOCK_ID,
+                relative_path=MOCK_DESCRIPTOR_SEC_FILE['tool_file']['path'],
+            )
+        assert res == MOCK_DESCRIPTOR_SEC_FILE['file_wrapper']
+    etag = MOCK_DESCRIPTOR_SEC_FILE['tool_file']['path']
+    with app.test_request_context(headers={'If-None-Match': f'"{etag}"'}):
+        res = toolsIdVersionsVersionIdTypeDescriptorRelativePathGet \
+            .__wrapped__(
+                type='CWL',
+                id=MOCK_ID,
+                version_id=MOCK_ID,
+                relative_path=etag,
+            )
+        assert res.status_code == 304
+
+
 def test_toolsIdVersionsVersionIdTypeDescriptorGet_tool_na_NotFound():
     """Test for getting `PRIMARY_DESCRIPTOR` wrapper associated with a specific
     tool version identified by the given tool and version identifiers for the
@@ -569,6 +1200,12 @@ def test_toolsIdVersionsVersionIdTypeDescriptorGet_tool_na_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -595,6 +1232,12 @@ def test_toolsIdVersionsVersionIdTypeDescriptorGet_version_na_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -621,6 +1264,12 @@ def test_toolsIdVersionsVersionIdTypeDescriptorGet_type_NotFound():
     mock_resp['versions'][0]['files'] = []
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -647,8 +1296,19 @@ def test_toolsIdVersionsVersionIdTypeDescriptorRelativePathGet():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client.insert_many([
+            {**_file, 'tool_id': MOCK_ID, 'version_id': MOCK_ID}
+            for _file in mock_resp['versions'][0]['files']
+        ])
 
     with app.app_context():
         res = toolsIdVersionsVersionIdTypeDescriptorRelativePathGet \
@@ -675,6 +1335,12 @@ def test_toolsIdVersionsVersionIdTypeDescriptorRelativePathGet_tool_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -702,6 +1368,12 @@ def test_toolsIdVersionsVersionIdTypeDescriptorRelativePathGet_vers_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -729,6 +1401,12 @@ def test_toolsIdVersionsVersionIdTypeDescriptorRelativePathGet_type_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -756,6 +1434,12 @@ def test_toolsIdVersionsVersionIdTypeDescriptorRelativePathGet_path_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -783,8 +1467,19 @@ def test_toolsIdVersionsVersionIdTypeFilesGet():
     mock_resp['versions'][0]['files'][4]['type'] = "WDL"
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client.insert_many([
+            {**_file, 'tool_id': MOCK_ID, 'version_id': MOCK_ID}
+            for _file in mock_resp['versions'][0]['files']
+        ])
 
     with app.app_context():
         res = toolsIdVersionsVersionIdTypeFilesGet.__wrapped__(
@@ -803,6 +1498,78 @@ def test_toolsIdVersionsVersionIdTypeFilesGet():
         assert len(res) == len(descriptors) - 1
 
 
+def test_toolsIdVersionsVersionIdTypeFilesGet_zip(tmp_path):
+    """Test for getting a zip archive of the descriptor files associated with
+    a specific tool version identified by the given tool and version
+    identifiers.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    app.config.foca.custom.archive_cache.path = str(tmp_path)
+    mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+    mock_resp['id'] = MOCK_ID
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_one(mock_resp)
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client.insert_many([
+            {**_file, 'tool_id': MOCK_ID, 'version_id': MOCK_ID}
+            for _file in mock_resp['versions'][0]['files']
+        ])
+
+    with app.test_request_context():
+        res = toolsIdVersionsVersionIdTypeFilesGet.__wrapped__(
+            id=MOCK_ID,
+            version_id=MOCK_ID,
+            type="CWL",
+            format="zip",
+        )
+        assert res.mimetype == 'application/zip'
+        data = b''.join(res.response)
+        archive = ZipFile(BytesIO(data))
+        assert archive.namelist() == [
+            _file['tool_file']['path']
+            for _file in mock_resp['versions'][0]['files']
+            if _file['type'] == "CWL"
+        ]
+        etag, _ = res.get_etag()
+    with app.test_request_context():
+        res = toolsIdVersionsVersionIdTypeFilesGet.__wrapped__(
+            id=MOCK_ID,
+            version_id=MOCK_ID,
+            type="CWL",
+            format="zip",
+        )
+        res.direct_passthrough = False
+        assert res.get_data() == data
+    with app.test_request_context(headers={'If-None-Match': f'"{etag}"'}):
+        res = toolsIdVersionsVersionIdTypeFilesGet.__wrapped__(
+            id=MOCK_ID,
+            version_id=MOCK_ID,
+            type="CWL",
+            format="zip",
+        )
+        assert res.status_code == 304
+    with app.test_request_context():
+        with pytest.raises(NotFound):
+            toolsIdVersionsVersionIdTypeFilesGet.__wrapped__(
+                id=MOCK_ID,
+                version_id=MOCK_ID_2,
+                type="CWL",
+                format="zip",
+            )
+
+
 def test_toolsIdVersionsVersionIdTypeFilesGet_tool_na_NotFound():
     """Test for getting descriptor files associated with a specific tool version
     identified by the given tool and version identifiers with specified tool
@@ -817,6 +1584,8 @@ def test_toolsIdVersionsVersionIdTypeFilesGet_tool_na_NotFound():
     mock_resp['versions'][0]['files'][4]['type'] = "WDL"
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -843,6 +1612,12 @@ def test_toolsIdVersionsVersionIdTypeFilesGet_version_na_NotFound():
     mock_resp['versions'][0]['files'][4]['type'] = "WDL"
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -869,6 +1644,12 @@ def test_toolsIdVersionsVersionIdTypeFilesGet_no_tool_file_NotFound():
     mock_resp['versions'][0]['files'] = []
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -911,8 +1692,19 @@ def test_toolsIdVersionsVersionIdTypeTestsGet():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client.insert_many([
+            {**_file, 'tool_id': MOCK_ID, 'version_id': MOCK_ID}
+            for _file in mock_resp['versions'][0]['files']
+        ])
 
     with app.app_context():
         res = toolsIdVersionsVersionIdTypeTestsGet.__wrapped__(
@@ -936,6 +1728,12 @@ def test_toolsIdVersionsVersionIdTypeTestsGet_tool_na_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -961,6 +1759,12 @@ def test_toolsIdVersionsVersionIdTypeTestsGet_version_na_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -987,6 +1791,12 @@ def test_toolsIdVersionsVersionIdTypeTestsGet_type_NotFound():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'] \
         .collections['tools'].client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -1013,9 +1823,18 @@ def test_getServiceInfo():
     app.config.foca.db.dbs['trsStore'].collections['service_info'] \
         .client.insert_one(mock_resp)
 
-    with app.app_context():
+    with app.test_request_context():
+        res = getServiceInfo.__wrapped__()
+        assert res.status_code == 200
+        assert json.loads(res.get_data()) == SERVICE_INFO_CONFIG
+        etag, __ = res.get_etag()
+        assert etag == compute_etag(SERVICE_INFO_CONFIG)
+
+    with app.test_request_context(headers={'If-None-Match': f'"{etag}"'}):
         res = getServiceInfo.__wrapped__()
-        assert res == SERVICE_INFO_CONFIG
+        assert res.status_code == 304
+    with app.app_context():
+        assert get_service_info_cache().loads == 1
 
 
 # POST /service-info
@@ -1032,7 +1851,13 @@ def test_postServiceInfo():
     with app.test_request_context(json=deepcopy(SERVICE_INFO_CONFIG)):
         postServiceInfo.__wrapped__()
         res = getServiceInfo.__wrapped__()
-        assert res == SERVICE_INFO_CONFIG
+        assert json.loads(res.get_data()) == SERVICE_INFO_CONFIG
+
+    data = {**deepcopy(SERVICE_INFO_CONFIG), 'name': MOCK_ID}
+    with app.test_request_context(json=data):
+        postServiceInfo.__wrapped__()
+        res = getServiceInfo.__wrapped__()
+        assert json.loads(res.get_data())['name'] == MOCK_ID
 
 
 # POST /tools
@@ -1045,14 +1870,56 @@ def test_postTool():
     )
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['facets'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
 
     with app.test_request_context(json=deepcopy(MOCK_TOOL_VERSION_ID)):
         res = postTool.__wrapped__()
         assert isinstance(res, str)
 
 
+# POST /tools:batchRegister
+def test_toolsBatchRegister():
+    """Test for creating multiple tools."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['facets'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
+    batch = {
+        'items': [
+            {'tool': deepcopy(MOCK_TOOL_VERSION_ID)},
+            {'id': MOCK_ID, 'tool': deepcopy(MOCK_TOOL_VERSION_ID)},
+        ],
+    }
+
+    with app.app_context():
+        res = toolsBatchRegister.__wrapped__(batch=batch)
+        assert isinstance(res['items'][0]['id'], str)
+        assert res['items'][1] == {'id': MOCK_ID}
+        assert toolsIdGet.__wrapped__(id=MOCK_ID)['id'] == MOCK_ID
+
+
 # PUT /tools/{id}
 def test_putTool():
     """Test for creating a tool; identifier provided by user."""
@@ -1063,14 +1930,77 @@ def test_putTool():
     )
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['facets'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
 
     with app.test_request_context(json=deepcopy(MOCK_TOOL_VERSION_ID)):
         res = putTool.__wrapped__(id=MOCK_ID)
         assert res == MOCK_ID
 
 
+def test_postTool_async():
+    """Test for creating a tool with asynchronous retrieval of contents."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    for coll in (
+        'tools', 'files', 'blobs', 'facets', 'toolclasses', 'jobs',
+        'generations',
+    ):
+        app.config.foca.db.dbs['trsStore'].collections[coll] \
+            .client = mongomock.MongoClient().db.collection
+
+    with app.test_request_context(
+        json=deepcopy(MOCK_TOOL_VERSION_ID),
+        headers={'Prefer': 'respond-async'},
+    ):
+        job, status, headers = postTool.__wrapped__()
+        assert status == '202'
+        assert headers['Location'].endswith(f"/jobs/{job['id']}")
+        assert headers['Preference-Applied'] == 'respond-async'
+        assert job['tool_id'] == getJob.__wrapped__(id=job['id'])['tool_id']
+
+
+def test_putToolVersion_async():
+    """Test for updating a tool version with asynchronous retrieval of
+    contents.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    for coll in ('tools', 'files', 'blobs', 'jobs'):
+        app.config.foca.db.dbs['trsStore'].collections[coll] \
+            .client = mongomock.MongoClient().db.collection
+    mock_resp = deepcopy(MOCK_TOOL_VERSION_ID)
+    mock_resp['id'] = MOCK_ID
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_one(mock_resp)
+
+    with app.test_request_context(
+        json=deepcopy(MOCK_VERSION_NO_ID),
+        headers={'Prefer': 'handling=lenient, respond-async; wait=10'},
+    ):
+        job, status, headers = putToolVersion.__wrapped__(
+            id=MOCK_ID,
+            version_id=MOCK_ID,
+        )
+        assert status == '202'
+        assert job['tool_id'] == MOCK_ID
+        assert job['version_ids'] == [MOCK_ID]
+
+
 def test_putTool_update():
     """Test for updating an existing tool."""
     app = Flask(__name__)
@@ -1082,8 +2012,16 @@ def test_putTool_update():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['facets'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
@@ -1106,6 +2044,12 @@ def test_deleteTool():
     mock_resp['id'] = MOCK_ID
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['facets'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -1146,6 +2090,12 @@ def test_postToolVersion():
     mock_resp["id"] = MOCK_ID
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['facets'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -1166,6 +2116,12 @@ def test_putToolVersion():
     mock_resp["id"] = MOCK_ID
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['facets'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -1188,6 +2144,10 @@ def test_putToolVersion_update():
     mock_resp["id"] = MOCK_ID
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -1214,6 +2174,12 @@ def test_deleteToolVersion():
     mock_resp['versions'].append(deepcopy(MOCK_VERSION_ID))
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['files'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['blobs'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['facets'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['tools'] \
         .client.insert_one(mock_resp)
 
@@ -1322,6 +2288,8 @@ def test_postToolClass():
     )
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
 
     data = deepcopy(MOCK_TOOL_CLASS)
     del data['id']
@@ -1340,6 +2308,8 @@ def test_putToolClass():
     )
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
 
     data = deepcopy(MOCK_TOOL_CLASS)
     del data['id']
@@ -1359,6 +2329,8 @@ def test_putToolClass_update():
     mock_resp = deepcopy(MOCK_TOOL_CLASS)
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client.insert_one(mock_resp)
 
@@ -1383,6 +2355,8 @@ def test_deleteToolClass():
         .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['generations'] \
+        .client = mongomock.MongoClient().db.collection
     app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
         .client.insert_one(mock_resp)
 
@@ -1442,3 +2416,49 @@ def test_deleteToolClass_BadRequest():
             deleteToolClass.__wrapped__(
                 id=MOCK_ID,
             )
+
+
+def test_deleteToolClass_BadRequest_many_tools():
+    """Test for deleting a tool class associated with a given `id` when the
+    only tool associated with this tool class is preceded by many others.
+    """
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client = mongomock.MongoClient().db.collection
+    app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+        .client = mongomock.MongoClient().db.collection
+    other_tool = deepcopy(MOCK_TOOL_VERSION_ID)
+    other_tool.pop('_id', None)
+    other_tool['toolclass'] = {**MOCK_TOOL_CLASS, 'id': MOCK_ID_2}
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_many([
+            {**deepcopy(other_tool), 'id': str(i)}
+            for i in range(DEFAULT_LIMIT)
+        ])
+    app.config.foca.db.dbs['trsStore'].collections['tools'] \
+        .client.insert_one(deepcopy(MOCK_TOOL_VERSION_ID))
+    app.config.foca.db.dbs['trsStore'].collections['toolclasses'] \
+        .client.insert_one(deepcopy(MOCK_TOOL_CLASS))
+
+    with app.test_request_context():
+        with pytest.raises(BadRequest):
+            deleteToolClass.__wrapped__(
+                id=MOCK_ID,
+            )
+
+
+# GET /jobs/{id}
+def test_getJob_not_found():
+    """Test for getting an unavailable job."""
+    app = Flask(__name__)
+    app.config.foca = Config(db=MongoConfig(**MONGO_CONFIG))
+    app.config.foca.db.dbs['trsStore'].collections['jobs'] \
+        .client = mongomock.MongoClient().db.collection
+
+    with app.app_context():
+        with pytest.raises(NotFound):
+            getJob.__wrapped__(id=MOCK_ID)
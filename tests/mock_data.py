@@ -20,6 +20,11 @@ COLLECTION_CONFIG = {
 }
 DB_CONFIG = {
     'collections': {
+        'blobs': COLLECTION_CONFIG,
+        'facets': COLLECTION_CONFIG,
+        'files': COLLECTION_CONFIG,
+        'generations': COLLECTION_CONFIG,
+        'jobs': COLLECTION_CONFIG,
         'service_info': COLLECTION_CONFIG,
         'toolclasses': COLLECTION_CONFIG,
         'tools': COLLECTION_CONFIG,
@@ -89,6 +94,9 @@ CUSTOM_CONFIG_CHARSET_LITERAL['version'] = (
 CUSTOM_CONFIG_ONE_ID = deepcopy(CUSTOM_CONFIG)
 CUSTOM_CONFIG_ONE_ID['tool'] = TOOL_VERSION_CONFIG_ONE_ID
 CUSTOM_CONFIG_ONE_ID['version'] = TOOL_VERSION_CONFIG_ONE_ID
+CUSTOM_CONFIG_ULID = deepcopy(CUSTOM_CONFIG)
+CUSTOM_CONFIG_ULID['tool']['id']['strategy'] = 'ulid'
+CUSTOM_CONFIG_ULID['version']['id']['strategy'] = 'ulid'
 CUSTOM_CONFIG_TOOL_CLASS_VALIDATION = deepcopy(CUSTOM_CONFIG)
 CUSTOM_CONFIG_TOOL_CLASS_VALIDATION['toolclass']['validation'] = True
 HEADERS_PAGINATION = {
@@ -0,0 +1,22 @@
+"""Smoke tests for benchmarks."""
+
+import pytest
+
+from benchmarks.bench_registration import (
+    register_bulk,
+    register_single,
+    run,
+)
+
+
+@pytest.mark.parametrize('register', [register_single, register_bulk])
+@pytest.mark.parametrize('with_files', [False, True])
+def test_bench_registration(monkeypatch, register, with_files):
+    """Test for running the registration benchmark on a few tools."""
+    monkeypatch.delenv('MONGO_URI', raising=False)
+    assert run(
+        register=register,
+        n_tools=3,
+        batch_size=2,
+        with_files=with_files,
+    ) > 0
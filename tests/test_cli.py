@@ -0,0 +1,297 @@
+"""Unit tests for the command-line interface."""
+
+from copy import deepcopy
+import gzip
+from importlib import import_module
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from flask import Flask
+from foca import Foca
+from foca.models.config import (Config, MongoConfig, SpecConfig)
+import mongomock
+import pytest
+
+from tests.mock_data import (
+    CUSTOM_CONFIG,
+    MOCK_ID,
+    MOCK_TOOL,
+    MOCK_TOOL_VERSION_ID,
+    MONGO_CONFIG,
+    SERVICE_INFO_CONFIG,
+)
+from trs_filer.cli import (
+    APP_DIR,
+    get_tool_validator,
+    import_documents,
+    main,
+    read_records,
+    RegistryExporter,
+    ToolImporter,
+)
+from trs_filer.custom_config import CustomConfig
+from trs_filer.ga4gh.trs.endpoints.register_objects import RegisterTool
+
+COLLECTIONS = (
+    'tools',
+    'files',
+    'blobs',
+    'toolclasses',
+    'service_info',
+    'facets',
+    'generations',
+)
+API_DIR = Path(__file__).resolve().parents[1] / 'trs_filer' / 'api'
+SPEC_CONFIG = SpecConfig(
+    path=[
+        API_DIR / '20230406.1dd4bf8.openapi.yaml',
+        API_DIR / 'additions.openapi.yaml',
+    ],
+)
+
+
+@pytest.fixture
+def app():
+    """Create app with in-memory database collections."""
+    app = Flask(__name__)
+    app.config.foca = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        custom=CustomConfig(**CUSTOM_CONFIG),
+    )
+    app.config.foca.api.specs = [SPEC_CONFIG]
+    for name in COLLECTIONS:
+        app.config.foca.db.dbs['trsStore'].collections[name] \
+            .client = mongomock.MongoClient().db[name]
+    return app
+
+
+@pytest.fixture
+def source(tmp_path):
+    """Create directory tree of tool records."""
+    (tmp_path / 'nested').mkdir()
+    with open(tmp_path / 'tools.ndjson', 'w') as _file:
+        _file.write(json.dumps(MOCK_TOOL) + '\n\n')
+        _file.write(json.dumps({**MOCK_TOOL, 'id': MOCK_ID}) + '\n')
+    with open(tmp_path / 'nested' / 'tool.json', 'w') as _file:
+        json.dump(MOCK_TOOL, _file)
+    (tmp_path / 'README.md').write_text('not a tool')
+    return tmp_path
+
+
+def test_read_records(source):
+    """Test for reading records from a directory tree."""
+    records = list(read_records(source=str(source)))
+    assert [location for location, __ in records] == [
+        f"{source / 'nested' / 'tool.json'}",
+        f"{source / 'tools.ndjson'}:1",
+        f"{source / 'tools.ndjson'}:3",
+    ]
+    assert json.loads(records[2][1])['id'] == MOCK_ID
+
+
+def test_read_records_file(source):
+    """Test for reading records from a single NDJSON file."""
+    records = list(read_records(source=str(source / 'tools.ndjson')))
+    assert len(records) == 2
+
+
+def test_read_records_not_found(tmp_path):
+    """Test for reading records from a non-existent source."""
+    with pytest.raises(FileNotFoundError):
+        list(read_records(source=str(tmp_path / MOCK_ID)))
+
+
+def test_get_tool_validator():
+    """Test for validating tool records against the API specification."""
+    validator = get_tool_validator(specs=[SPEC_CONFIG])
+    assert validator.is_valid({**deepcopy(MOCK_TOOL), 'id': MOCK_ID})
+    assert not validator.is_valid({'organization': MOCK_ID})
+    assert get_tool_validator(specs=[]) is None
+
+
+def test_tool_importer(app, capsys):
+    """Test for importing valid and invalid tool records."""
+    records = [
+        ('a:1', json.dumps(MOCK_TOOL)),
+        ('a:2', json.dumps({**MOCK_TOOL, 'id': MOCK_ID})),
+        ('a:3', '{'),
+        ('a:4', json.dumps({'organization': MOCK_ID})),
+    ]
+    importer = ToolImporter(
+        app=app,
+        batch_size=1,
+        workers=1,
+        validator=get_tool_validator(specs=[SPEC_CONFIG]),
+    )
+    importer.run(records=records)
+    assert importer.imported == 2
+    assert importer.failed == 2
+    err = capsys.readouterr().err
+    assert 'a:3: Invalid JSON' in err
+    assert 'a:4: Invalid tool' in err
+    db_coll_tools = app.config.foca.db.dbs['trsStore'] \
+        .collections['tools'].client
+    assert db_coll_tools.count_documents({}) == 2
+    assert db_coll_tools.count_documents({'id': MOCK_ID}) == 1
+
+
+def test_main_import(app, monkeypatch, source):
+    """Test for running the `import` command."""
+    monkeypatch.setattr(
+        'trs_filer.cli.init_app',
+        lambda: SimpleNamespace(app=app),
+    )
+    assert main(['import', str(source), '--workers', '1']) == 0
+    assert main(['import', str(source / MOCK_ID)]) == 2
+    db_coll_tools = app.config.foca.db.dbs['trsStore'] \
+        .collections['tools'].client
+    assert db_coll_tools.count_documents({}) == 3
+
+
+def test_read_records_gzip(tmp_path):
+    """Test for reading records from compressed files."""
+    with gzip.open(tmp_path / 'tools.ndjson.gz', 'wt') as _file:
+        _file.write(json.dumps(MOCK_TOOL) + '\n')
+    with gzip.open(tmp_path / 'toolclasses.ndjson.gz', 'wt') as _file:
+        _file.write(json.dumps(MOCK_TOOL['toolclass']) + '\n')
+    records = list(read_records(source=str(tmp_path)))
+    assert [location for location, __ in records] == [
+        f"{tmp_path / 'tools.ndjson.gz'}:1",
+    ]
+    assert json.loads(records[0][1]) == MOCK_TOOL
+
+
+def test_import_documents(app, tmp_path):
+    """Test for importing objects of a snapshot file."""
+    path = tmp_path / 'service_info.ndjson.gz'
+    with gzip.open(path, 'wt') as _file:
+        _file.write(json.dumps(SERVICE_INFO_CONFIG) + '\n')
+        _file.write(json.dumps({**SERVICE_INFO_CONFIG, 'name': 'new'}) + '\n')
+    db_coll_info = app.config.foca.db.dbs['trsStore'] \
+        .collections['service_info'].client
+    assert import_documents(db_coll=db_coll_info, path=path) == 2
+    assert db_coll_info.count_documents({}) == 1
+    assert db_coll_info.find_one()['name'] == 'new'
+
+
+@pytest.mark.parametrize('partitions', [1, 2, 5])
+def test_registry_exporter(app, tmp_path, partitions):
+    """Test for exporting tools, including files, to snapshot partitions."""
+    db = app.config.foca.db.dbs['trsStore']
+    db.collections['service_info'].client.insert_one(
+        deepcopy(SERVICE_INFO_CONFIG),
+    )
+    ids = []
+    with app.app_context():
+        for __ in range(3):
+            tool = RegisterTool(data=deepcopy(MOCK_TOOL))
+            tool.register_metadata()
+            ids.append(tool.data['id'])
+    exporter = RegistryExporter(
+        app=app,
+        destination=tmp_path,
+        partitions=partitions,
+        batch_size=2,
+    )
+    counts = exporter.run()
+    assert counts == {
+        'toolclasses': db.collections['toolclasses'].client.count_documents(
+            {},
+        ),
+        'service_info': 1,
+        'tools': 3,
+    }
+    parts = sorted((tmp_path / 'tools').iterdir())
+    assert len(parts) == min(partitions, 3)
+    records = [
+        json.loads(text) for __, text in read_records(source=str(tmp_path))
+    ]
+    assert sorted(record['id'] for record in records) == sorted(ids)
+    record = records[0]
+    assert not {'_id', '_etag', 'url', 'meta_version'} & set(record)
+    version = record['versions'][0]
+    assert not {'_id', 'url', 'meta_version'} & set(version)
+    assert version['files'] == MOCK_TOOL['versions'][0]['files']
+
+
+def test_main_export(app, monkeypatch, tmp_path):
+    """Test for exporting a snapshot and importing it into a new database."""
+    monkeypatch.setattr(
+        'trs_filer.cli.init_app',
+        lambda: SimpleNamespace(app=app),
+    )
+    db = app.config.foca.db.dbs['trsStore']
+    db.collections['service_info'].client.insert_one(
+        deepcopy(SERVICE_INFO_CONFIG),
+    )
+    with app.app_context():
+        tool = RegisterTool(data=deepcopy(MOCK_TOOL))
+        tool.register_metadata()
+    tool_id = tool.data['id']
+    assert main(['export', str(tmp_path), '--partitions', '2']) == 0
+    for name in COLLECTIONS:
+        db.collections[name].client = mongomock.MongoClient().db[name]
+    # state derived from the previous collections, as in a new process
+    app.extensions.clear()
+    assert main(['import', str(tmp_path), '--workers', '1']) == 0
+    tool = db.collections['tools'].client.find_one({'id': tool_id})
+    assert tool['name'] == MOCK_TOOL['name']
+    assert db.collections['files'].client.count_documents(
+        {'tool_id': tool_id},
+    ) == sum(len(version['files']) for version in MOCK_TOOL['versions'])
+    assert db.collections['toolclasses'].client.count_documents({}) == 1
+    assert db.collections['service_info'].client.find_one(
+        projection={'_id': False},
+    ) == SERVICE_INFO_CONFIG
+
+
+def test_main_migrate(app, monkeypatch, tmp_path):
+    """Test for exporting and migrating a tool stored by a previous version
+    of the app.
+    """
+    monkeypatch.setattr(
+        'trs_filer.cli.init_app',
+        lambda: SimpleNamespace(app=app),
+    )
+    db = app.config.foca.db.dbs['trsStore']
+    tool = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool['id'] = MOCK_ID
+    db.collections['tools'].client.insert_one(tool)
+    assert main(['export', str(tmp_path)]) == 0
+    records = [
+        json.loads(text) for __, text in read_records(source=str(tmp_path))
+    ]
+    assert records[0]['versions'][0]['files'] == \
+        MOCK_TOOL_VERSION_ID['versions'][0]['files']
+
+    assert main(['migrate']) == 0
+    data = db.collections['tools'].client.find_one({'id': MOCK_ID})
+    assert 'files' not in data['versions'][0]
+    assert db.collections['files'].client.count_documents(
+        {'tool_id': MOCK_ID},
+    ) == len(MOCK_TOOL_VERSION_ID['versions'][0]['files'])
+    assert db.collections['facets'].client.count_documents({}) > 0
+    assert main(['migrate']) == 0
+
+
+def test_main_cwd(app, monkeypatch, tmp_path):
+    """Test for running commands from outside the package directory."""
+    def init_app():
+        conf = Foca(
+            config_file=APP_DIR / 'config.yaml',
+            custom_config_model='trs_filer.custom_config.CustomConfig',
+        ).conf
+        for spec in conf.api.specs:
+            assert all(path.is_file() for path in spec.path)
+            import_module(
+                spec.add_operation_fields['x-openapi-router-controller']
+            )
+        return SimpleNamespace(app=app)
+
+    monkeypatch.setattr('trs_filer.cli.init_app', init_app)
+    monkeypatch.chdir(tmp_path)
+    assert main(['export', 'snapshot']) == 0
+    assert Path.cwd() == tmp_path
+    assert (tmp_path / 'snapshot' / 'service_info.ndjson.gz').is_file()
+    assert main(['import', 'snapshot', '--workers', '1']) == 0
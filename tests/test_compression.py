@@ -0,0 +1,133 @@
+"""Unit tests for response compression."""
+
+import gzip
+import json
+
+from flask import (Flask, jsonify, Response)
+import pytest
+
+from trs_filer.compression import (
+    register_response_compression,
+    ResponseCompressor,
+)
+from trs_filer.custom_config import ResponseCompressionConfig
+
+DATA = {'content': 'cwlVersion: v1.0\n' * 200}
+ETAG = 'etag'
+
+
+@pytest.fixture
+def app():
+    """Create app with routes returning large and small bodies."""
+    app = Flask(__name__)
+
+    @app.route('/large')
+    def large():
+        return jsonify(DATA)
+
+    @app.route('/small')
+    def small():
+        return jsonify({})
+
+    @app.route('/etag')
+    def etag():
+        response = jsonify(DATA)
+        response.set_etag(ETAG)
+        return response
+
+    @app.route('/tools/<id>')
+    def tool(id):
+        response = jsonify({**DATA, 'id': id})
+        response.set_etag(ETAG)
+        return response
+
+    @app.route('/tools/<id>/versions')
+    def versions(id):
+        response = jsonify([DATA])
+        response.set_etag(ETAG)
+        return response
+
+    @app.route('/binary')
+    def binary():
+        return Response(b'x' * 2048, mimetype='application/zip')
+
+    return app
+
+
+def test_register_response_compression(app):
+    """Test for compressing a large response."""
+    compressor = register_response_compression(app=app)
+    assert compressor.encoders
+    client = app.test_client()
+    plain = client.get('/large')
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['Vary'] == 'Accept-Encoding'
+    res = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert res.headers['Content-Encoding'] == 'gzip'
+    assert res.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(res.data) == plain.data
+    assert len(res.data) < len(plain.data)
+
+
+def test_register_response_compression_disabled_encoding(app):
+    """Test that no encoding is applied if the client rejects it."""
+    register_response_compression(app=app)
+    client = app.test_client()
+    res = client.get('/large', headers={'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in res.headers
+
+
+@pytest.mark.parametrize('path', ['/small', '/binary'])
+def test_register_response_compression_skipped(app, path):
+    """Test that small and non-text responses are not compressed."""
+    register_response_compression(
+        app=app,
+        config=ResponseCompressionConfig(min_size=1024),
+    )
+    client = app.test_client()
+    res = client.get(path, headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in res.headers
+
+
+def test_response_compressor_cache(app):
+    """Test for reusing compressed bodies of responses with entity tag."""
+    compressor = ResponseCompressor()
+    compressor.encoders = {'gzip': compressor.encoders['gzip']}
+    app.after_request(compressor)
+    client = app.test_client()
+    for _ in range(2):
+        res = client.get('/etag', headers={'Accept-Encoding': 'gzip'})
+        assert res.headers['Content-Encoding'] == 'gzip'
+        assert res.headers['ETag'] == f'W/"{ETAG}"'
+    assert compressor.cache.stats == {'hits': 1, 'misses': 1, 'entries': 1}
+    client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert compressor.cache.stats['entries'] == 1
+
+
+def test_response_compressor_cache_max_size(app):
+    """Test that large compressed bodies are not cached."""
+    compressor = ResponseCompressor(cache_max_size=1)
+    app.after_request(compressor)
+    client = app.test_client()
+    client.get('/etag', headers={'Accept-Encoding': 'gzip'})
+    assert compressor.cache.stats['entries'] == 0
+
+
+def test_response_compressor_cache_shared_etag(app):
+    """Test that compressed bodies of different resources with the same
+    entity tag are not mixed up.
+    """
+    compressor = ResponseCompressor()
+    compressor.encoders = {'gzip': compressor.encoders['gzip']}
+    app.after_request(compressor)
+    client = app.test_client()
+    for _ in range(2):
+        for path, data in (
+            ('/tools/a', {**DATA, 'id': 'a'}),
+            ('/tools/a/versions', [DATA]),
+            ('/tools/a?x=1', {**DATA, 'id': 'a'}),
+        ):
+            res = client.get(path, headers={'Accept-Encoding': 'gzip'})
+            assert res.headers['Content-Encoding'] == 'gzip'
+            assert json.loads(gzip.decompress(res.data)) == data
+    assert compressor.cache.stats == {'hits': 3, 'misses': 3, 'entries': 3}
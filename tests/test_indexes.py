@@ -0,0 +1,59 @@
+"""Tests for `indexes.py` module."""
+
+import logging
+from types import SimpleNamespace
+
+from foca.models.config import MongoConfig
+import mongomock
+
+from tests.mock_data import MONGO_CONFIG
+from trs_filer.indexes import (
+    check_indexes,
+    EXPECTED_INDEXES,
+)
+
+
+def _mock_db():
+    """Set up database config with mock collections."""
+    db = MongoConfig(**MONGO_CONFIG).dbs['trsStore']
+    client = mongomock.MongoClient().db
+    for coll_name, coll in db.collections.items():
+        coll.client = client[coll_name]
+    return db
+
+
+def test_check_indexes():
+    """Test for checking indexes when all expected indexes are available."""
+    db = _mock_db()
+    for coll_name, indexes in EXPECTED_INDEXES.items():
+        for keys in indexes:
+            db.collections[coll_name].client.create_index(keys)
+    assert check_indexes(db=db) == []
+
+
+def test_check_indexes_missing(caplog):
+    """Test for checking indexes when expected indexes are missing."""
+    db = _mock_db()
+    db.collections['tools'].client.create_index([('id', 1)])
+    with caplog.at_level(logging.WARNING):
+        missing = check_indexes(db=db)
+    assert ('tools', [('id', 1)]) not in missing
+    assert ('tools', [('versions.author', 1)]) in missing
+    assert ('toolclasses', [('id', 1)]) in missing
+    assert len(caplog.records) == len(missing)
+
+
+def test_check_indexes_text():
+    """Test for checking text indexes as described by MongoDB."""
+    db = _mock_db()
+    keys = EXPECTED_INDEXES['tools'][-1]
+    info = {
+        'tools_text': {
+            'key': [('_fts', 'text'), ('_ftsx', 1)],
+            'weights': {field: 1 for field, __ in reversed(keys)},
+        },
+    }
+    db.collections['tools'].client = SimpleNamespace(
+        index_information=lambda: info,
+    )
+    assert ('tools', keys) not in check_indexes(db=db)
@@ -0,0 +1,100 @@
+"""Tests for `migrations.py` module."""
+
+from copy import deepcopy
+from unittest.mock import patch
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+
+from tests.mock_data import (
+    MOCK_ID,
+    MOCK_TOOL_VERSION_ID,
+    MONGO_CONFIG,
+)
+from trs_filer.migrations import (
+    check_migrations,
+    is_pending,
+    run_migrations,
+)
+
+
+def _mock_db():
+    """Set up database config with mock collections."""
+    db = MongoConfig(**MONGO_CONFIG).dbs['trsStore']
+    client = mongomock.MongoClient().db
+    for coll_name, coll in db.collections.items():
+        coll.client = client[coll_name]
+    return db
+
+
+def test_run_migrations():
+    """Test for running migrations once."""
+    db = _mock_db()
+    tool = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool['id'] = MOCK_ID
+    db.collections['tools'].client.insert_one(tool)
+
+    assert run_migrations(db=db) == ['files', 'blobs', 'facets']
+    data = db.collections['tools'].client.find_one({'id': MOCK_ID})
+    assert 'files' not in data['versions'][0]
+    assert db.collections['files'].client.count_documents({}) > 0
+    assert db.collections['facets'].client.count_documents({}) > 0
+    assert db.collections['generations'].client.count_documents({}) == 3
+    with patch('trs_filer.migrations.migrate_files') as migrate_files:
+        assert run_migrations(db=db) == []
+    migrate_files.assert_not_called()
+
+
+def test_run_migrations_incomplete():
+    """Test for resuming migrations that left data to migrate."""
+    db = _mock_db()
+    tool = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool['id'] = MOCK_ID
+    db.collections['tools'].client.insert_one(tool)
+
+    with patch('trs_filer.migrations.migrate_files'):
+        assert run_migrations(db=db) == ['files', 'blobs', 'facets']
+    assert db.collections['generations'].client.find_one(
+        {'_id': 'migration.files'}
+    ) is None
+    assert run_migrations(db=db) == ['files']
+    assert db.collections['generations'].client.find_one(
+        {'_id': 'migration.files'}
+    ) is not None
+
+
+def test_check_migrations(caplog):
+    """Test for checking pending migrations."""
+    db = _mock_db()
+    tool = deepcopy(MOCK_TOOL_VERSION_ID)
+    tool['id'] = MOCK_ID
+    db.collections['tools'].client.insert_one(tool)
+
+    assert check_migrations(db=db) == ['files', 'blobs', 'facets']
+    assert 'trs-filer migrate' in caplog.text
+    data = db.collections['tools'].client.find_one({'id': MOCK_ID})
+    assert 'files' in data['versions'][0]
+    run_migrations(db=db)
+    assert check_migrations(db=db) == []
+
+
+def test_check_migrations_empty():
+    """Test for checking migrations without stored tools."""
+    db = _mock_db()
+    assert check_migrations(db=db) == []
+    assert run_migrations(db=db) == []
+
+
+def test_is_pending():
+    """Test for checking whether a migration is pending."""
+    db = _mock_db()
+    app = Flask(__name__)
+    app.config.foca = Config(db=MongoConfig(**MONGO_CONFIG))
+    app.config.foca.db.dbs['trsStore'] = db
+    with app.app_context():
+        assert is_pending('files')
+        run_migrations(db=db)
+        assert not is_pending('files')
+        db.collections['generations'].client.delete_many({})
+        assert not is_pending('files')
@@ -5,7 +5,12 @@ from pathlib import Path
 from connexion import App
 from foca import Foca
 
+from trs_filer.compression import register_response_compression
+from trs_filer.ga4gh.trs.endpoints.context import get_registration_context
+from trs_filer.ga4gh.trs.endpoints.jobs import recover_jobs
 from trs_filer.ga4gh.trs.endpoints.service_info import RegisterServiceInfo
+from trs_filer.indexes import check_indexes
+from trs_filer.migrations import check_migrations
 
 
 def init_app() -> App:
@@ -25,6 +30,22 @@ def init_app() -> App:
     with app.app.app_context():
         service_info = RegisterServiceInfo()
         service_info.set_service_info_from_config()
+
+        # compile settings for registering objects
+        get_registration_context()
+
+    # compress responses
+    conf = app.app.config.foca.custom.response_compression
+    if conf.enabled:
+        register_response_compression(app=app.app, config=conf)
+
+    # warn about missing indexes
+    db = app.app.config.foca.db.dbs['trsStore']
+    check_indexes(db=db)
+
+    # warn about data stored by previous versions of the app that is not
+    # migrated yet; migrations are run by the `migrate` command
+    check_migrations(db=db)
     return app
 
 
@@ -35,4 +56,5 @@ def run_app(app: App) -> None:
 
 if __name__ == "__main__":
     my_app = init_app()
+    recover_jobs(app=my_app.app)
     run_app(my_app)
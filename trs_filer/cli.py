@@ -0,0 +1,729 @@
+"""Command-line interface for bulk operations on the tool database."""
+
+import argparse
+from concurrent.futures import (
+    Future,
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait,
+)
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+import sys
+import time
+from typing import (
+    Dict,
+    IO,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from bson import ObjectId
+from flask import Flask
+from foca.config.config_parser import ConfigParser
+from foca.models.config import SpecConfig
+from jsonschema import Draft4Validator
+from jsonschema.exceptions import best_match
+from pymongo import ReplaceOne
+from pymongo.collection import Collection
+
+from trs_filer.app import init_app
+from trs_filer.ga4gh.trs.endpoints.catalogue import (
+    GENERATION_KEY,
+    increment_generation,
+)
+from trs_filer.ga4gh.trs.endpoints.codecs import get_content_codec
+from trs_filer.ga4gh.trs.endpoints.files import resolve_contents
+from trs_filer.ga4gh.trs.endpoints.register_objects import RegisterTools
+from trs_filer.ga4gh.trs.endpoints.utils import iter_batches
+from trs_filer.migrations import (
+    check_migrations,
+    run_migrations,
+)
+
+logger = logging.getLogger(__name__)
+
+# directory that the app configuration refers to API specifications and
+# controllers from
+APP_DIR = Path(__file__).resolve().parent
+
+# suffixes of files holding one tool per line or a single tool, respectively;
+# either may additionally be gzip-compressed
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+JSON_SUFFIXES = ('.json',)
+GZIP_SUFFIX = '.gz'
+
+# layout of snapshots written by the `export` command; tools are written to
+# one file per partition
+SNAPSHOT_TOOLS_DIR = 'tools'
+SNAPSHOT_FILES = {
+    'toolclasses': 'toolclasses.ndjson.gz',
+    'service_info': 'service_info.ndjson.gz',
+}
+
+# fields of stored objects that are set by the service, rather than
+# registered by clients
+SERVICE_FIELDS = ('_id', '_etag', 'url', 'meta_version')
+SERVICE_FIELDS_FILES = (
+    '_id', '_etag', '_migrating', 'blob', 'tool_id', 'version_id',
+)
+
+
+def read_records(source: str) -> Iterator[Tuple[str, str]]:
+    """Read serialized tool records lazily.
+
+    Args:
+        source: Path to a newline-delimited JSON file, with one tool per
+            line; path to a directory tree of such files and/or JSON files
+            with one tool each, e.g., a snapshot written by the `export`
+            command; or `-` to read newline-delimited JSON from standard
+            input. Files may be gzip-compressed.
+
+    Yields:
+        Tuples of location (file and, if applicable, line number) and JSON
+        text of each record.
+
+    Raises:
+        FileNotFoundError: Source does not exist.
+    """
+    if source == '-':
+        yield from _read_ndjson(lines=sys.stdin, name='<stdin>')
+        return
+    path = Path(source)
+    if not path.exists():
+        raise FileNotFoundError(f"No such file or directory: '{source}'")
+    paths = sorted(
+        _path for _path in path.rglob('*')
+        if _get_format(_path) is not None and
+        _path.name not in SNAPSHOT_FILES.values()
+    ) if path.is_dir() else [path]
+    for _path in paths:
+        with _open(_path) as _file:
+            if _get_format(_path) in JSON_SUFFIXES:
+                yield str(_path), _file.read()
+            else:
+                yield from _read_ndjson(lines=_file, name=str(_path))
+
+
+def _get_format(path: Path) -> Optional[str]:
+    """Get format suffix of a file, ignoring any compression suffix."""
+    suffixes = path.suffixes
+    if suffixes and suffixes[-1] == GZIP_SUFFIX:
+        suffixes = suffixes[:-1]
+    if suffixes and suffixes[-1] in NDJSON_SUFFIXES + JSON_SUFFIXES:
+        return suffixes[-1]
+    return None
+
+
+def _open(path: Path) -> IO[str]:
+    """Open text file for reading, decompressing it if applicable."""
+    if path.suffix == GZIP_SUFFIX:
+        return gzip.open(path, mode='rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def _read_ndjson(
+    lines: Iterable[str],
+    name: str,
+) -> Iterator[Tuple[str, str]]:
+    """Read non-empty lines of newline-delimited JSON."""
+    for number, line in enumerate(lines, start=1):
+        if line.strip():
+            yield f"{name}:{number}", line
+
+
+def get_tool_validator(specs: List[SpecConfig]) -> Optional[Draft4Validator]:
+    """Get validator for tool records from the app's API specifications.
+
+    Tool records are validated against the `ToolRegister` schema, as request
+    bodies of `POST /tools`, and may additionally hold the tool `id`.
+
+    Args:
+        specs: API specification configurations of the app.
+
+    Returns:
+        Validator, or `None` if no specification defines the `ToolRegister`
+        schema.
+    """
+    for spec in specs:
+        paths = spec.path if isinstance(spec.path, list) else [spec.path]
+        components = ConfigParser.merge_yaml(*paths).get('components', {})
+        schema = components.get('schemas', {}).get('ToolRegister')
+        if schema is None:
+            continue
+        schema = {
+            **schema,
+            'properties': {**schema['properties'], 'id': {'type': 'string'}},
+            # resolve references to other schemas of the specification
+            'components': components,
+        }
+        return Draft4Validator(schema)
+    return None
+
+
+class ToolImporter:
+    """Import tools directly into the database, bypassing the HTTP API.
+
+    Tools are validated as by the API and registered in batches, each written
+    with unordered bulk writes, by a pool of workers.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        batch_size: int = 500,
+        workers: int = 4,
+        validator: Optional[Draft4Validator] = None,
+    ) -> None:
+        """Initialize importer.
+
+        Args:
+            app: Flask application, providing configuration and database
+                collections.
+            batch_size: Number of tools registered per batch.
+            workers: Number of batches registered concurrently.
+            validator: Validator for tool records; records are not validated
+                against a schema if not provided.
+
+        Attributes:
+            app: Flask application.
+            batch_size: Number of tools registered per batch.
+            workers: Number of batches registered concurrently.
+            validator: Validator for tool records.
+            imported: Number of tools imported.
+            failed: Number of records that could not be imported.
+        """
+        self.app = app
+        self.batch_size = batch_size
+        self.workers = workers
+        self.validator = validator
+        self.imported = 0
+        self.failed = 0
+        self._start = time.monotonic()
+
+    def run(self, records: Iterable[Tuple[str, str]]) -> None:
+        """Import tools.
+
+        Records are read lazily; at most two batches per worker are held in
+        memory at any time.
+
+        Args:
+            records: Tuples of location and JSON text of each record, e.g.,
+                as yielded by `read_records()`.
+        """
+        self._start = time.monotonic()
+        pending: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for batch in iter_batches(
+                items=records,
+                batch_size=self.batch_size,
+            ):
+                locations, items = self._parse(batch)
+                if not items:
+                    continue
+                pending.add(executor.submit(self._register, locations, items))
+                if len(pending) >= 2 * self.workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._collect(future)
+            for future in pending:
+                self._collect(future)
+
+    def _parse(
+        self,
+        batch: List[Tuple[str, str]],
+    ) -> Tuple[List[str], List[Dict]]:
+        """Parse and validate records, reporting invalid ones."""
+        locations = []
+        items = []
+        for location, text in batch:
+            try:
+                record = json.loads(text)
+            except ValueError as exc:
+                self._fail(location, f"Invalid JSON: {exc}")
+                continue
+            if self.validator is not None:
+                error = best_match(self.validator.iter_errors(record))
+                if error is not None:
+                    self._fail(location, f"Invalid tool: {error.message}")
+                    continue
+            locations.append(location)
+            items.append({'id': record.pop('id', None), 'tool': record})
+        return locations, items
+
+    def _register(
+        self,
+        locations: List[str],
+        items: List[Dict],
+    ) -> List[Tuple[str, Dict]]:
+        """Register batch of tools; run by workers."""
+        try:
+            with self.app.app_context():
+                results = RegisterTools(items=items).register_metadata()
+        except Exception as exc:
+            logger.exception(exc)
+            results = [
+                {'error': {'code': 500, 'message': f"Batch failed: {exc}"}}
+            ] * len(items)
+        return list(zip(locations, results))
+
+    def _collect(self, future: Future) -> None:
+        """Report results of a registered batch."""
+        for location, result in future.result():
+            if 'error' in result:
+                self._fail(location, result['error']['message'])
+            else:
+                self.imported += 1
+        elapsed = time.monotonic() - self._start
+        print(
+            f"Imported {self.imported} tools, {self.failed} failed "
+            f"({self.imported / max(elapsed, 1e-9):.0f} tools/s)",
+            file=sys.stderr,
+        )
+
+    def _fail(self, location: str, message: str) -> None:
+        """Report record that could not be imported."""
+        self.failed += 1
+        print(f"{location}: {message}", file=sys.stderr)
+
+
+def import_documents(
+    db_coll: Collection,
+    path: Path,
+    batch_size: int = 500,
+) -> int:
+    """Import objects of a snapshot into a database collection.
+
+    Objects replace any existing objects with the same identifier.
+
+    Args:
+        db_coll: Database collection.
+        path: Newline-delimited JSON file with one object per line.
+        batch_size: Number of objects written per bulk write.
+
+    Returns:
+        Number of imported objects.
+    """
+    count = 0
+    with _open(path) as _file:
+        records = _read_ndjson(lines=_file, name=str(path))
+        for batch in iter_batches(items=records, batch_size=batch_size):
+            requests = []
+            for __, text in batch:
+                doc = json.loads(text)
+                requests.append(ReplaceOne(
+                    filter={'id': doc['id']},
+                    replacement=doc,
+                    upsert=True,
+                ))
+            # preserve order, e.g., of service info revisions
+            db_coll.bulk_write(requests, ordered=True)
+            count += len(requests)
+    return count
+
+
+class RegistryExporter:
+    """Export the tool database to a snapshot of compressed NDJSON files.
+
+    Tools are exported with the files of their versions, including contents,
+    in the format accepted by the `import` command. The tools collection is
+    partitioned into ranges of database object identifiers, which are
+    exported to separate files by a pool of workers.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        destination: Path,
+        partitions: int = 4,
+        batch_size: int = 100,
+        level: int = 6,
+    ) -> None:
+        """Initialize exporter.
+
+        Args:
+            app: Flask application, providing database collections.
+            destination: Directory to write snapshot to.
+            partitions: Number of partitions of the tools collection, which
+                are exported concurrently.
+            batch_size: Number of tools for which files are read at once.
+            level: Compression level.
+
+        Attributes:
+            destination: Directory to write snapshot to.
+            partitions: Number of partitions of the tools collection.
+            batch_size: Number of tools for which files are read at once.
+            level: Compression level.
+            db_coll_tools: Database collection for storing tool objects.
+            db_coll_files: Database collection for storing file objects.
+            db_coll_blobs: Database collection for storing file contents.
+            db_colls: Database collections exported in full, by snapshot file
+                name.
+        """
+        self.destination = destination
+        self.partitions = max(partitions, 1)
+        self.batch_size = batch_size
+        self.level = level
+        db = app.config.foca.db.dbs['trsStore']
+        self.db_coll_tools = db.collections['tools'].client
+        self.db_coll_files = db.collections['files'].client
+        self.db_coll_blobs = db.collections['blobs'].client
+        self.db_colls = {
+            filename: db.collections[name].client
+            for name, filename in SNAPSHOT_FILES.items()
+        }
+
+    def run(self) -> Dict[str, int]:
+        """Export snapshot.
+
+        Returns:
+            Number of exported objects, by collection.
+        """
+        (self.destination / SNAPSHOT_TOOLS_DIR).mkdir(
+            parents=True,
+            exist_ok=True,
+        )
+        counts = {}
+        for name, filename in SNAPSHOT_FILES.items():
+            counts[name] = self._write(
+                path=self.destination / filename,
+                records=self.db_colls[filename].find(
+                    projection={'_id': False},
+                ).sort('_id', 1),
+            )
+        ranges = self._get_ranges()
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(self._export_tools, index, lower, upper)
+                for index, (lower, upper) in enumerate(ranges)
+            ]
+            counts['tools'] = sum(future.result() for future in futures)
+        return counts
+
+    def _get_ranges(
+        self,
+    ) -> List[Tuple[Optional[ObjectId], Optional[ObjectId]]]:
+        """Split tools collection into ranges of similar size.
+
+        Only object identifiers are read from the database.
+
+        Returns:
+            Inclusive lower and exclusive upper bounds of each range; `None`
+            for unbounded.
+        """
+        count = self.db_coll_tools.count_documents({})
+        partitions = max(min(self.partitions, count), 1)
+        bounds: List[Optional[ObjectId]] = [None]
+        for index in range(1, partitions):
+            for doc in self.db_coll_tools.find(
+                projection={'_id': True},
+            ).sort('_id', 1).skip(index * count // partitions).limit(1):
+                bounds.append(doc['_id'])
+        bounds.append(None)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _export_tools(
+        self,
+        index: int,
+        lower: Optional[ObjectId],
+        upper: Optional[ObjectId],
+    ) -> int:
+        """Export range of tools; run by workers."""
+        filt: Dict = {}
+        if lower is not None:
+            filt.setdefault('_id', {})['$gte'] = lower
+        if upper is not None:
+            filt.setdefault('_id', {})['$lt'] = upper
+        tools = self.db_coll_tools.find(
+            filter=filt,
+        ).sort('_id', 1).batch_size(self.batch_size)
+        count = self._write(
+            path=(
+                self.destination / SNAPSHOT_TOOLS_DIR /
+                f"part-{index:05d}.ndjson.gz"
+            ),
+            records=(
+                record
+                for batch in iter_batches(
+                    items=tools,
+                    batch_size=self.batch_size,
+                )
+                for record in self._add_files(tools=batch)
+            ),
+        )
+        print(f"Exported {count} tools of partition {index}", file=sys.stderr)
+        return count
+
+    def _add_files(self, tools: List[Dict]) -> Iterator[Dict]:
+        """Add files, with contents, to versions of a batch of tools."""
+        files: Dict[Tuple[str, str], List[Dict]] = {}
+        for _file in resolve_contents(
+            db_coll_blobs=self.db_coll_blobs,
+            files=self.db_coll_files.find(
+                filter={'tool_id': {'$in': [tool['id'] for tool in tools]}},
+            ).sort('_id', 1),
+        ):
+            files.setdefault(
+                (_file['tool_id'], _file['version_id']),
+                [],
+            ).append(_strip(_file, fields=SERVICE_FIELDS_FILES))
+        for tool in tools:
+            record = _strip(tool, fields=SERVICE_FIELDS)
+            record['versions'] = [
+                {
+                    **_strip(version, fields=SERVICE_FIELDS),
+                    # files of tools that are not migrated yet are embedded
+                    'files': [
+                        _strip(_file, fields=SERVICE_FIELDS_FILES)
+                        for _file in version['files']
+                    ] if 'files' in version else files.get(
+                        (tool['id'], version['id']),
+                        [],
+                    ),
+                } for version in tool.get('versions', [])
+            ]
+            yield record
+
+    def _write(self, path: Path, records: Iterable[Dict]) -> int:
+        """Write records to compressed NDJSON file.
+
+        Records are written to a temporary file first, which is only moved
+        into place once complete.
+        """
+        count = 0
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with gzip.open(
+            tmp_path,
+            mode='wt',
+            encoding='utf-8',
+            compresslevel=self.level,
+        ) as _file:
+            for record in records:
+                _file.write(f"{json.dumps(record)}\n")
+                count += 1
+        tmp_path.replace(path)
+        return count
+
+
+def _strip(obj: Dict, fields: Iterable[str]) -> Dict:
+    """Copy object without given fields."""
+    return {key: value for key, value in obj.items() if key not in fields}
+
+
+def _init_app() -> Flask:
+    """Initialize app independently of the current working directory.
+
+    The app resolves the paths of its API specifications relative to, and
+    imports their controllers from, the current working directory; the app
+    is therefore initialized from the package directory.
+
+    Returns:
+        Flask app.
+    """
+    if str(APP_DIR) not in sys.path:
+        sys.path.insert(0, str(APP_DIR))
+    cwd = Path.cwd()
+    os.chdir(APP_DIR)
+    try:
+        return init_app().app
+    finally:
+        os.chdir(cwd)
+
+
+def _import(args: argparse.Namespace) -> int:
+    """Run `import` command."""
+    app = _init_app()
+    source = Path(args.source)
+    if args.source != '-' and source.is_dir():
+        db = app.config.foca.db.dbs['trsStore']
+        for name, filename in SNAPSHOT_FILES.items():
+            if (source / filename).is_file():
+                count = import_documents(
+                    db_coll=db.collections[name].client,
+                    path=source / filename,
+                )
+                print(f"Imported {count} {name} objects", file=sys.stderr)
+        # have running apps reload their tool class catalogues
+        increment_generation(
+            db_coll_generations=db.collections['generations'].client,
+            key=GENERATION_KEY,
+        )
+    importer = ToolImporter(
+        app=app,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        validator=get_tool_validator(specs=app.config.foca.api.specs),
+    )
+    try:
+        importer.run(records=read_records(source=args.source))
+    except FileNotFoundError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    print(
+        f"Done: imported {importer.imported} tools, {importer.failed} "
+        "failed.",
+        file=sys.stderr,
+    )
+    return 1 if importer.failed else 0
+
+
+def _export(args: argparse.Namespace) -> int:
+    """Run `export` command."""
+    app = _init_app()
+    exporter = RegistryExporter(
+        app=app,
+        destination=Path(args.destination),
+        partitions=args.partitions,
+        batch_size=args.batch_size,
+        level=args.compress_level,
+    )
+    start = time.monotonic()
+    counts = exporter.run()
+    print(
+        "Done: exported "
+        f"{', '.join(f'{count} {name}' for name, count in counts.items())} "
+        f"objects in {time.monotonic() - start:.1f} s.",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _migrate(args: argparse.Namespace) -> int:
+    """Run `migrate` command."""
+    app = _init_app()
+    with app.app_context():
+        codec = get_content_codec()
+    db = app.config.foca.db.dbs['trsStore']
+    names = run_migrations(db=db, codec=codec)
+    pending = check_migrations(db=db)
+    print(
+        f"Done: ran migrations {names}; pending: {pending}.",
+        file=sys.stderr,
+    )
+    return 1 if pending else 0
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Get command-line argument parser.
+
+    Returns:
+        Parser for all commands.
+    """
+    parser = argparse.ArgumentParser(
+        prog='trs-filer',
+        description="Bulk operations on the TRS-Filer tool database.",
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parser_import = subparsers.add_parser(
+        'import',
+        help="import tools from NDJSON files or directory trees",
+        description=(
+            "Import tools directly into the database configured for the "
+            "app. Each record is a tool as accepted by 'POST /tools' or, to "
+            "create or replace a tool with a given identifier, with an "
+            "additional 'id'. Tool classes and service info of snapshots "
+            "written by the 'export' command are imported as well."
+        ),
+    )
+    parser_import.add_argument(
+        'source',
+        help=(
+            "NDJSON file with one tool per line; directory tree of NDJSON "
+            "(.ndjson, .jsonl) and JSON (.json, one tool each) files, "
+            "optionally gzip-compressed (.gz), e.g., a snapshot; or '-' to "
+            "read NDJSON from standard input"
+        ),
+    )
+    parser_import.add_argument(
+        '--batch-size',
+        type=int,
+        default=500,
+        help="number of tools written per bulk write (default: %(default)s)",
+    )
+    parser_import.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help="number of concurrent batches (default: %(default)s)",
+    )
+    parser_import.set_defaults(func=_import)
+
+    parser_export = subparsers.add_parser(
+        'export',
+        help="export a snapshot of the database to compressed NDJSON files",
+        description=(
+            "Export tools, including the files of their versions, tool "
+            "classes and service info from the database configured for the "
+            "app to gzip-compressed NDJSON files that can be imported with "
+            "the 'import' command."
+        ),
+    )
+    parser_export.add_argument(
+        'destination',
+        help="directory to write snapshot to; created if necessary",
+    )
+    parser_export.add_argument(
+        '--partitions',
+        type=int,
+        default=4,
+        help=(
+            "number of ranges of tools exported concurrently, to separate "
+            "files (default: %(default)s)"
+        ),
+    )
+    parser_export.add_argument(
+        '--batch-size',
+        type=int,
+        default=100,
+        help=(
+            "number of tools for which files are read at once (default: "
+            "%(default)s)"
+        ),
+    )
+    parser_export.add_argument(
+        '--compress-level',
+        type=int,
+        default=6,
+        choices=range(10),
+        metavar='{0..9}',
+        help="gzip compression level (default: %(default)s)",
+    )
+    parser_export.set_defaults(func=_export)
+
+    parser_migrate = subparsers.add_parser(
+        'migrate',
+        help="migrate data stored by previous versions of the app",
+        description=(
+            "Migrate tools, files and facet counts stored by previous "
+            "versions of the app, one object at a time, while the service "
+            "keeps running. Completed migrations are skipped; interrupted "
+            "ones are resumed."
+        ),
+    )
+    parser_migrate.set_defaults(func=_migrate)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run command-line interface.
+
+    Args:
+        argv: Command-line arguments; defaults to `sys.argv[1:]`.
+
+    Returns:
+        Exit status.
+    """
+    args = get_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
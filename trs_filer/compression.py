@@ -0,0 +1,153 @@
+"""Compression of responses, negotiated via the `Accept-Encoding` header."""
+
+import gzip
+import logging
+from typing import (Callable, Dict)
+
+from flask import (Flask, request, Response)
+
+from trs_filer.custom_config import ResponseCompressionConfig
+from trs_filer.ga4gh.trs.endpoints.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = (
+    'application/json',
+    'application/problem+json',
+)
+
+
+class ResponseCompressor:
+    """Compress response bodies with the best encoding accepted by the client.
+
+    Brotli (`br`) is preferred over `gzip` if package `brotli` is installed.
+    Compressed bodies of responses with an entity tag are cached, keyed by
+    entity tag, request path and query string, and encoding. The entity tag
+    alone does not identify the body, as different resources may share it,
+    e.g., a tool and the list of its versions.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1024,
+        level: int = 6,
+        cache_size: int = 256,
+        cache_max_size: int = 1048576,
+    ) -> None:
+        """Initialize encoders and cache.
+
+        Args:
+            min_size: Minimum size (in bytes) of response bodies to be
+                compressed.
+            level: Compression level.
+            cache_size: Maximum number of cached compressed bodies. Set to `0`
+                to disable caching.
+            cache_max_size: Maximum size (in bytes) of a cached compressed
+                body.
+
+        Attributes:
+            min_size: Minimum size (in bytes) of response bodies to be
+                compressed.
+            cache_max_size: Maximum size (in bytes) of a cached compressed
+                body.
+            encoders: Compression functions, by content coding, in order of
+                preference.
+            cache: Cache for compressed bodies.
+        """
+        self.min_size = min_size
+        self.cache_max_size = cache_max_size
+        self.encoders: Dict[str, Callable[[bytes], bytes]] = {}
+        if brotli is not None:
+            self.encoders['br'] = lambda data: brotli.compress(
+                data,
+                quality=min(level, 11),
+            )
+        self.encoders['gzip'] = lambda data: gzip.compress(
+            data,
+            compresslevel=level,
+        )
+        self.cache = LRUCache(size=cache_size, ttl=float('inf'))
+
+    def __call__(self, response: Response) -> Response:
+        """Compress response body, if applicable.
+
+        Args:
+            response: Response to the current request.
+
+        Returns:
+            Response, with compressed body if the client accepts one of the
+            available encodings and the body is large enough.
+        """
+        if not self._is_compressible(response):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(list(self.encoders))
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        etag, __ = response.get_etag()
+        key = (etag, request.full_path, encoding)
+        body = None if etag is None else self.cache.get(key)
+        if body is None:
+            body = self.encoders[encoding](data)
+            if etag is not None and len(body) <= self.cache_max_size:
+                self.cache.set(key, body)
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        # the compressed body is a different representation of the resource
+        if etag is not None:
+            response.set_etag(etag, weak=True)
+        logger.debug(
+            f"Compressed response body with '{encoding}' from {len(data)} to "
+            f"{len(body)} bytes."
+        )
+        return response
+
+    @staticmethod
+    def _is_compressible(response: Response) -> bool:
+        """Check whether response body may be compressed."""
+        return (
+            request.method != 'HEAD' and
+            response.status_code == 200 and
+            not response.direct_passthrough and
+            not response.is_streamed and
+            'Content-Encoding' not in response.headers and
+            (
+                response.mimetype in COMPRESSIBLE_MIMETYPES or
+                response.mimetype.startswith('text/')
+            )
+        )
+
+
+def register_response_compression(
+    app: Flask,
+    config: ResponseCompressionConfig = ResponseCompressionConfig(),
+) -> ResponseCompressor:
+    """Compress responses of an app.
+
+    Args:
+        app: Flask application.
+        config: Config parameters for compressing responses.
+
+    Returns:
+        Response compressor, registered as `after_request` function.
+    """
+    compressor = ResponseCompressor(
+        min_size=config.min_size,
+        level=config.level,
+        cache_size=config.cache_size,
+        cache_max_size=config.cache_max_size,
+    )
+    app.after_request(compressor)
+    logger.info(
+        f"Compressing responses with: {', '.join(compressor.encoders)}"
+    )
+    return compressor
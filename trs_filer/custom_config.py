@@ -1,7 +1,7 @@
 """Custom app config models."""
 
 import string
-from typing import Optional
+from typing import (Literal, Optional)
 
 from foca.models.config import FOCABaseConfig
 
@@ -174,11 +174,19 @@ class IdConfig(FOCABaseConfig):
         charset: A string of allowed characters or an expression evaluating to
             a string of allowed characters.
         length: Length of returned string.
+        strategy: Either `random`, for random strings of `length` characters
+            from `charset`, or `ulid`, for 26-character, time-ordered ULIDs;
+            `charset` and `length` are ignored for the latter. Defaults to
+            `random`.
 
     Attributes:
         charset: A string of allowed characters or an expression evaluating to
             a string of allowed characters.
         length: Length of returned string.
+        strategy: Either `random`, for random strings of `length` characters
+            from `charset`, or `ulid`, for 26-character, time-ordered ULIDs;
+            `charset` and `length` are ignored for the latter. Defaults to
+            `random`.
 
     Example:
         >>> IdConfig(
@@ -190,6 +198,7 @@ class IdConfig(FOCABaseConfig):
 
     length: int = 6
     charset: str = string.ascii_uppercase + string.digits
+    strategy: Literal['random', 'ulid'] = 'random'
 
 
 class MetaVersionConfig(FOCABaseConfig):
@@ -301,6 +310,259 @@ class ToolClassConfig(FOCABaseConfig):
     validation: bool = False
 
 
+class CacheConfig(FOCABaseConfig):
+    """Model for process-local cache config parameters.
+
+    Args:
+        size: Maximum number of cached entries. Set to `0` to disable caching.
+            Defaults to `1000`.
+        ttl: Time (in seconds) after which cached entries expire. As entries
+            are only invalidated in the process that handles a write request,
+            this bounds how long other worker processes may serve outdated
+            entries. Defaults to `60`.
+
+    Attributes:
+        size: Maximum number of cached entries. Set to `0` to disable caching.
+            Defaults to `1000`.
+        ttl: Time (in seconds) after which cached entries expire. As entries
+            are only invalidated in the process that handles a write request,
+            this bounds how long other worker processes may serve outdated
+            entries. Defaults to `60`.
+
+    Example:
+        >>> CacheConfig(
+        ...     size=1000,
+        ...     ttl=60
+        ... )
+        CacheConfig(size=1000, ttl=60.0)
+    """
+    size: int = 1000
+    ttl: float = 60
+
+
+class CatalogueConfig(FOCABaseConfig):
+    """Model for process-local tool class catalogue config parameters.
+
+    Args:
+        check_interval: Minimum time (in seconds) between checks of whether
+            tool classes were changed by another worker process when serving
+            reads from the catalogue. Writes always check. Set to `0` to check
+            on every read. Defaults to `1`.
+
+    Attributes:
+        check_interval: Minimum time (in seconds) between checks of whether
+            tool classes were changed by another worker process when serving
+            reads from the catalogue. Writes always check. Set to `0` to check
+            on every read. Defaults to `1`.
+
+    Example:
+        >>> CatalogueConfig(
+        ...     check_interval=1
+        ... )
+        CatalogueConfig(check_interval=1.0)
+    """
+    check_interval: float = 1
+
+
+class ServiceInfoCacheConfig(FOCABaseConfig):
+    """Model for process-local service info cache config parameters.
+
+    Args:
+        ttl: Time (in seconds) after which the cached service info is read
+            from the database again. As the cache is only refreshed in the
+            process that handles a write request, this bounds how long other
+            worker processes may serve outdated service info. Set to `0` to
+            disable caching. Defaults to `5`.
+
+    Attributes:
+        ttl: Time (in seconds) after which the cached service info is read
+            from the database again. As the cache is only refreshed in the
+            process that handles a write request, this bounds how long other
+            worker processes may serve outdated service info. Set to `0` to
+            disable caching. Defaults to `5`.
+
+    Example:
+        >>> ServiceInfoCacheConfig(
+        ...     ttl=5
+        ... )
+        ServiceInfoCacheConfig(ttl=5.0)
+    """
+    ttl: float = 5
+
+
+class ArchiveCacheConfig(FOCABaseConfig):
+    """Model for file archive cache config parameters.
+
+    Args:
+        path: Directory in which generated file archives are cached. Defaults
+            to a subdirectory of the system's temporary directory.
+        size: Maximum number of cached archives; the least recently used
+            archives are removed first. Set to `0` to disable caching.
+            Defaults to `100`.
+
+    Attributes:
+        path: Directory in which generated file archives are cached. Defaults
+            to a subdirectory of the system's temporary directory.
+        size: Maximum number of cached archives; the least recently used
+            archives are removed first. Set to `0` to disable caching.
+            Defaults to `100`.
+
+    Example:
+        >>> ArchiveCacheConfig(
+        ...     path='/tmp/trs_filer_archives',
+        ...     size=100
+        ... )
+        ArchiveCacheConfig(path='/tmp/trs_filer_archives', size=100)
+    """
+    path: Optional[str] = None
+    size: int = 100
+
+
+class FetchConfig(FOCABaseConfig):
+    """Model for config parameters for retrieving file contents from URLs.
+
+    Args:
+        workers: Maximum number of files retrieved concurrently per worker
+            process; also the size of the HTTP connection pool. Defaults to
+            `8`.
+        timeout: Time (in seconds) after which a request is aborted if the
+            remote server fails to establish a connection or to send any
+            data. Defaults to `10`.
+        total_timeout: Time (in seconds) after which retrieving the files of a
+            tool version is aborted. Defaults to `60`.
+        max_size: Maximum size (in bytes) of a retrieved file. Defaults to
+            `10485760` (10 MiB).
+
+    Attributes:
+        workers: Maximum number of files retrieved concurrently per worker
+            process; also the size of the HTTP connection pool. Defaults to
+            `8`.
+        timeout: Time (in seconds) after which a request is aborted if the
+            remote server fails to establish a connection or to send any
+            data. Defaults to `10`.
+        total_timeout: Time (in seconds) after which retrieving the files of a
+            tool version is aborted. Defaults to `60`.
+        max_size: Maximum size (in bytes) of a retrieved file. Defaults to
+            `10485760` (10 MiB).
+
+    Example:
+        >>> FetchConfig(
+        ...     workers=8,
+        ...     timeout=10,
+        ...     total_timeout=60,
+        ...     max_size=10485760
+        ... )
+        FetchConfig(workers=8, timeout=10.0, total_timeout=60.0, max_size=104
+        85760)
+    """
+    workers: int = 8
+    timeout: float = 10
+    total_timeout: float = 60
+    max_size: int = 10485760
+
+
+class JobsConfig(FOCABaseConfig):
+    """Model for config parameters for background jobs.
+
+    Args:
+        workers: Maximum number of jobs run concurrently per worker process.
+            Defaults to `2`.
+        timeout: Time in seconds after which running jobs that have not
+            completed are considered abandoned and are resubmitted when a
+            worker process starts. Defaults to `600`.
+
+    Attributes:
+        workers: Maximum number of jobs run concurrently per worker process.
+            Defaults to `2`.
+        timeout: Time in seconds after which running jobs that have not
+            completed are considered abandoned and are resubmitted when a
+            worker process starts. Defaults to `600`.
+
+    Example:
+        >>> JobsConfig(workers=2, timeout=600)
+        JobsConfig(workers=2, timeout=600)
+    """
+    workers: int = 2
+    timeout: int = 600
+
+
+class CompressionConfig(FOCABaseConfig):
+    """Model for config parameters for compressing stored file contents.
+
+    Args:
+        codec: Compression codec, one of `zlib`, `gzip` and `zstd`; the latter
+            requires package `zstandard` to be installed. Set to `None` to
+            disable compression. Defaults to `zlib`.
+        level: Compression level, as understood by the codec. Defaults to
+            `6`.
+        threshold: Minimum size (in bytes) of file contents to be compressed.
+            Defaults to `1024`.
+
+    Attributes:
+        codec: Compression codec, one of `zlib`, `gzip` and `zstd`; the latter
+            requires package `zstandard` to be installed. Set to `None` to
+            disable compression. Defaults to `zlib`.
+        level: Compression level, as understood by the codec. Defaults to
+            `6`.
+        threshold: Minimum size (in bytes) of file contents to be compressed.
+            Defaults to `1024`.
+
+    Example:
+        >>> CompressionConfig(
+        ...     codec='zlib',
+        ...     level=6,
+        ...     threshold=1024
+        ... )
+        CompressionConfig(codec='zlib', level=6, threshold=1024)
+    """
+    codec: Optional[str] = 'zlib'
+    level: int = 6
+    threshold: int = 1024
+
+
+class ResponseCompressionConfig(FOCABaseConfig):
+    """Model for config parameters for compressing responses.
+
+    Args:
+        enabled: Whether responses are compressed. Defaults to `True`.
+        min_size: Minimum size (in bytes) of response bodies to be compressed.
+            Defaults to `1024`.
+        level: Compression level. Defaults to `6`.
+        cache_size: Maximum number of cached compressed bodies of responses
+            with an entity tag. Set to `0` to disable caching. Defaults to
+            `256`.
+        cache_max_size: Maximum size (in bytes) of a cached compressed body.
+            Defaults to `1048576` (1 MiB).
+
+    Attributes:
+        enabled: Whether responses are compressed. Defaults to `True`.
+        min_size: Minimum size (in bytes) of response bodies to be compressed.
+            Defaults to `1024`.
+        level: Compression level. Defaults to `6`.
+        cache_size: Maximum number of cached compressed bodies of responses
+            with an entity tag. Set to `0` to disable caching. Defaults to
+            `256`.
+        cache_max_size: Maximum size (in bytes) of a cached compressed body.
+            Defaults to `1048576` (1 MiB).
+
+    Example:
+        >>> ResponseCompressionConfig(
+        ...     enabled=True,
+        ...     min_size=1024,
+        ...     level=6,
+        ...     cache_size=256,
+        ...     cache_max_size=1048576
+        ... )
+        ResponseCompressionConfig(enabled=True, min_size=1024, level=6, cache_
+        size=256, cache_max_size=1048576)
+    """
+    enabled: bool = True
+    min_size: int = 1024
+    level: int = 6
+    cache_size: int = 256
+    cache_max_size: int = 1048576
+
+
 class CustomConfig(FOCABaseConfig):
     """Model for custom configuration parameters.
 
@@ -310,6 +572,15 @@ class CustomConfig(FOCABaseConfig):
         tool: Tool config parameters.
         version: Version config parameters.
         toolclass: Tool Class config parameters.
+        tool_cache: Config parameters for caching tool and version lookups.
+        toolclass_catalogue: Config parameters for the process-local
+            catalogue of tool classes.
+        service_info_cache: Config parameters for caching the service info.
+        archive_cache: Config parameters for caching file archives.
+        fetch: Config parameters for retrieving file contents from URLs.
+        jobs: Config parameters for background jobs.
+        compression: Config parameters for compressing stored file contents.
+        response_compression: Config parameters for compressing responses.
 
     Attributes:
         service: Service config parameters.
@@ -317,9 +588,28 @@ class CustomConfig(FOCABaseConfig):
         tool: Tool config parameters.
         version: Version config parameters.
         toolclass: Tool Class config parameters.
+        tool_cache: Config parameters for caching tool and version lookups.
+        toolclass_catalogue: Config parameters for the process-local
+            catalogue of tool classes.
+        service_info_cache: Config parameters for caching the service info.
+        archive_cache: Config parameters for caching file archives.
+        fetch: Config parameters for retrieving file contents from URLs.
+        jobs: Config parameters for background jobs.
+        compression: Config parameters for compressing stored file contents.
+        response_compression: Config parameters for compressing responses.
     """
     service: ServiceConfig
     service_info: ServiceInfoConfig
     tool: ToolConfig = ToolConfig()
     version: VersionConfig = VersionConfig()
     toolclass: ToolClassConfig = ToolClassConfig()
+    tool_cache: CacheConfig = CacheConfig()
+    toolclass_catalogue: CatalogueConfig = CatalogueConfig()
+    service_info_cache: ServiceInfoCacheConfig = ServiceInfoCacheConfig()
+    archive_cache: ArchiveCacheConfig = ArchiveCacheConfig()
+    fetch: FetchConfig = FetchConfig()
+    jobs: JobsConfig = JobsConfig()
+    compression: CompressionConfig = CompressionConfig()
+    response_compression: ResponseCompressionConfig = (
+        ResponseCompressionConfig()
+    )
@@ -52,3 +52,7 @@ exceptions = {
 # exceptions raised outside of app context
 class ValidationError(Exception):
     """Value or object is not compatible with required type or schema."""
+
+
+class FetchError(Exception):
+    """Content could not be retrieved from a URL."""
@@ -0,0 +1,190 @@
+"""Streamed zip archives of tool version files."""
+
+import logging
+import os
+from pathlib import Path
+from tempfile import (gettempdir, mkstemp)
+from typing import (Iterable, Iterator, List, Optional, Tuple)
+from zipfile import (ZIP_DEFLATED, ZipFile)
+
+from flask import current_app
+
+from trs_filer.custom_config import ArchiveCacheConfig
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = 'trs_filer.archive_cache'
+
+
+class _ChunkWriter:
+    """Unseekable file-like object collecting written data in chunks."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._offset: int = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        """Return and discard data written since the last call."""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(
+    entries: Iterable[Tuple[str, str]],
+) -> Iterator[bytes]:
+    """Build zip archive incrementally.
+
+    Only a single entry is held in memory at any time.
+
+    Args:
+        entries: Tuples of path and content of each file to be archived.
+
+    Yields:
+        Consecutive chunks of the archive.
+    """
+    writer = _ChunkWriter()
+    with ZipFile(writer, mode='w', compression=ZIP_DEFLATED) as archive:
+        for path, content in entries:
+            archive.writestr(path, content)
+            yield writer.pop()
+    yield writer.pop()
+
+
+class ArchiveCache:
+    """Size-bounded cache of archives on the local file system.
+
+    Archives are written to a temporary file while being streamed and only
+    moved into place once complete, so that concurrent requests and worker
+    processes never see partial archives.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        size: int = 100,
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            path: Cache directory. Defaults to a subdirectory of the system's
+                temporary directory.
+            size: Maximum number of cached archives. Set to `0` to disable
+                caching.
+
+        Attributes:
+            path: Cache directory.
+            size: Maximum number of cached archives.
+        """
+        self.path = Path(
+            path if path is not None
+            else os.path.join(gettempdir(), 'trs_filer_archives')
+        )
+        self.size = size
+
+    def get(self, key: str) -> Optional[Path]:
+        """Get path to cached archive.
+
+        Args:
+            key: Cache key; needs to be a valid file name.
+
+        Returns:
+            Path to archive, or `None` if the archive is not cached.
+        """
+        if self.size <= 0:
+            return None
+        path = self._file(key)
+        try:
+            # mark archive as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        logger.debug(f"Archive cache hit for '{key}'.")
+        return path
+
+    def store(
+        self,
+        key: str,
+        chunks: Iterable[bytes],
+    ) -> Iterator[bytes]:
+        """Pass through archive chunks while storing them in the cache.
+
+        The archive is only cached if all chunks are consumed.
+
+        Args:
+            key: Cache key; needs to be a valid file name.
+            chunks: Consecutive chunks of the archive.
+
+        Yields:
+            Consecutive chunks of the archive.
+        """
+        if self.size <= 0:
+            yield from chunks
+            return
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            fd, tmp = mkstemp(dir=self.path, suffix='.tmp')
+        except OSError as exc:
+            logger.warning(f"Cannot cache archive in '{self.path}': {exc}")
+            yield from chunks
+            return
+        try:
+            with os.fdopen(fd, 'wb') as _f:
+                for chunk in chunks:
+                    _f.write(chunk)
+                    yield chunk
+            os.replace(tmp, self._file(key))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._prune()
+
+    def _file(self, key: str) -> Path:
+        """Get path of archive for cache key."""
+        return self.path / f"{key}.zip"
+
+    def _prune(self) -> None:
+        """Remove least recently used archives in excess of cache size."""
+        archives = []
+        for path in self.path.glob('*.zip'):
+            try:
+                archives.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        archives.sort(reverse=True)
+        for _, path in archives[self.size:]:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+
+
+def get_archive_cache() -> ArchiveCache:
+    """Get file archive cache of the current app.
+
+    The cache is created on first use, from the `archive_cache` section of
+    the custom app configuration, if available.
+
+    Returns:
+        File archive cache.
+    """
+    cache = current_app.extensions.get(EXTENSION_KEY)
+    if cache is None:
+        conf = getattr(current_app.config.foca, 'custom', None)
+        cache_conf = getattr(conf, 'archive_cache', ArchiveCacheConfig())
+        cache = current_app.extensions.setdefault(
+            EXTENSION_KEY,
+            ArchiveCache(path=cache_conf.path, size=cache_conf.size),
+        )
+    return cache
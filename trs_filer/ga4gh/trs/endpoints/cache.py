@@ -0,0 +1,148 @@
+"""Process-local cache for tool and version lookups."""
+
+from collections import OrderedDict
+from copy import deepcopy
+import logging
+from threading import Lock
+import time
+from typing import (Any, Dict, Hashable, Optional, Set, Tuple)
+
+from flask import current_app
+
+from trs_filer.custom_config import CacheConfig
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = 'trs_filer.tool_cache'
+
+
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used cache with expiry.
+
+    Keys are tuples whose first element is a group key, e.g., a tool
+    identifier; all entries of a group can be invalidated at once.
+    """
+
+    def __init__(
+        self,
+        size: int = 1000,
+        ttl: float = 60,
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            size: Maximum number of entries. Set to `0` to disable caching.
+            ttl: Time (in seconds) after which entries expire.
+
+        Attributes:
+            size: Maximum number of entries.
+            ttl: Time (in seconds) after which entries expire.
+            hits: Number of lookups served from the cache.
+            misses: Number of lookups not served from the cache.
+        """
+        self.size: int = size
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._groups: Dict[Hashable, Set[Tuple]] = {}
+        self._lock = Lock()
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Look up entry.
+
+        Args:
+            key: Entry key.
+
+        Returns:
+            Copy of the cached value, or `None` if no unexpired entry is
+            available.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        logger.debug(
+            f"Cache {'miss' if entry is None else 'hit'} for {key}: "
+            f"{self.stats}"
+        )
+        return None if entry is None else deepcopy(entry[1])
+
+    def set(self, key: Tuple, value: Any) -> None:
+        """Add or replace entry, evicting the least recently used entry if
+        the cache is full.
+
+        Args:
+            key: Entry key.
+            value: Value to cache; a copy is stored.
+        """
+        if self.size <= 0:
+            return
+        value = deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            self._groups.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, group: Hashable) -> None:
+        """Remove all entries of a group.
+
+        Args:
+            group: Group key, i.e., first element of entry keys.
+        """
+        with self._lock:
+            for key in list(self._groups.get(group, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._groups.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+        }
+
+    def _remove(self, key: Tuple) -> None:
+        """Remove entry; caller needs to hold lock."""
+        self._entries.pop(key, None)
+        group = self._groups.get(key[0])
+        if group is not None:
+            group.discard(key)
+            if not group:
+                del self._groups[key[0]]
+
+
+def get_tool_cache() -> LRUCache:
+    """Get cache for tool and version objects of the current app.
+
+    The cache is created on first use, from the `tool_cache` section of the
+    custom app configuration, if available.
+
+    Returns:
+        Tool cache, keyed by tuples of tool and version identifiers; entries
+        for tools have a version identifier of `None`.
+    """
+    cache = current_app.extensions.get(EXTENSION_KEY)
+    if cache is None:
+        conf = getattr(current_app.config.foca, 'custom', None)
+        cache_conf = getattr(conf, 'tool_cache', CacheConfig())
+        cache = current_app.extensions.setdefault(
+            EXTENSION_KEY,
+            LRUCache(size=cache_conf.size, ttl=cache_conf.ttl),
+        )
+    return cache
@@ -0,0 +1,223 @@
+"""Process-local catalogue of tool classes.
+
+Every write to the tool classes collection increments a generation counter
+stored in the generations collection. Each worker process keeps a copy of all
+tool classes along with the generation it was read at, and only reloads the
+copy once the stored generation differs.
+"""
+
+from copy import deepcopy
+import logging
+from threading import Lock
+import time
+from typing import (Dict, List, Optional)
+
+from flask import current_app
+from pymongo import ReturnDocument
+from pymongo.collection import Collection
+
+from trs_filer.custom_config import CatalogueConfig
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = 'trs_filer.tool_class_catalogue'
+
+# key of the generation counter of the tool classes collection
+GENERATION_KEY = 'toolclasses'
+
+
+def get_generation(db_coll_generations: Collection, key: str) -> int:
+    """Get generation of a collection.
+
+    Args:
+        db_coll_generations: Database collection for storing generation
+            counters.
+        key: Generation counter key, e.g., the collection name.
+
+    Returns:
+        Current generation; `0` if the collection was never written to.
+    """
+    doc = db_coll_generations.find_one(
+        filter={'_id': key},
+        projection={'_id': False, 'generation': True},
+    )
+    return 0 if doc is None else doc['generation']
+
+
+def increment_generation(db_coll_generations: Collection, key: str) -> int:
+    """Increment generation of a collection after writing to it.
+
+    Args:
+        db_coll_generations: Database collection for storing generation
+            counters.
+        key: Generation counter key, e.g., the collection name.
+
+    Returns:
+        New generation.
+    """
+    doc = db_coll_generations.find_one_and_update(
+        filter={'_id': key},
+        update={'$inc': {'generation': 1}},
+        projection={'_id': False, 'generation': True},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc['generation']
+
+
+class ToolClassCatalogue:
+    """Thread-safe, in-memory copy of all tool classes."""
+
+    def __init__(
+        self,
+        db_coll_classes: Collection,
+        db_coll_generations: Collection,
+        check_interval: float = 1,
+    ) -> None:
+        """Initialize catalogue.
+
+        Args:
+            db_coll_classes: Database collection for storing tool class
+                objects.
+            db_coll_generations: Database collection for storing generation
+                counters.
+            check_interval: Minimum time (in seconds) between checks of the
+                stored generation when reading from the catalogue.
+
+        Attributes:
+            db_coll_classes: Database collection for storing tool class
+                objects.
+            db_coll_generations: Database collection for storing generation
+                counters.
+            check_interval: Minimum time (in seconds) between checks of the
+                stored generation when reading from the catalogue.
+            generation: Generation the catalogue was loaded at; `None` if not
+                loaded.
+            loads: Number of times the catalogue was (re)loaded.
+        """
+        self.db_coll_classes = db_coll_classes
+        self.db_coll_generations = db_coll_generations
+        self.check_interval = check_interval
+        self.generation: Optional[int] = None
+        self.loads: int = 0
+        self._classes: Dict[str, Dict] = {}
+        self._checked: float = float('-inf')
+        self._lock = Lock()
+
+    def get_all(self) -> List[Dict]:
+        """List all tool classes.
+
+        Returns:
+            Copies of all tool class objects, in insertion order.
+        """
+        self.refresh()
+        with self._lock:
+            return deepcopy(list(self._classes.values()))
+
+    def get(self, id: str, validate: bool = False) -> Optional[Dict]:
+        """Look up tool class.
+
+        Args:
+            id: Tool class identifier.
+            validate: Whether to check the stored generation regardless of
+                when it was last checked, e.g., before writing.
+
+        Returns:
+            Copy of the tool class object, or `None` if it is not available.
+        """
+        self.refresh(force=validate)
+        with self._lock:
+            return deepcopy(self._classes.get(id))
+
+    def is_current(self, data: Dict) -> bool:
+        """Check whether a tool class is stored as given.
+
+        The stored generation is always checked, so that the result can be
+        used to skip writes that would not change anything.
+
+        Args:
+            data: Tool class object.
+
+        Returns:
+            Whether a tool class with the same identifier and properties is
+            stored.
+        """
+        stored = self.get(id=data['id'], validate=True)
+        return stored is not None and stored == {
+            key: value for key, value in data.items() if key != '_id'
+        }
+
+    def refresh(self, force: bool = False) -> None:
+        """Reload catalogue if the stored generation has changed.
+
+        Args:
+            force: Whether to check the stored generation regardless of when
+                it was last checked.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked < self.check_interval:
+                return
+            self._checked = now
+            generation = get_generation(
+                db_coll_generations=self.db_coll_generations,
+                key=GENERATION_KEY,
+            )
+            if generation == self.generation:
+                return
+            # classes written after reading the generation are picked up on
+            # the next check, as the generation will have changed again
+            self._classes = {
+                data['id']: data for data in self.db_coll_classes.find(
+                    filter={},
+                    projection={'_id': False},
+                )
+            }
+            self.generation = generation
+            self.loads += 1
+        logger.debug(
+            f"Loaded {len(self._classes)} tool classes at generation "
+            f"{generation}."
+        )
+
+    def invalidate(self) -> None:
+        """Mark tool classes as changed.
+
+        Increments the stored generation, so that all worker processes reload
+        their catalogues, and reloads the catalogue of this process on next
+        use.
+        """
+        increment_generation(
+            db_coll_generations=self.db_coll_generations,
+            key=GENERATION_KEY,
+        )
+        with self._lock:
+            self.generation = None
+            self._checked = float('-inf')
+
+
+def get_tool_class_catalogue() -> ToolClassCatalogue:
+    """Get tool class catalogue of the current app.
+
+    The catalogue is created on first use, from the `toolclass_catalogue`
+    section of the custom app configuration, if available.
+
+    Returns:
+        Tool class catalogue.
+    """
+    catalogue = current_app.extensions.get(EXTENSION_KEY)
+    if catalogue is None:
+        conf = getattr(current_app.config.foca, 'custom', None)
+        catalogue_conf = getattr(
+            conf, 'toolclass_catalogue', CatalogueConfig()
+        )
+        db = current_app.config.foca.db.dbs['trsStore']
+        catalogue = current_app.extensions.setdefault(
+            EXTENSION_KEY,
+            ToolClassCatalogue(
+                db_coll_classes=db.collections['toolclasses'].client,
+                db_coll_generations=db.collections['generations'].client,
+                check_interval=catalogue_conf.check_interval,
+            ),
+        )
+    return catalogue
@@ -0,0 +1,140 @@
+"""Compression of stored file contents."""
+
+import gzip
+import logging
+from typing import (Callable, Dict, Optional, Tuple)
+import zlib
+
+from flask import current_app
+
+from trs_filer.custom_config import CompressionConfig
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = 'trs_filer.content_codec'
+
+
+def _zstd() -> Tuple[Callable[[bytes, int], bytes], Callable[[bytes], bytes]]:
+    """Get compression functions of optional package `zstandard`."""
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ValueError(
+            "Codec 'zstd' requires package 'zstandard' to be installed."
+        ) from exc
+    return (
+        lambda data, level: zstandard.ZstdCompressor(level=level)
+        .compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+
+
+CODECS: Dict[str, Callable[[], Tuple[Callable, Callable]]] = {
+    'zlib': lambda: (zlib.compress, zlib.decompress),
+    'gzip': lambda: (
+        lambda data, level: gzip.compress(data, compresslevel=level),
+        gzip.decompress,
+    ),
+    'zstd': _zstd,
+}
+
+
+class ContentCodec:
+    """Compress file contents above a size threshold."""
+
+    def __init__(
+        self,
+        codec: Optional[str] = 'zlib',
+        level: int = 6,
+        threshold: int = 1024,
+    ) -> None:
+        """Initialize codec.
+
+        Args:
+            codec: Name of compression codec, one of `zlib`, `gzip` and
+                `zstd`; `None` disables compression.
+            level: Compression level, as understood by the codec.
+            threshold: Minimum size (in bytes) of UTF-8 encoded contents to be
+                compressed.
+
+        Attributes:
+            codec: Name of compression codec.
+            level: Compression level, as understood by the codec.
+            threshold: Minimum size (in bytes) of UTF-8 encoded contents to be
+                compressed.
+
+        Raises:
+            ValueError: Codec is unknown or unavailable.
+        """
+        if codec is not None and codec not in CODECS:
+            raise ValueError(
+                f"Unknown codec '{codec}'; choose one of: {', '.join(CODECS)}"
+            )
+        self.codec = codec
+        self.level = level
+        self.threshold = threshold
+        self._compress = None
+        if codec is not None:
+            self._compress = CODECS[codec]()[0]
+
+    def encode(self, content: str) -> Dict:
+        """Encode file content for storage.
+
+        Compressed contents are only kept if they are smaller than the
+        original contents.
+
+        Args:
+            content: File content.
+
+        Returns:
+            Fields `content` and, if compressed, `codec` of a stored object.
+        """
+        if self._compress is None:
+            return {'content': content}
+        data = content.encode('utf-8')
+        if len(data) < self.threshold:
+            return {'content': content}
+        compressed = self._compress(data, self.level)
+        if len(compressed) >= len(data):
+            return {'content': content}
+        return {'content': compressed, 'codec': self.codec}
+
+
+def decode_content(obj: Dict) -> str:
+    """Decode stored file content.
+
+    Args:
+        obj: Stored object with fields `content` and, if compressed, `codec`.
+
+    Returns:
+        File content.
+    """
+    codec = obj.get('codec')
+    if codec is None:
+        return obj['content']
+    decompress = CODECS[codec]()[1]
+    return decompress(bytes(obj['content'])).decode('utf-8')
+
+
+def get_content_codec() -> ContentCodec:
+    """Get content codec of the current app.
+
+    The codec is created on first use, from the `compression` section of the
+    custom app configuration, if available.
+
+    Returns:
+        Content codec.
+    """
+    codec = current_app.extensions.get(EXTENSION_KEY)
+    if codec is None:
+        conf = getattr(current_app.config.foca, 'custom', None)
+        compression_conf = getattr(conf, 'compression', CompressionConfig())
+        codec = current_app.extensions.setdefault(
+            EXTENSION_KEY,
+            ContentCodec(
+                codec=compression_conf.codec,
+                level=compression_conf.level,
+                threshold=compression_conf.threshold,
+            ),
+        )
+    return codec
@@ -0,0 +1,158 @@
+"""Registration context compiled once per app from the custom config.
+
+Registering tools, versions and tool classes requires the identifier
+settings, the base URL of the service and the database collections. These
+are derived from the app configuration once, rather than for every object
+registered.
+"""
+
+import string
+from typing import NamedTuple
+
+from flask import current_app
+from foca.models.config import Config
+from pymongo.collection import Collection
+
+from trs_filer.custom_config import IdConfig
+from trs_filer.ga4gh.trs.endpoints.utils import generate_id
+
+EXTENSION_KEY = 'trs_filer.registration_context'
+
+
+def compile_charset(charset: str) -> str:
+    """Evaluate character set expression or interpret literal string as set.
+
+    Args:
+        charset: A string of allowed characters or an expression evaluating to
+            a string of allowed characters, e.g., `string.digits`.
+
+    Returns:
+        Allowed characters.
+    """
+    try:
+        value = eval(charset, {'string': string})
+    except Exception:
+        value = None
+    if not isinstance(value, str):
+        value = ''.join(sorted(set(charset)))
+    return value
+
+
+class IdSpec(NamedTuple):
+    """Compiled settings for generating object identifiers.
+
+    Attributes:
+        charset: Allowed characters.
+        length: Length of generated identifiers.
+        strategy: Strategy for generating identifiers; either `random` or
+            `ulid`.
+    """
+    charset: str
+    length: int
+    strategy: str
+
+    @classmethod
+    def from_config(cls, conf: IdConfig) -> 'IdSpec':
+        """Compile identifier settings.
+
+        Args:
+            conf: Identifier config parameters.
+
+        Returns:
+            Compiled identifier settings.
+        """
+        return cls(
+            charset=compile_charset(conf.charset),
+            length=int(conf.length),
+            strategy=conf.strategy,
+        )
+
+    def generate(self) -> str:
+        """Generate identifier.
+
+        Returns:
+            New identifier.
+        """
+        return generate_id(
+            charset=self.charset,
+            length=self.length,
+            strategy=self.strategy,
+        )
+
+
+class RegistrationContext(NamedTuple):
+    """Immutable settings and database collections for registering objects.
+
+    Attributes:
+        tool_ids: Settings for generating tool and tool class identifiers.
+        version_ids: Settings for generating version identifiers.
+        tool_meta_version_init: Initial value for tool meta version.
+        version_meta_version_init: Initial value for version meta version.
+        tools_url: Base URL of tool objects, for constructing tool and
+            version `url` properties.
+        tool_class_validation: Whether a tool is only allowed to be added if
+            it is associated with a pre-existing tool class.
+        db_coll_tools: Database collection for storing tool objects.
+        db_coll_classes: Database collection for storing tool class objects.
+        db_coll_files: Database collection for storing file objects.
+        db_coll_blobs: Database collection for storing file contents.
+        db_coll_facets: Database collection for storing facet counts.
+    """
+    tool_ids: IdSpec
+    version_ids: IdSpec
+    tool_meta_version_init: int
+    version_meta_version_init: int
+    tools_url: str
+    tool_class_validation: bool
+    db_coll_tools: Collection
+    db_coll_classes: Collection
+    db_coll_files: Collection
+    db_coll_blobs: Collection
+    db_coll_facets: Collection
+
+    @classmethod
+    def from_config(cls, conf: Config) -> 'RegistrationContext':
+        """Compile registration context.
+
+        Args:
+            conf: App configuration.
+
+        Returns:
+            Registration context.
+        """
+        custom = conf.custom
+        service = custom.service
+        collections = conf.db.dbs['trsStore'].collections
+        return cls(
+            tool_ids=IdSpec.from_config(custom.tool.id),
+            version_ids=IdSpec.from_config(custom.version.id),
+            tool_meta_version_init=int(custom.tool.meta_version.init),
+            version_meta_version_init=int(custom.version.meta_version.init),
+            tools_url=(
+                f"{service.url_prefix}://{service.external_host}:"
+                f"{service.external_port}/{service.api_path}/tools"
+            ),
+            tool_class_validation=custom.toolclass.validation,
+            db_coll_tools=collections['tools'].client,
+            db_coll_classes=collections['toolclasses'].client,
+            db_coll_files=collections['files'].client,
+            db_coll_blobs=collections['blobs'].client,
+            db_coll_facets=collections['facets'].client,
+        )
+
+
+def get_registration_context() -> RegistrationContext:
+    """Get registration context of the current app.
+
+    The context is compiled on first use, usually at app start.
+
+    Returns:
+        Registration context.
+    """
+    context = current_app.extensions.get(EXTENSION_KEY)
+    if context is None:
+        context = current_app.extensions.setdefault(
+            EXTENSION_KEY,
+            RegistrationContext.from_config(conf=current_app.config.foca),
+        )
+    return context
@@ -0,0 +1,230 @@
+"""Materialized counts of tools per facet value.
+
+Counts are kept in a dedicated database collection, with one document per
+facet and value, and are updated incrementally whenever tools are written or
+deleted, so that they can be served without scanning the tools collection.
+They are only computed from scratch, with a single aggregation over the tools
+collection, if they have not been materialized yet.
+"""
+
+from collections import Counter
+import logging
+from typing import (Dict, Iterable, Iterator, List, Optional, Tuple)
+
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+logger = logging.getLogger(__name__)
+
+# tool fields counted per facet; tools are counted once per distinct value,
+# however many of their versions or images share it
+FACET_FIELDS: Dict[str, str] = {
+    'toolClass': 'toolclass.name',
+    'descriptorType': 'versions.descriptor_type',
+    'organization': 'organization',
+    'registry': 'versions.images.registry_host',
+}
+
+# fields to read when only the facet values of a tool are needed
+PROJECTION_FACETS: Dict[str, bool] = {
+    '_id': False,
+    **{field: True for field in FACET_FIELDS.values()},
+}
+
+
+def get_facet_values(tool: Optional[Dict]) -> Dict[str, List]:
+    """Get distinct facet values of a tool.
+
+    Args:
+        tool: Tool object; `None` for a tool that does not exist.
+
+    Returns:
+        Distinct values, by facet.
+    """
+    values: Dict[str, List] = {facet: [] for facet in FACET_FIELDS}
+    if tool is None:
+        return values
+    for facet, field in FACET_FIELDS.items():
+        for value in _get_field(tool, field.split('.')):
+            if value not in values[facet]:
+                values[facet].append(value)
+    return values
+
+
+def update_facets(
+    db_coll_facets: Collection,
+    before: Iterable[Optional[Dict]] = (),
+    after: Iterable[Optional[Dict]] = (),
+) -> None:
+    """Update facet counts for changed tools.
+
+    Args:
+        db_coll_facets: Database collection for storing facet counts.
+        before: Tools before the change, with at least the fields in
+            `PROJECTION_FACETS`; `None` for tools that did not exist.
+        after: The same tools after the change; `None` for deleted tools.
+    """
+    delta: Counter = Counter()
+    for sign, tools in ((-1, before), (1, after)):
+        for tool in tools:
+            for facet, values in get_facet_values(tool).items():
+                for value in values:
+                    delta[(facet, value)] += sign
+    requests = [
+        UpdateOne(
+            filter={'facet': facet, 'value': value},
+            update={'$inc': {'count': count}},
+            upsert=True,
+        )
+        for (facet, value), count in delta.items() if count
+    ]
+    if not requests:
+        return
+    db_coll_facets.bulk_write(requests, ordered=False)
+    decremented = [
+        {'facet': facet, 'value': value}
+        for (facet, value), count in delta.items() if count < 0
+    ]
+    if decremented:
+        db_coll_facets.delete_many({
+            '$or': decremented,
+            'count': {'$lte': 0},
+        })
+
+
+def compute_facets(db_coll_tools: Collection) -> Dict[str, Dict]:
+    """Count tools per facet value with a single aggregation.
+
+    Args:
+        db_coll_tools: Database collection for storing tool objects.
+
+    Returns:
+        Number of tools, by value, by facet.
+    """
+    pipeline = [
+        {'$project': {field: True for field in FACET_FIELDS.values()}},
+        {'$facet': {
+            facet: _get_count_pipeline(field)
+            for facet, field in FACET_FIELDS.items()
+        }},
+    ]
+    result = next(iter(db_coll_tools.aggregate(pipeline)), {})
+    return {
+        facet: {
+            group['_id']: group['count'] for group in result.get(facet, [])
+            if group['_id'] is not None
+        }
+        for facet in FACET_FIELDS
+    }
+
+
+def rebuild_facets(
+    db_coll_tools: Collection,
+    db_coll_facets: Collection,
+    force: bool = False,
+) -> bool:
+    """Materialize facet counts computed from the tools collection.
+
+    Args:
+        db_coll_tools: Database collection for storing tool objects.
+        db_coll_facets: Database collection for storing facet counts.
+        force: Whether to replace counts that are already materialized.
+
+    Returns:
+        Whether counts were (re)computed.
+    """
+    if not force and (
+        db_coll_facets.find_one(projection={'_id': True}) is not None or
+        db_coll_tools.find_one(projection={'_id': True}) is None
+    ):
+        return False
+    counts = compute_facets(db_coll_tools=db_coll_tools)
+    db_coll_facets.delete_many({})
+    documents = [
+        {'facet': facet, 'value': value, 'count': count}
+        for facet, values in counts.items()
+        for value, count in values.items()
+    ]
+    if documents:
+        db_coll_facets.insert_many(documents)
+    logger.info(f"Materialized {len(documents)} facet counts.")
+    return True
+
+
+def get_facets(db_coll_facets: Collection) -> Dict[str, List[Dict]]:
+    """Get materialized facet counts.
+
+    Args:
+        db_coll_facets: Database collection for storing facet counts.
+
+    Returns:
+        Values and the number of tools with each value, by facet, most
+        frequent values first.
+    """
+    facets: Dict[str, List[Dict]] = {facet: [] for facet in FACET_FIELDS}
+    for doc in db_coll_facets.find(
+        filter={'count': {'$gt': 0}},
+        projection={'_id': False},
+    ):
+        if doc['facet'] in facets:
+            facets[doc['facet']].append({
+                'value': doc['value'],
+                'count': doc['count'],
+            })
+    for counts in facets.values():
+        counts.sort(key=_sort_key)
+    return facets
+
+
+def count_facets(db_coll_tools: Collection) -> Dict[str, List[Dict]]:
+    """Get facet counts computed from the tools collection.
+
+    Args:
+        db_coll_tools: Database collection for storing tool objects.
+
+    Returns:
+        Values and the number of tools with each value, by facet, most
+        frequent values first.
+    """
+    facets: Dict[str, List[Dict]] = {
+        facet: sorted(
+            (
+                {'value': value, 'count': count}
+                for value, count in values.items()
+            ),
+            key=_sort_key,
+        )
+        for facet, values in compute_facets(db_coll_tools).items()
+    }
+    return facets
+
+
+def _get_field(obj, path: List[str]) -> Iterator:
+    """Get values of a dotted field path, descending into arrays."""
+    if isinstance(obj, list):
+        for item in obj:
+            yield from _get_field(item, path)
+    elif not path:
+        if obj is not None:
+            yield obj
+    elif isinstance(obj, dict):
+        yield from _get_field(obj.get(path[0]), path[1:])
+
+
+def _get_count_pipeline(field: str) -> List[Dict]:
+    """Get pipeline counting tools per distinct value of a field."""
+    parts = field.split('.')
+    return [
+        # arrays along the path are unwound, other values are kept as is
+        *(
+            {'$unwind': f"${'.'.join(parts[:index])}"}
+            for index in range(1, len(parts) + 1)
+        ),
+        {'$group': {'_id': {'tool': '$_id', 'value': f"${field}"}}},
+        {'$group': {'_id': '$_id.value', 'count': {'$sum': 1}}},
+    ]
+
+
+def _sort_key(count: Dict) -> Tuple:
+    """Sort by decreasing count, then by value."""
+    return -count['count'], str(count['value'])
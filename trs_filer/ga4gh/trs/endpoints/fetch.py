@@ -0,0 +1,195 @@
+"""Concurrent retrieval of file contents from URLs."""
+
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    ThreadPoolExecutor,
+    wait,
+)
+import logging
+import socket
+import time
+from typing import (Dict, Iterable)
+
+from flask import current_app
+import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+
+from trs_filer.custom_config import FetchConfig
+from trs_filer.errors.exceptions import FetchError
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = 'trs_filer.file_fetcher'
+CHUNK_SIZE = 65536
+
+
+class FileFetcher:
+    """Retrieve file contents concurrently via a pooled HTTP session."""
+
+    def __init__(
+        self,
+        workers: int = 8,
+        timeout: float = 10,
+        total_timeout: float = 60,
+        max_size: int = 10485760,
+    ) -> None:
+        """Initialize session and worker pool.
+
+        Args:
+            workers: Maximum number of concurrent requests; also the size of
+                the connection pool.
+            timeout: Time (in seconds) after which a request is aborted if the
+                remote server fails to establish a connection or to send any
+                data.
+            total_timeout: Time (in seconds) after which retrieving a set of
+                files is aborted.
+            max_size: Maximum size (in bytes) of a retrieved file.
+
+        Attributes:
+            timeout: Time (in seconds) after which a request is aborted if the
+                remote server fails to establish a connection or to send any
+                data.
+            total_timeout: Time (in seconds) after which retrieving a set of
+                files is aborted.
+            max_size: Maximum size (in bytes) of a retrieved file.
+            session: HTTP session with connection pool.
+            executor: Worker pool.
+        """
+        self.timeout = timeout
+        self.total_timeout = total_timeout
+        self.max_size = max_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix='trs_filer_fetch',
+        )
+
+    def fetch(
+        self,
+        url: str,
+        deadline: float,
+    ) -> str:
+        """Retrieve file content.
+
+        Args:
+            url: URL of the file.
+            deadline: Time, as returned by `time.monotonic()`, after which
+                retrieval is aborted.
+
+        Returns:
+            File content.
+
+        Raises:
+            FetchError: Content could not be retrieved within the allotted
+                time, or it exceeds the maximum size.
+        """
+        try:
+            with self.session.get(
+                url,
+                stream=True,
+                timeout=self.timeout,
+            ) as response:
+                response.raise_for_status()
+                length = response.headers.get('Content-Length')
+                if length is not None and int(length) > self.max_size:
+                    raise FetchError(
+                        f"Content at URL '{url}' exceeds maximum size of "
+                        f"{self.max_size} bytes."
+                    )
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.max_size:
+                        raise FetchError(
+                            f"Content at URL '{url}' exceeds maximum size of "
+                            f"{self.max_size} bytes."
+                        )
+                    if time.monotonic() > deadline:
+                        raise FetchError(
+                            f"Timed out retrieving content from URL '{url}'."
+                        )
+                    chunks.append(chunk)
+                return b''.join(chunks).decode(
+                    response.encoding or 'utf-8',
+                    errors='replace',
+                )
+        except (
+            requests.exceptions.RequestException,
+            socket.gaierror,
+            urllib3.exceptions.HTTPError,
+            ValueError,
+        ) as exc:
+            raise FetchError(
+                f"Could not retrieve content from URL '{url}': {exc}"
+            ) from exc
+
+    def fetch_all(
+        self,
+        urls: Iterable[str],
+    ) -> Dict[str, str]:
+        """Retrieve contents of multiple files concurrently.
+
+        Args:
+            urls: URLs of the files.
+
+        Returns:
+            File contents, by URL.
+
+        Raises:
+            FetchError: Any of the contents could not be retrieved, or not all
+                contents could be retrieved within the total timeout.
+        """
+        deadline = time.monotonic() + self.total_timeout
+        futures = {
+            self.executor.submit(self.fetch, url, deadline): url
+            for url in dict.fromkeys(urls)
+        }
+        if not futures:
+            return {}
+        done, not_done = wait(
+            futures,
+            timeout=self.total_timeout,
+            return_when=FIRST_EXCEPTION,
+        )
+        for future in not_done:
+            future.cancel()
+        for future in done:
+            if future.exception() is not None:
+                raise future.exception()
+        if not_done:
+            raise FetchError(
+                "Timed out retrieving content from URL(s): "
+                f"{', '.join(futures[f] for f in not_done)}"
+            )
+        logger.debug(f"Retrieved content from {len(futures)} URL(s).")
+        return {url: future.result() for future, url in futures.items()}
+
+
+def get_file_fetcher() -> FileFetcher:
+    """Get file fetcher of the current app.
+
+    The fetcher is created on first use, from the `fetch` section of the
+    custom app configuration, if available.
+
+    Returns:
+        File fetcher.
+    """
+    fetcher = current_app.extensions.get(EXTENSION_KEY)
+    if fetcher is None:
+        conf = getattr(current_app.config.foca, 'custom', None)
+        fetch_conf = getattr(conf, 'fetch', FetchConfig())
+        fetcher = current_app.extensions.setdefault(
+            EXTENSION_KEY,
+            FileFetcher(
+                workers=fetch_conf.workers,
+                timeout=fetch_conf.timeout,
+                total_timeout=fetch_conf.total_timeout,
+                max_size=fetch_conf.max_size,
+            ),
+        )
+    return fetcher
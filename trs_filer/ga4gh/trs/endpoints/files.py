@@ -0,0 +1,520 @@
+"""Storage of tool version files in a dedicated database collection.
+
+File contents are stored only once, in the blobs collection, keyed by their
+SHA-256 digest. File objects reference their content via the digest in field
+`blob`, and each blob counts the file objects referencing it. Contents may be
+stored compressed; they are decompressed when files are resolved.
+"""
+
+from collections import Counter
+from copy import deepcopy
+import hashlib
+import logging
+from typing import (Dict, Iterable, Iterator, List, Mapping, Optional)
+
+from pymongo import (ReplaceOne, UpdateOne)
+from pymongo.collection import Collection
+
+from trs_filer.ga4gh.trs.endpoints.codecs import (
+    ContentCodec,
+    decode_content,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+MIGRATING = '_migrating'
+
+
+def content_digest(content: str) -> str:
+    """Compute digest identifying file content.
+
+    Args:
+        content: File content.
+
+    Returns:
+        Hex-encoded SHA-256 digest of the UTF-8 encoded content.
+    """
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def acquire_blobs(
+    db_coll_blobs: Collection,
+    contents: Mapping[str, str],
+    counts: Optional[Mapping[str, int]] = None,
+    codec: Optional[ContentCodec] = None,
+) -> None:
+    """Store file contents, adding references to existing ones.
+
+    Args:
+        db_coll_blobs: Database collection for storing file contents.
+        contents: File contents, by digest.
+        counts: Number of references to add, by digest. Defaults to one
+            reference for each content.
+        codec: Codec for compressing new contents. If not provided, contents
+            are stored uncompressed.
+    """
+    requests = [
+        UpdateOne(
+            filter={'_id': digest},
+            update={
+                '$inc': {
+                    'refcount': 1 if counts is None else counts.get(digest, 0),
+                },
+                '$setOnInsert': (
+                    {'content': content} if codec is None
+                    else codec.encode(content)
+                ),
+            },
+            upsert=True,
+        )
+        for digest, content in contents.items()
+    ]
+    if requests:
+        db_coll_blobs.bulk_write(requests, ordered=False)
+
+
+def release_blobs(
+    db_coll_files: Collection,
+    db_coll_blobs: Collection,
+    counts: Mapping[str, int],
+) -> int:
+    """Remove references to file contents and collect unused contents.
+
+    Args:
+        db_coll_files: Database collection for storing file objects.
+        db_coll_blobs: Database collection for storing file contents.
+        counts: Number of references to remove, by digest.
+
+    Returns:
+        Number of deleted file contents.
+    """
+    requests = [
+        UpdateOne(
+            filter={'_id': digest},
+            update={'$inc': {'refcount': -count}},
+        )
+        for digest, count in counts.items() if count > 0
+    ]
+    if not requests:
+        return 0
+    db_coll_blobs.bulk_write(requests, ordered=False)
+    return collect_blobs(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        digests=list(counts),
+    )
+
+
+def collect_blobs(
+    db_coll_files: Collection,
+    db_coll_blobs: Collection,
+    digests: Optional[List[str]] = None,
+) -> int:
+    """Delete file contents that are no longer referenced.
+
+    Contents are only deleted if their reference count has dropped to zero
+    and no file object references them, so that miscounts due to concurrent
+    writes never cause contents in use to be deleted.
+
+    Args:
+        db_coll_files: Database collection for storing file objects.
+        db_coll_blobs: Database collection for storing file contents.
+        digests: Digests of contents to consider. If not provided, all
+            contents are considered.
+
+    Returns:
+        Number of deleted file contents.
+    """
+    filt: Dict = {'refcount': {'$lte': 0}}
+    if digests is not None:
+        filt['_id'] = {'$in': digests}
+    count = 0
+    for blob in db_coll_blobs.find(filter=filt, projection={'_id': True}):
+        if db_coll_files.find_one(
+            filter={'blob': blob['_id']},
+            projection={'_id': True},
+        ) is not None:
+            continue
+        count += db_coll_blobs.delete_one(
+            filter={'_id': blob['_id'], 'refcount': {'$lte': 0}},
+        ).deleted_count
+    if count:
+        logger.debug(f"Deleted {count} unreferenced file content(s).")
+    return count
+
+
+def resolve_contents(
+    db_coll_blobs: Collection,
+    files: Iterable[Dict],
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[Dict]:
+    """Add contents to file objects referencing them by digest.
+
+    Contents are looked up in batches, so that large numbers of files can be
+    processed lazily, and are only decompressed when the corresponding file
+    object is consumed. File objects with embedded contents are passed through
+    unchanged.
+
+    Args:
+        db_coll_blobs: Database collection for storing file contents.
+        files: File objects, as stored in the files collection.
+        batch_size: Number of file objects for which contents are looked up
+            at once.
+
+    Yields:
+        File objects with contents in `file_wrapper.content`.
+    """
+    batch: List[Dict] = []
+    for _file in files:
+        batch.append(_file)
+        if len(batch) >= batch_size:
+            yield from _resolve_batch(db_coll_blobs, batch)
+            batch = []
+    yield from _resolve_batch(db_coll_blobs, batch)
+
+
+def store_files(
+    db_coll_files: Collection,
+    db_coll_blobs: Collection,
+    tool_id: str,
+    version_id: str,
+    files: List[Dict],
+    codec: Optional[ContentCodec] = None,
+) -> None:
+    """Store files of a tool version, replacing any previous ones.
+
+    Files are keyed by tool identifier, version identifier, descriptor/image
+    type and path. References to new contents are added before the files are
+    written, references to previous contents are removed afterwards.
+
+    Args:
+        db_coll_files: Database collection for storing file objects.
+        db_coll_blobs: Database collection for storing file contents.
+        tool_id: Tool identifier.
+        version_id: Tool version identifier.
+        files: File objects consistent with the `FileWrapperRegister` schema.
+        codec: Codec for compressing new contents. If not provided, contents
+            are stored uncompressed.
+    """
+    previous = Counter(
+        doc['blob'] for doc in db_coll_files.find(
+            filter={'tool_id': tool_id, 'version_id': version_id},
+            projection={'_id': False, 'blob': True},
+        ) if 'blob' in doc
+    )
+    current: Counter = Counter()
+    contents = {}
+    requests = []
+    for _file in files:
+        doc = deepcopy(_file)
+        doc['tool_id'] = tool_id
+        doc['version_id'] = version_id
+        content = doc['file_wrapper'].pop('content', None)
+        if content is not None:
+            doc['blob'] = content_digest(content)
+            contents[doc['blob']] = content
+            current[doc['blob']] += 1
+        requests.append(ReplaceOne(
+            filter={
+                'tool_id': tool_id,
+                'version_id': version_id,
+                'type': doc['type'],
+                'tool_file.path': doc['tool_file']['path'],
+            },
+            replacement=doc,
+            upsert=True,
+        ))
+    acquire_blobs(
+        db_coll_blobs=db_coll_blobs,
+        contents=contents,
+        counts=current - previous,
+        codec=codec,
+    )
+    if requests:
+        db_coll_files.bulk_write(requests, ordered=False)
+
+    # remove files that are no longer associated with the version
+    filt = {
+        'tool_id': tool_id,
+        'version_id': version_id,
+    }
+    if requests:
+        filt['$nor'] = [
+            {'type': f['type'], 'tool_file.path': f['tool_file']['path']}
+            for f in files
+        ]
+    db_coll_files.delete_many(filt)
+    release_blobs(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        counts=previous - current,
+    )
+    logger.debug(
+        f"Stored {len(files)} file(s) of version '{version_id}' of tool "
+        f"'{tool_id}'."
+    )
+
+
+def delete_files(
+    db_coll_files: Collection,
+    db_coll_blobs: Collection,
+    tool_id: str,
+    version_id: Optional[str] = None,
+    keep_versions: Optional[List[str]] = None,
+) -> int:
+    """Delete files of a tool or tool version.
+
+    Args:
+        db_coll_files: Database collection for storing file objects.
+        db_coll_blobs: Database collection for storing file contents.
+        tool_id: Tool identifier.
+        version_id: Tool version identifier. If not provided, the files of
+            all versions of the tool are deleted.
+        keep_versions: Identifiers of tool versions whose files are not to be
+            deleted.
+
+    Returns:
+        Number of deleted files.
+    """
+    filt: Dict = {'tool_id': tool_id}
+    if version_id is not None:
+        filt['version_id'] = version_id
+    elif keep_versions is not None:
+        filt['version_id'] = {'$nin': keep_versions}
+    return _delete_files(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        filt=filt,
+    )
+
+
+def migrate_files(
+    db_coll_tools: Collection,
+    db_coll_files: Collection,
+    db_coll_blobs: Collection,
+    codec: Optional[ContentCodec] = None,
+    tool_id: Optional[str] = None,
+) -> int:
+    """Move files embedded in tool documents to the files collection.
+
+    Tools are migrated one at a time, so the migration can run while the
+    service is up, and it can be interrupted and resumed at any time. The
+    embedded files of a tool are first added to the files collection,
+    without replacing files stored concurrently, and are only then removed
+    from the tool. Added files are flagged until the tool has been
+    updated. If the tool's versions have been changed concurrently, the
+    embedded files are kept and the flagged files are deleted again; the
+    concurrent write stores the files of the changed tool itself.
+
+    Args:
+        db_coll_tools: Database collection for storing tool objects.
+        db_coll_files: Database collection for storing file objects.
+        db_coll_blobs: Database collection for storing file contents.
+        codec: Codec for compressing contents. If not provided, contents are
+            stored uncompressed.
+        tool_id: Identifier of the only tool to migrate. If not provided,
+            all tools are migrated.
+
+    Returns:
+        Number of migrated tools.
+    """
+    filt: Dict = {'versions.files': {'$exists': True}}
+    if tool_id is not None:
+        filt['id'] = tool_id
+    count = 0
+    for tool in db_coll_tools.find(
+        filter=filt,
+        projection={'id': True, 'versions': True},
+    ):
+        versions = deepcopy(tool['versions'])
+        for version in versions:
+            _add_files(
+                db_coll_files=db_coll_files,
+                db_coll_blobs=db_coll_blobs,
+                tool_id=tool['id'],
+                version_id=version['id'],
+                files=version.pop('files', []),
+                codec=codec,
+            )
+        flagged = {'tool_id': tool['id'], MIGRATING: True}
+        result = db_coll_tools.update_one(
+            filter={'_id': tool['_id'], 'versions': tool['versions']},
+            update={'$set': {'versions': versions}},
+        )
+        if not result.modified_count:
+            _delete_files(
+                db_coll_files=db_coll_files,
+                db_coll_blobs=db_coll_blobs,
+                filt=flagged,
+            )
+            logger.info(
+                f"Tool '{tool['id']}' changed during migration; skipping."
+            )
+            continue
+        db_coll_files.update_many(
+            filter=flagged,
+            update={'$unset': {MIGRATING: ''}},
+        )
+        count += 1
+    if count:
+        logger.info(f"Moved files of {count} tool(s) to files collection.")
+    return count
+
+
+def migrate_blobs(
+    db_coll_files: Collection,
+    db_coll_blobs: Collection,
+    codec: Optional[ContentCodec] = None,
+) -> int:
+    """Move contents embedded in file objects to the blobs collection.
+
+    Files are migrated one at a time and only if they have not been changed
+    concurrently, so the migration can run while the service is up.
+
+    Args:
+        db_coll_files: Database collection for storing file objects.
+        db_coll_blobs: Database collection for storing file contents.
+        codec: Codec for compressing contents. If not provided, contents are
+            stored uncompressed.
+
+    Returns:
+        Number of migrated files.
+    """
+    count = 0
+    for _file in db_coll_files.find(
+        filter={'file_wrapper.content': {'$exists': True}},
+        projection={'file_wrapper.content': True},
+    ):
+        content = _file['file_wrapper']['content']
+        digest = content_digest(content)
+        acquire_blobs(
+            db_coll_blobs=db_coll_blobs,
+            contents={digest: content},
+            codec=codec,
+        )
+        result = db_coll_files.update_one(
+            filter={
+                '_id': _file['_id'],
+                'file_wrapper.content': content,
+                'blob': {'$exists': False},
+            },
+            update={
+                '$set': {'blob': digest},
+                '$unset': {'file_wrapper.content': ''},
+            },
+        )
+        if not result.modified_count:
+            release_blobs(
+                db_coll_files=db_coll_files,
+                db_coll_blobs=db_coll_blobs,
+                counts={digest: 1},
+            )
+            continue
+        count += 1
+    if count:
+        logger.info(f"Moved contents of {count} file(s) to blobs collection.")
+    return count
+
+
+def _add_files(
+    db_coll_files: Collection,
+    db_coll_blobs: Collection,
+    tool_id: str,
+    version_id: str,
+    files: List[Dict],
+    codec: Optional[ContentCodec] = None,
+) -> None:
+    """Add files of a tool version, keeping any existing ones.
+
+    Added files are flagged as migrating. References to contents are added
+    before the files are written; references of files that already exist
+    are removed again afterwards.
+    """
+    docs = []
+    contents = {}
+    counts: Counter = Counter()
+    for _file in files:
+        doc = deepcopy(_file)
+        doc['tool_id'] = tool_id
+        doc['version_id'] = version_id
+        doc[MIGRATING] = True
+        content = doc['file_wrapper'].pop('content', None)
+        if content is not None:
+            doc['blob'] = content_digest(content)
+            contents[doc['blob']] = content
+            counts[doc['blob']] += 1
+        docs.append(doc)
+    if not docs:
+        return
+    acquire_blobs(
+        db_coll_blobs=db_coll_blobs,
+        contents=contents,
+        counts=counts,
+        codec=codec,
+    )
+    result = db_coll_files.bulk_write(
+        [
+            UpdateOne(
+                filter={
+                    'tool_id': tool_id,
+                    'version_id': version_id,
+                    'type': doc['type'],
+                    'tool_file.path': doc['tool_file']['path'],
+                },
+                update={'$setOnInsert': doc},
+                upsert=True,
+            ) for doc in docs
+        ],
+        ordered=False,
+    )
+    release_blobs(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        counts=Counter(
+            doc['blob'] for index, doc in enumerate(docs)
+            if index not in result.upserted_ids and 'blob' in doc
+        ),
+    )
+
+
+def _delete_files(
+    db_coll_files: Collection,
+    db_coll_blobs: Collection,
+    filt: Dict,
+) -> int:
+    """Delete files matching a filter and release their contents."""
+    counts = Counter(
+        doc['blob'] for doc in db_coll_files.find(
+            filter=filt,
+            projection={'_id': False, 'blob': True},
+        ) if 'blob' in doc
+    )
+    deleted = db_coll_files.delete_many(filt).deleted_count
+    release_blobs(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db_coll_blobs,
+        counts=counts,
+    )
+    return deleted
+
+
+def _resolve_batch(
+    db_coll_blobs: Collection,
+    files: List[Dict],
+) -> Iterator[Dict]:
+    """Add contents to a batch of file objects referencing them by digest."""
+    digests = list({_f['blob'] for _f in files if 'blob' in _f})
+    blobs = {}
+    if digests:
+        blobs = {
+            blob['_id']: blob
+            for blob in db_coll_blobs.find(filter={'_id': {'$in': digests}})
+        }
+    for _file in files:
+        digest = _file.pop('blob', None)
+        if digest is not None and digest in blobs:
+            _file.setdefault('file_wrapper', {})['content'] = decode_content(
+                blobs[digest]
+            )
+        yield _file
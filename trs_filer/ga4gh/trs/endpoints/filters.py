@@ -0,0 +1,85 @@
+"""Compilation of `GET /tools` filter parameters into database queries."""
+
+from typing import (Dict, List, Optional)
+
+
+def compile_tools_filter(
+    id: Optional[str] = None,
+    alias: Optional[str] = None,
+    toolClass: Optional[str] = None,
+    descriptorType: Optional[str] = None,
+    registry: Optional[str] = None,
+    organization: Optional[str] = None,
+    name: Optional[str] = None,
+    toolname: Optional[str] = None,
+    description: Optional[str] = None,
+    author: Optional[str] = None,
+    checker: Optional[bool] = None,
+) -> Dict:
+    """Compile filter parameters into a single database query.
+
+    Filter parameters are additive. Predicates on version-level properties
+    (`descriptorType`, `author`, `registry` and `name`) are merged into a
+    single `$elemMatch` expression, i.e., a tool only matches if at least one
+    of its versions satisfies all of them. Likewise, `registry` and `name` need
+    to be satisfied by the same image. Clauses are always listed in the same
+    order, regardless of the order of the parameters; MongoDB selects indexes
+    independently of that order.
+
+    Args:
+        id: Return only entries with the given identifier.
+        alias: Return only entries with the given alias.
+        toolClass: Return only entries with the given subclass name.
+        descriptorType: Return only entries with the given descriptor type.
+        registry: Return only entries from the given registry.
+        organization: Return only entries from the given organization.
+        name: Return only entries with the given image name.
+        toolname: Return only entries with the given tool name.
+        description: Return only entries with the given description.
+        author: Return only entries from the given author.
+        checker: Return only checker workflows.
+
+    Returns:
+        Database query. Empty if no filters are specified, a single clause if
+        only one field is filtered on, and an `$and` expression otherwise.
+    """
+    image: Dict = {}
+    if name is not None:
+        image['image_name'] = name
+    if registry is not None:
+        image['registry_host'] = registry
+
+    version: Dict = {}
+    if image:
+        version['images'] = {'$elemMatch': image}
+    if author:
+        version['author'] = author
+    if descriptorType:
+        version['descriptor_type'] = descriptorType
+
+    tool: Dict = {}
+    if id is not None:
+        tool['id'] = id
+    if alias is not None:
+        tool['aliases'] = alias
+    if toolname is not None:
+        tool['name'] = toolname
+    if description is not None:
+        tool['description'] = description
+    if version:
+        tool['versions'] = {'$elemMatch': version}
+    if organization is not None:
+        tool['organization'] = organization
+    if toolClass is not None:
+        tool['toolclass.name'] = toolClass
+    if checker is not None:
+        tool['has_checker'] = checker
+
+    clauses: List[Dict] = [
+        {field: value} for field, value in tool.items()
+    ]
+    if not clauses:
+        return {}
+    if len(clauses) == 1:
+        return clauses[0]
+    return {'$and': clauses}
@@ -0,0 +1,343 @@
+"""Background jobs for retrieving file contents of registered tools."""
+
+from concurrent.futures import (Future, ThreadPoolExecutor)
+from datetime import (datetime, timedelta, timezone)
+import logging
+from typing import (Dict, List, Set)
+from uuid import uuid4
+
+from flask import (current_app, Flask)
+from pymongo.collection import Collection
+
+from trs_filer.custom_config import JobsConfig
+from trs_filer.errors.exceptions import (
+    FetchError,
+    NotFound,
+)
+from trs_filer.ga4gh.trs.endpoints.cache import get_tool_cache
+from trs_filer.ga4gh.trs.endpoints.codecs import get_content_codec
+from trs_filer.ga4gh.trs.endpoints.fetch import get_file_fetcher
+from trs_filer.ga4gh.trs.endpoints.files import (
+    acquire_blobs,
+    content_digest,
+    release_blobs,
+)
+from trs_filer.ga4gh.trs.endpoints.utils import compute_etag
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = 'trs_filer.job_executor'
+STATE_QUEUED = 'QUEUED'
+STATE_RUNNING = 'RUNNING'
+STATE_COMPLETE = 'COMPLETE'
+STATE_FAILED = 'FAILED'
+
+
+def get_job_executor() -> ThreadPoolExecutor:
+    """Get background worker pool of the current app.
+
+    The pool is created on first use, from the `jobs` section of the custom
+    app configuration, if available.
+
+    Returns:
+        Worker pool.
+    """
+    executor = current_app.extensions.get(EXTENSION_KEY)
+    if executor is None:
+        conf = getattr(current_app.config.foca, 'custom', None)
+        jobs_conf = getattr(conf, 'jobs', JobsConfig())
+        executor = current_app.extensions.setdefault(
+            EXTENSION_KEY,
+            ThreadPoolExecutor(
+                max_workers=jobs_conf.workers,
+                thread_name_prefix='trs_filer_jobs',
+            ),
+        )
+    return executor
+
+
+def submit_job(
+    tool_id: str,
+    version_ids: List[str],
+) -> Dict:
+    """Create job for retrieving the file contents of tool versions.
+
+    Args:
+        tool_id: Tool identifier.
+        version_ids: Identifiers of the tool versions whose file contents are
+            to be retrieved.
+
+    Returns:
+        Job object.
+    """
+    db_coll_jobs = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['jobs'].client
+    )
+    now = _now()
+    job = {
+        'id': uuid4().hex,
+        'state': STATE_QUEUED,
+        'tool_id': tool_id,
+        'version_ids': version_ids,
+        'created_at': now,
+        'updated_at': now,
+    }
+    db_coll_jobs.insert_one(document=dict(job))
+    get_job_executor().submit(
+        run_job,
+        app=current_app._get_current_object(),
+        job_id=job['id'],
+    ).add_done_callback(_log_exception)
+    logger.info(f"Queued job '{job['id']}' for tool '{tool_id}'.")
+    return job
+
+
+def recover_jobs(app: Flask) -> int:
+    """Resubmit jobs abandoned by worker processes that have stopped.
+
+    Jobs are lost from the worker pool when the process running them stops.
+    Queued jobs, as well as running jobs that have not completed within the
+    configured timeout, are therefore submitted to the worker pool of the
+    app when a worker process starts. As jobs are claimed before they are
+    run, a job resubmitted by several processes is only run once.
+
+    Args:
+        app: Flask application.
+
+    Returns:
+        Number of resubmitted jobs.
+    """
+    with app.app_context():
+        db_coll_jobs = (
+            current_app.config.foca.db.dbs['trsStore']
+            .collections['jobs'].client
+        )
+        conf = getattr(current_app.config.foca, 'custom', None)
+        jobs_conf = getattr(conf, 'jobs', JobsConfig())
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            seconds=jobs_conf.timeout,
+        )
+        db_coll_jobs.update_many(
+            filter={
+                'state': STATE_RUNNING,
+                'updated_at': {'$lt': _format_time(cutoff)},
+            },
+            update={'$set': {'state': STATE_QUEUED, 'updated_at': _now()}},
+        )
+        job_ids = [
+            job['id'] for job in db_coll_jobs.find(
+                filter={'state': STATE_QUEUED},
+                projection={'_id': False, 'id': True},
+            )
+        ]
+        for job_id in job_ids:
+            get_job_executor().submit(
+                run_job,
+                app=app,
+                job_id=job_id,
+            ).add_done_callback(_log_exception)
+    if job_ids:
+        logger.info(f"Resubmitted {len(job_ids)} abandoned job(s).")
+    return len(job_ids)
+
+
+def get_job(id: str) -> Dict:
+    """Get job.
+
+    Args:
+        id: Job identifier.
+
+    Returns:
+        Job object.
+
+    Raises:
+        NotFound: Job is not available.
+    """
+    db_coll_jobs = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['jobs'].client
+    )
+    job = db_coll_jobs.find_one(
+        filter={'id': id},
+        projection={'_id': False},
+    )
+    if job is None:
+        raise NotFound
+    return job
+
+
+def run_job(
+    app: Flask,
+    job_id: str,
+) -> None:
+    """Retrieve missing file contents of tool versions.
+
+    Files are only updated if they have not been replaced since the job was
+    submitted.
+
+    Args:
+        app: Flask application.
+        job_id: Job identifier.
+    """
+    with app.app_context():
+        dbs = current_app.config.foca.db.dbs['trsStore']
+        db_coll_jobs = dbs.collections['jobs'].client
+        db_coll_files = dbs.collections['files'].client
+        db_coll_blobs = dbs.collections['blobs'].client
+        db_coll_tools = dbs.collections['tools'].client
+        job = db_coll_jobs.find_one_and_update(
+            filter={'id': job_id, 'state': STATE_QUEUED},
+            update={'$set': {'state': STATE_RUNNING, 'updated_at': _now()}},
+        )
+        if job is None:
+            return
+        try:
+            files = list(db_coll_files.find(
+                filter={
+                    'tool_id': job['tool_id'],
+                    'version_id': {'$in': job['version_ids']},
+                    'file_wrapper.url': {'$exists': True},
+                    'file_wrapper.content': {'$exists': False},
+                    'blob': {'$exists': False},
+                },
+            ))
+            contents = get_file_fetcher().fetch_all(
+                urls=[_f['file_wrapper']['url'] for _f in files],
+            )
+            updated: Set[str] = set()
+            for _f in files:
+                content = contents[_f['file_wrapper']['url']]
+                digest = content_digest(content)
+                _f['file_wrapper']['content'] = content
+                acquire_blobs(
+                    db_coll_blobs=db_coll_blobs,
+                    contents={digest: content},
+                    codec=get_content_codec(),
+                )
+                result = db_coll_files.update_one(
+                    filter={'_id': _f['_id'], '_etag': _f.get('_etag')},
+                    update={'$set': {
+                        'blob': digest,
+                        '_etag': compute_etag({
+                            k: v for k, v in _f.items()
+                            if k not in ('tool_id', 'version_id')
+                        }),
+                    }},
+                )
+                if not result.modified_count:
+                    release_blobs(
+                        db_coll_files=db_coll_files,
+                        db_coll_blobs=db_coll_blobs,
+                        counts={digest: 1},
+                    )
+                    continue
+                updated.add(_f['version_id'])
+            # file contents are part of tool and version representations
+            for version_id in sorted(updated):
+                _update_etags(
+                    db_coll_tools=db_coll_tools,
+                    db_coll_files=db_coll_files,
+                    tool_id=job['tool_id'],
+                    version_id=version_id,
+                )
+            if updated:
+                get_tool_cache().invalidate(job['tool_id'])
+        except FetchError as exc:
+            logger.error(f"Job '{job_id}' failed: {exc}")
+            _set_state(db_coll_jobs, job_id, STATE_FAILED, error=str(exc))
+        except Exception:
+            logger.exception(f"Job '{job_id}' failed.")
+            _set_state(
+                db_coll_jobs,
+                job_id,
+                STATE_FAILED,
+                error="An unexpected error occurred.",
+            )
+        else:
+            logger.info(
+                f"Job '{job_id}' retrieved contents of {len(files)} file(s)."
+            )
+            _set_state(db_coll_jobs, job_id, STATE_COMPLETE)
+
+
+def _update_etags(
+    db_coll_tools: Collection,
+    db_coll_files: Collection,
+    tool_id: str,
+    version_id: str,
+) -> None:
+    """Update entity tags of a tool version and its tool after its files.
+
+    The version entity tag is computed from the stored version and files, the
+    tool entity tag is derived from the previous one, as when registering a
+    version. Entity tags are left untouched if the version has been replaced
+    in the meantime.
+    """
+    tool = db_coll_tools.find_one(
+        filter={'id': tool_id},
+        projection={'_id': False, '_etag': True, 'versions': True},
+    )
+    version = next(
+        (_v for _v in (tool or {}).get('versions', [])
+         if _v['id'] == version_id),
+        None,
+    )
+    if version is None:
+        return
+    files = list(db_coll_files.find(
+        filter={'tool_id': tool_id, 'version_id': version_id},
+        projection={
+            '_id': False,
+            'tool_id': False,
+            'version_id': False,
+            'blob': False,
+        },
+        sort=[('type', 1), ('tool_file.path', 1)],
+    ))
+    version_etag = compute_etag({**version, 'files': files})
+    db_coll_tools.update_one(
+        filter={
+            'id': tool_id,
+            'versions': {'$elemMatch': {
+                'id': version_id,
+                '_etag': version.get('_etag'),
+            }},
+        },
+        update={'$set': {
+            'versions.$._etag': version_etag,
+            '_etag': compute_etag({
+                'tool': tool.get('_etag'),
+                'version': version_etag,
+            }),
+        }},
+    )
+
+
+def _set_state(
+    db_coll_jobs,
+    job_id: str,
+    state: str,
+    **kwargs,
+) -> None:
+    """Update job state and, optionally, additional job properties."""
+    db_coll_jobs.update_one(
+        filter={'id': job_id},
+        update={'$set': {'state': state, 'updated_at': _now(), **kwargs}},
+    )
+
+
+def _now() -> str:
+    """Get current time as ISO 8601 string."""
+    return _format_time(datetime.now(timezone.utc))
+
+
+def _format_time(time: datetime) -> str:
+    """Format UTC time as ISO 8601 string."""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _log_exception(future: Future) -> None:
+    """Log exception raised by job, if any."""
+    if future.exception() is not None:
+        logger.error(f"Job raised an exception: {future.exception()}")
@@ -2,26 +2,38 @@
 
 from collections import defaultdict
 import logging
-import string  # noqa: F401
-import socket
-from typing import (Dict, Optional)
-import urllib3
+from typing import (Dict, List, Optional, Type)
 
-from flask import (current_app)
-from pymongo.errors import DuplicateKeyError
-import requests
+from pymongo import (InsertOne, ReplaceOne)
+from pymongo.errors import (BulkWriteError, DuplicateKeyError)
 
 from trs_filer.errors.exceptions import (
     BadRequest,
+    exceptions,
+    FetchError,
     InternalServerError,
     NotFound,
 )
+from trs_filer.ga4gh.trs.endpoints.cache import get_tool_cache
+from trs_filer.ga4gh.trs.endpoints.catalogue import get_tool_class_catalogue
+from trs_filer.ga4gh.trs.endpoints.context import (
+    get_registration_context,
+    IdSpec,
+)
+from trs_filer.ga4gh.trs.endpoints.facets import (
+    PROJECTION_FACETS,
+    update_facets,
+)
+from trs_filer.ga4gh.trs.endpoints.fetch import get_file_fetcher
+from trs_filer.ga4gh.trs.endpoints.codecs import get_content_codec
+from trs_filer.ga4gh.trs.endpoints.files import (
+    delete_files,
+    store_files,
+)
 from trs_filer.ga4gh.trs.endpoints.register_tool_classes import (
     RegisterToolClass
 )
-from trs_filer.ga4gh.trs.endpoints.utils import (
-    generate_id,
-)
+from trs_filer.ga4gh.trs.endpoints.utils import compute_etag
 
 logger = logging.getLogger(__name__)
 
@@ -33,29 +45,26 @@ class RegisterTool:
         self,
         data: Dict,
         id: Optional[str] = None,
+        defer_content: bool = False,
     ) -> None:
         """Initialize tool data.
 
         Args:
             data: Tool metadata consistent with the `ToolVersion` schema.
             id: Tool identifier. Auto-generated if not provided.
+            defer_content: Whether retrieval of file contents from URLs is
+                left to a background job.
 
         Attributes:
             data: Tool metadata.
             replace: Whether it is allowed to replace an existing tool. Set
                 to `True` if an `id` is provided, else set to `False`.
-            id_charset: Allowed character set or expression evaluating to
-                allowed character set for generating object identifiers.
-            id_length: Length of generated object identifiers.
+            defer_content: Whether retrieval of file contents from URLs is
+                left to a background job.
+            ids: Settings for generating tool and tool class identifiers.
             meta_version_init: Initial value for tool meta version.
-            url_prefix: URL scheme of application. For constructing tool and
-                version `url` properties.
-            host_name: Name of application host. For constructing tool and
-                version `url` properties.
-            external_port: Port at which application is served. For
-                constructing tool and version `url` properties.
-            api_path: Base path at which API endpoints can be reached. For
-                constructing tool and version `url` properties.
+            tools_url: Base URL of tool objects. For constructing tool
+                `url` properties.
             tool_class_validation: Whether a tool is only allowed to be added
                 if it is associated with a pre-existing tool class; if `False`,
                 the tool class associated with the tool to be added is inserted
@@ -63,95 +72,106 @@ class RegisterTool:
             db_coll_tools: Database collection for storing tool objects.
             db_coll_classes: Database collection for storing tool class
                 objects.
+            db_coll_files: Database collection for storing file objects.
+            db_coll_blobs: Database collection for storing file contents.
+            db_coll_facets: Database collection for storing facet counts.
         """
-        conf = current_app.config.foca.custom
+        context = get_registration_context()
         self.data = data
         self.data['id'] = None if id is None else id
         self.replace = True
-        self.id_charset: str = conf.tool.id.charset
-        self.id_length = int(conf.tool.id.length)
-        self.meta_version_init = int(conf.tool.meta_version.init)
-        self.url_prefix = conf.service.url_prefix
-        self.host_name = conf.service.external_host
-        self.external_port = conf.service.external_port
-        self.api_path = conf.service.api_path
-        self.tool_class_validation = conf.toolclass.validation
-        self.db_coll_tools = (
-            current_app.config.foca.db.dbs['trsStore']
-            .collections['tools'].client
-        )
-        self.db_coll_classes = (
-            current_app.config.foca.db.dbs['trsStore']
-            .collections['toolclasses'].client
-        )
+        self.defer_content = defer_content
+        self.ids: IdSpec = context.tool_ids
+        self.meta_version_init: int = context.tool_meta_version_init
+        self.tools_url: str = context.tools_url
+        self.tool_class_validation: bool = context.tool_class_validation
+        self.db_coll_tools = context.db_coll_tools
+        self.db_coll_classes = context.db_coll_classes
+        self.db_coll_files = context.db_coll_files
+        self.db_coll_blobs = context.db_coll_blobs
+        self.db_coll_facets = context.db_coll_facets
 
     def process_metadata(self) -> None:
         """Process tool metadata."""
-        # evaluate character set expression or interpret literal string as set
-        try:
-            self.id_charset = eval(self.id_charset)
-        except Exception:
-            self.id_charset = ''.join(sorted(set(self.id_charset)))
         # init meta version
         self.data['meta_version'] = str(self.meta_version_init)
 
+    def build_document(self) -> Dict:
+        """Process tool and version metadata and build database document.
+
+        A tool identifier is generated unless one is set.
+
+        Returns:
+            Tool object to store in the database; version files are stored
+            separately.
+
+        Raises:
+            BadRequest: Tool or version metadata is invalid.
+        """
+        # set random ID unless ID is provided
+        if self.data['id'] is None:
+            self.replace = False
+            self.data['id'] = self.ids.generate()
+
+        # set self reference URL
+        self.data['url'] = f"{self.tools_url}/{self.data['id']}"
+
+        # set tool class identifier if not present
+        if self.data['toolclass'].get('id', None) is None:
+            self.data['toolclass']['id'] = self.ids.generate()
+
+        # process version information
+        version_list = [
+            v.get('id', None) for v in self.data['versions']
+            if v.get('id', None) is not None
+        ]
+        if len(version_list) != len(set(version_list)):
+            logger.error("Duplicate tool version IDs specified.")
+            raise BadRequest
+
+        for version in self.data['versions']:
+            version_proc = RegisterToolVersion(
+                id=self.data['id'],
+                version_id=version.get('id', None),
+                data=version,
+                defer_content=self.defer_content,
+            )
+            version_proc.process_metadata()
+            version = version_proc.data
+
+        # set entity tag
+        self.data['_etag'] = compute_etag(self.data)
+
+        # files are stored in a separate collection
+        return {
+            **self.data,
+            'versions': [
+                {k: v for k, v in version.items() if k != 'files'}
+                for version in self.data['versions']
+            ],
+        }
+
     def register_metadata(self) -> None:
         """Register tool."""
         self.process_metadata()
         # keep trying to generate unique ID
+        previous = None
         i = 0
         while i < 10:
             i += 1
-            # set random ID unless ID is provided
-            if self.data['id'] is None:
-                self.replace = False
-                self.data['id'] = generate_id(
-                    charset=self.id_charset,
-                    length=self.id_length
-                )
-
-            # set self reference URL
-            self.data['url'] = (
-                f"{self.url_prefix}://{self.host_name}:{self.external_port}/"
-                f"{self.api_path}/tools/{self.data['id']}"
-            )
-
-            # set tool class identifier if not present
-            tool_class_id = self.data['toolclass'].get('id', None)
-            if tool_class_id is None:
-                tool_class_id = generate_id(
-                    charset=self.id_charset,
-                    length=self.id_length
-                )
-                self.data['toolclass']['id'] = tool_class_id
-
-            # process version information
-            version_list = [
-                v.get('id', None) for v in self.data['versions']
-                if v.get('id', None) is not None
-            ]
-            if len(version_list) != len(set(version_list)):
-                logger.error("Duplicate tool version IDs specified.")
-                raise BadRequest
-
-            for version in self.data['versions']:
-                version_proc = RegisterToolVersion(
-                    id=self.data['id'],
-                    version_id=version.get('id', None),
-                    data=version,
-                )
-                version_proc.process_metadata()
-                version = version_proc.data
+            document = self.build_document()
 
             if self.replace:
-                # replace tool in database
-                result_tools = self.db_coll_tools.replace_one(
+                # replace tool in database, keeping facet values of previous
+                # tool
+                previous = self.db_coll_tools.find_one_and_replace(
                     filter={'id': self.data['id']},
-                    replacement=self.data,
+                    replacement=document,
+                    projection=PROJECTION_FACETS,
                 )
 
                 # verify replacement
-                if result_tools.modified_count:
+                if previous is not None:
                     logger.info(
                         f"Replaced tool with id '{self.data['id']}'."
                     )
@@ -159,8 +179,11 @@ class RegisterTool:
 
             # insert tool into database
             try:
-                self.db_coll_tools.insert_one(document=self.data)
+                self.db_coll_tools.insert_one(document=document)
             except DuplicateKeyError:
+                # generate new ID unless ID is provided
+                if not self.replace:
+                    self.data['id'] = None
                 continue
 
             # TODO: handle failures & race conditions for adding files & tool
@@ -168,9 +191,9 @@ class RegisterTool:
 
             # insert tool class into database
             if self.tool_class_validation:
-                data = self.db_coll_classes.find_one(
-                    filter={'id': self.data['toolclass']['id']},
-                    projection={'_id': False},
+                data = get_tool_class_catalogue().get(
+                    id=self.data['toolclass']['id'],
+                    validate=True,
                 )
                 if data is None:
                     raise BadRequest
@@ -184,11 +207,262 @@ class RegisterTool:
             break
         else:
             raise InternalServerError
+
+        update_facets(
+            db_coll_facets=self.db_coll_facets,
+            before=[previous],
+            after=[document],
+        )
+        self.register_files()
+        get_tool_cache().invalidate(self.data['id'])
         logger.debug(
             "Entry in 'tools' collection: "
             f"{self.db_coll_tools.find_one({'id': self.data['id']})}"
         )
 
+    def register_files(self) -> None:
+        """Store files of all versions, removing those of versions that are
+        no longer present.
+        """
+        for version in self.data['versions']:
+            store_files(
+                db_coll_files=self.db_coll_files,
+                db_coll_blobs=self.db_coll_blobs,
+                tool_id=self.data['id'],
+                version_id=version['id'],
+                files=version.get('files', []),
+                codec=get_content_codec(),
+            )
+        delete_files(
+            db_coll_files=self.db_coll_files,
+            db_coll_blobs=self.db_coll_blobs,
+            tool_id=self.data['id'],
+            keep_versions=[version['id'] for version in self.data['versions']],
+        )
+
+
+class RegisterTools:
+    """Class to register batches of tools with the service.
+
+    Tools are validated and processed individually, but written with a single
+    unordered bulk write; the associated tool classes are upserted with
+    another one.
+    """
+
+    def __init__(
+        self,
+        items: List[Dict],
+        defer_content: bool = False,
+    ) -> None:
+        """Initialize batch of tools.
+
+        Args:
+            items: Tools to register, each with tool metadata consistent with
+                the `ToolRegister` schema under `tool` and, optionally, a tool
+                identifier under `id`. Tools with an identifier replace any
+                existing tool with the same identifier; identifiers are
+                auto-generated for all other tools.
+            defer_content: Whether retrieval of file contents from URLs is
+                left to a background job.
+
+        Attributes:
+            items: Tools to register.
+            defer_content: Whether retrieval of file contents from URLs is
+                left to a background job.
+            max_attempts: Maximum number of attempts to write tools whose
+                generated identifiers clash with existing ones.
+            tool_class_validation: Whether a tool is only allowed to be added
+                if it is associated with a pre-existing tool class; if `False`,
+                the tool class associated with the tool to be added is inserted
+                into the tool class database collection on the fly.
+            results: Result for each tool, in the order of `items`; either
+                the `id` of the registered tool or an `error`.
+            db_coll_tools: Database collection for storing tool objects.
+            db_coll_classes: Database collection for storing tool class
+                objects.
+            db_coll_facets: Database collection for storing facet counts.
+        """
+        context = get_registration_context()
+        self.items = items
+        self.defer_content = defer_content
+        self.max_attempts = 10
+        self.tool_class_validation: bool = context.tool_class_validation
+        self.results: List[Dict] = [{} for __ in items]
+        self.db_coll_tools = context.db_coll_tools
+        self.db_coll_classes = context.db_coll_classes
+        self.db_coll_facets = context.db_coll_facets
+
+    def register_metadata(self) -> List[Dict]:
+        """Register tools.
+
+        Returns:
+            Result for each tool, in the order of `items`; either the `id` of
+            the registered tool or an `error`.
+        """
+        # validate and process tools
+        tools: Dict[int, RegisterTool] = {}
+        documents: Dict[int, Dict] = {}
+        ids = set()
+        for index, item in enumerate(self.items):
+            if item.get('id') is not None:
+                self.results[index]['id'] = item['id']
+                if item['id'] in ids:
+                    logger.error(f"Duplicate tool ID '{item['id']}' in batch.")
+                    self._fail(index, BadRequest)
+                    continue
+                ids.add(item['id'])
+            tool = RegisterTool(
+                data=item['tool'],
+                id=item.get('id'),
+                defer_content=self.defer_content,
+            )
+            tool.process_metadata()
+            try:
+                documents[index] = tool.build_document()
+            except BadRequest:
+                self._fail(index, BadRequest)
+                continue
+            tools[index] = tool
+
+        # validate tool classes against the catalogue
+        catalogue = get_tool_class_catalogue()
+        if self.tool_class_validation and tools:
+            catalogue.refresh(force=True)
+            for index in list(tools):
+                if catalogue.get(
+                    id=tools[index].data['toolclass']['id'],
+                ) is None:
+                    logger.error(
+                        "Unknown tool class "
+                        f"'{tools[index].data['toolclass']['id']}'."
+                    )
+                    self._fail(index, BadRequest)
+                    del tools[index]
+
+        # read facet values of tools to be replaced with a single query
+        previous = {
+            doc['id']: doc for doc in self.db_coll_tools.find(
+                filter={'id': {'$in': [
+                    tool.data['id'] for tool in tools.values()
+                    if tool.replace
+                ]}},
+                projection={**PROJECTION_FACETS, 'id': True},
+            )
+        } if any(tool.replace for tool in tools.values()) else {}
+
+        # write tools, regenerating clashing identifiers
+        written = self._write_tools(tools=tools, documents=documents)
+        update_facets(
+            db_coll_facets=self.db_coll_facets,
+            before=[
+                previous.get(tools[index].data['id']) for index in written
+                if tools[index].replace
+            ],
+            after=[documents[index] for index in written],
+        )
+
+        # upsert tool classes that are new or changed
+        tool_classes = {
+            tools[index].data['toolclass']['id']:
+            tools[index].data['toolclass']
+            for index in written
+        }
+        changed = {
+            class_id: tool_class
+            for class_id, tool_class in tool_classes.items()
+            if not catalogue.is_current(tool_class)
+        }
+        if changed:
+            self.db_coll_classes.bulk_write(
+                [
+                    ReplaceOne(
+                        filter={'id': class_id},
+                        replacement=tool_class,
+                        upsert=True,
+                    ) for class_id, tool_class in changed.items()
+                ],
+                ordered=False,
+            )
+            catalogue.invalidate()
+
+        # store files; new tools without files have none to store or remove
+        cache = get_tool_cache()
+        for index in written:
+            tool = tools[index]
+            if tool.replace or any(
+                version.get('files') for version in tool.data['versions']
+            ):
+                tool.register_files()
+            cache.invalidate(tool.data['id'])
+            self.results[index]['id'] = tool.data['id']
+        logger.info(
+            f"Registered {len(written)} of {len(self.items)} tools in batch."
+        )
+        return self.results
+
+    def _write_tools(
+        self,
+        tools: Dict[int, RegisterTool],
+        documents: Dict[int, Dict],
+    ) -> List[int]:
+        """Write tools with unordered bulk writes.
+
+        Tools with generated identifiers that clash with existing ones are
+        assigned new identifiers and written again.
+
+        Args:
+            tools: Processed tools, by item index.
+            documents: Database documents of tools, by item index.
+
+        Returns:
+            Indices of items whose tools were written.
+        """
+        written: List[int] = []
+        pending = sorted(tools)
+        attempts = 0
+        while pending and attempts < self.max_attempts:
+            attempts += 1
+            requests = [
+                ReplaceOne(
+                    filter={'id': tools[index].data['id']},
+                    replacement=documents[index],
+                    upsert=True,
+                ) if tools[index].replace
+                else InsertOne(documents[index])
+                for index in pending
+            ]
+            errors: Dict[int, Dict] = {}
+            try:
+                self.db_coll_tools.bulk_write(requests, ordered=False)
+            except BulkWriteError as exc:
+                errors = {
+                    error['index']: error
+                    for error in exc.details.get('writeErrors', [])
+                }
+            retry = []
+            for position, index in enumerate(pending):
+                error = errors.get(position)
+                if error is None:
+                    written.append(index)
+                elif error['code'] == 11000 and not tools[index].replace:
+                    tools[index].data['id'] = None
+                    documents[index] = tools[index].build_document()
+                    retry.append(index)
+                else:
+                    logger.error(
+                        f"Could not write tool '{tools[index].data['id']}': "
+                        f"{error.get('errmsg')}"
+                    )
+                    self._fail(index, InternalServerError)
+            pending = retry
+        for index in pending:
+            self._fail(index, InternalServerError)
+        return sorted(written)
+
+    def _fail(self, index: int, exception: Type[Exception]) -> None:
+        """Record error for item."""
+        self.results[index]['error'] = dict(exceptions[exception])
+
 
 class RegisterToolVersion:
     """Class to register a version with a tool object."""
@@ -204,12 +478,19 @@ class RegisterToolVersion:
         'Singularity',
         'Conda',
     ]
+    descriptor_file_types = frozenset([
+        'PRIMARY_DESCRIPTOR',
+        'SECONDARY_DESCRIPTOR',
+        'TEST_FILE',
+        'OTHER',
+    ])
 
     def __init__(
         self,
         data: Dict,
         id: str,
         version_id: str = None,
+        defer_content: bool = False,
     ) -> None:
         """Initialize tool version data.
 
@@ -218,74 +499,60 @@ class RegisterToolVersion:
                 schema.
             id: Tool identifer.
             version_id: Version identifier.
+            defer_content: Whether retrieval of file contents from URLs is
+                left to a background job.
 
         Attributes:
             data: Version metadata.
             id: Tool identifer.
             replace: Whether it is allowed to replace an existing version. Set
                 to `True` if a `version_id` is provided, else set to `False`.
-            id_charset: Allowed character set or expression evaluating to
-                allowed character set for generating version identifiers.
-            id_length: Length of generated version identifiers.
+            defer_content: Whether retrieval of file contents from URLs is
+                left to a background job.
+            ids: Settings for generating version identifiers.
             meta_version_init: Initial value for version meta version.
-            url_prefix: URL scheme of application. For constructing tool and
-                version `url` properties.
-            host_name: Name of application host. For constructing tool and
-                version `url` properties.
-            external_port: Port at which application is served. For
-                constructing tool and version `url` properties.
-            api_path: Base path at which API endpoints can be reached. For
-                constructing tool and version `url` properties.
+            tools_url: Base URL of tool objects. For constructing version
+                `url` properties.
             db_coll_tools: Database collection for storing tool objects.
+            db_coll_files: Database collection for storing file objects.
+            db_coll_blobs: Database collection for storing file contents.
+            db_coll_facets: Database collection for storing facet counts.
         """
-        conf = current_app.config.foca.custom
+        context = get_registration_context()
         self.data: Dict = data
         self.data['id'] = None if version_id is None else version_id
         self.id: str = id
         self.replace: bool = True
-        self.id_charset: str = conf.version.id.charset
-        self.id_length: int = int(conf.version.id.length)
-        self.meta_version_init: int = int(
-            conf.version.meta_version.init
-        )
-        self.url_prefix: str = conf.service.url_prefix
-        self.host_name: str = conf.service.external_host
-        self.external_port: int = conf.service.external_port
-        self.api_path: str = conf.service.api_path
-        self.db_coll_tools = (
-            current_app.config.foca.db.dbs['trsStore']
-            .collections['tools'].client
-        )
+        self.defer_content: bool = defer_content
+        self.ids: IdSpec = context.version_ids
+        self.meta_version_init: int = context.version_meta_version_init
+        self.tools_url: str = context.tools_url
+        self.db_coll_tools = context.db_coll_tools
+        self.db_coll_files = context.db_coll_files
+        self.db_coll_blobs = context.db_coll_blobs
+        self.db_coll_facets = context.db_coll_facets
 
     def process_metadata(self) -> None:
         """Process version metadata."""
-        # evaluate character set expression or interpret literal string as set
-        try:
-            self.id_charset = eval(self.id_charset)
-        except Exception:
-            self.id_charset = ''.join(sorted(set(self.id_charset)))
-
         # init meta version
         self.data['meta_version'] = str(self.meta_version_init)
 
         # set random ID unless ID is provided
         if self.data['id'] is None:
             self.replace = False
-            self.data['id'] = generate_id(
-                charset=self.id_charset,
-                length=self.id_length
-            )
+            self.data['id'] = self.ids.generate()
 
         # set self reference url
         self.data['url'] = (
-            f"{self.url_prefix}://{self.host_name}:{self.external_port}/"
-            f"{self.api_path}/tools/{self.id}/versions/"
-            f"{self.data['id']}"
+            f"{self.tools_url}/{self.id}/versions/{self.data['id']}"
         )
 
         # process files
         self.process_files()
 
+        # set entity tag
+        self.data['_etag'] = compute_etag(self.data)
+
     def process_files(self) -> None:
         """Process file (meta)data."""
 
@@ -351,36 +618,8 @@ class RegisterToolVersion:
                 )
                 raise BadRequest
 
-            # store contents accessible at url in database
-            # TODO: this needs more checks on the content
-            if (
-                'url' in _file['file_wrapper'] and
-                'content' not in _file['file_wrapper']
-            ):
-                _w = _file['file_wrapper']
-                try:
-                    _w['content'] = requests.get(_w['url']).text
-                except (
-                    requests.exceptions.ConnectionError,
-                    requests.exceptions.MissingSchema,
-                    socket.gaierror,
-                    urllib3.exceptions.NewConnectionError,
-                ):
-                    logger.error(
-                        "Could not retrieve content via the URL "
-                        f"'{_w['url']}' provided for file "
-                        f"'{_file['tool_file']['path']}'."
-                    )
-                    raise BadRequest
-
             # validate descriptor file types
-            descriptor_set = (
-                'PRIMARY_DESCRIPTOR',
-                'SECONDARY_DESCRIPTOR',
-                'TEST_FILE',
-                'OTHER',
-            )
-            if _file['tool_file']['file_type'] in descriptor_set:
+            if _file['tool_file']['file_type'] in self.descriptor_file_types:
                 if _file['type'] not in self.descriptor_types:
                     logger.error("Invalid descriptor type.")
                     raise BadRequest
@@ -391,6 +630,30 @@ class RegisterToolVersion:
                     logger.error("Missing or invalid image file type.")
                     raise BadRequest
 
+        # store contents accessible at url in database
+        # TODO: this needs more checks on the content
+        wrappers = [
+            _file['file_wrapper'] for _file in self.data.get('files', [])
+            if (
+                not self.defer_content and
+                'url' in _file['file_wrapper'] and
+                'content' not in _file['file_wrapper']
+            )
+        ]
+        try:
+            contents = get_file_fetcher().fetch_all(
+                urls=[_w['url'] for _w in wrappers],
+            )
+        except FetchError as exc:
+            logger.error(exc)
+            raise BadRequest
+        for _w in wrappers:
+            _w['content'] = contents[_w['url']]
+
+        # set entity tags
+        for _file in self.data.get('files', []):
+            _file['_etag'] = compute_etag(_file)
+
     def register_metadata(self) -> None:
         """Register version with tool."""
         # check if tool is available
@@ -403,6 +666,16 @@ class RegisterToolVersion:
         while i < 10:
             i += 1
             self.process_metadata()
+
+            # derive new tool entity tag from previous one
+            tool_etag = compute_etag({
+                'tool': obj.get('_etag'),
+                'version': self.data['_etag'],
+            })
+
+            # files are stored in a separate collection
+            version = {k: v for k, v in self.data.items() if k != 'files'}
+
             if self.replace:
 
                 # replace tool version in database
@@ -413,7 +686,8 @@ class RegisterToolVersion:
                     },
                     update={
                         '$set': {
-                            'versions.$': self.data,
+                            'versions.$': version,
+                            '_etag': tool_etag,
                         },
                     },
                 )
@@ -434,7 +708,10 @@ class RegisterToolVersion:
                 },
                 update={
                     '$push': {
-                        'versions': self.data,
+                        'versions': version,
+                    },
+                    '$set': {
+                        '_etag': tool_etag,
                     },
                 },
             )
@@ -446,8 +723,32 @@ class RegisterToolVersion:
                     f"'{self.id}'."
                 )
                 break
+
+            # generate new ID unless ID is provided
+            if not self.replace:
+                self.data['id'] = None
         else:
             raise InternalServerError
+        update_facets(
+            db_coll_facets=self.db_coll_facets,
+            before=[obj],
+            after=[{
+                **obj,
+                'versions': [
+                    _version for _version in obj.get('versions', [])
+                    if _version.get('id') != version['id']
+                ] + [version],
+            }],
+        )
+        store_files(
+            db_coll_files=self.db_coll_files,
+            db_coll_blobs=self.db_coll_blobs,
+            tool_id=self.id,
+            version_id=self.data['id'],
+            files=self.data.get('files', []),
+            codec=get_content_codec(),
+        )
+        get_tool_cache().invalidate(self.id)
         logger.debug(
             "Entry in 'tools' collection: "
             f"{self.db_coll_tools.find_one({'id': self.data['id']})}"
@@ -1,17 +1,17 @@
 """Controller for registering new objects."""
 
 import logging
-import string  # noqa: F401
 from typing import (Dict, Optional)
 
-from flask import current_app
 from pymongo.errors import DuplicateKeyError
 
 from trs_filer.errors.exceptions import (
     InternalServerError,
 )
-from trs_filer.ga4gh.trs.endpoints.utils import (
-    generate_id,
+from trs_filer.ga4gh.trs.endpoints.catalogue import get_tool_class_catalogue
+from trs_filer.ga4gh.trs.endpoints.context import (
+    get_registration_context,
+    IdSpec,
 )
 
 logger = logging.getLogger(__name__)
@@ -35,50 +35,23 @@ class RegisterToolClass:
             data: Tool metadata.
             replace: Whether it is allowed to replace an existing tool. Set
                 to `True` if an `id` is provided, else set to `False`.
-            id_charset: Allowed character set or expression evaluating to
-                allowed character set for generating object identifiers.
-            id_length: Length of generated object identifiers.
-            meta_version_init: Initial value for tool meta version.
-            url_prefix: URL scheme of application. For constructing tool and
-                version `url` properties.
-            host_name: Name of application host. For constructing tool and
-                version `url` properties.
-            external_port: Port at which application is served. For
-                constructing tool and version `url` properties.
-            api_path: Base path at which API endpoints can be reached. For
-                constructing tool and version `url` properties.
-            tool_class_validation: Whether a tool is only allowed to be added
-                if it is associated with a pre-existing tool class; if `False`,
-                the tool class associated with the tool to be added is inserted
-                into the tool class database collection on the fly.
-            db_coll_tools: Database collection for storing tool objects.
-            db_coll_files: Database collection for storing file objects.
+            ids: Settings for generating tool class identifiers.
             db_coll_classes: Database collection for storing tool class
                 objects.
         """
-        conf = current_app.config.foca.custom
+        context = get_registration_context()
         self.data = data
         self.data['id'] = None if id is None else id
         self.replace = True
-        self.id_charset = conf.tool.id.charset
-        self.id_length = int(conf.tool.id.length)
-        self.meta_version_init = int(conf.tool.meta_version.init)
-        self.url_prefix = conf.service.url_prefix
-        self.host_name = conf.service.external_host
-        self.external_port = conf.service.external_port
-        self.api_path = conf.service.api_path
-        self.db_coll_classes = (
-            current_app.config.foca.db.dbs['trsStore']
-            .collections['toolclasses'].client
-        )
+        self.ids: IdSpec = context.tool_ids
+        self.db_coll_classes = context.db_coll_classes
 
     def process_metadata(self) -> None:
-        """Process tool class metadata."""
-        # evaluate character set expression or interpret literal string as set
-        try:
-            self.id_charset = eval(self.id_charset)
-        except Exception:
-            self.id_charset = ''.join(sorted(set(self.id_charset)))
+        """Process tool class metadata.
+
+        Nothing needs to be processed, as identifier settings are compiled
+        into the registration context.
+        """
 
     def register_metadata(self) -> None:
         """Register toolClass with TRS.
@@ -88,6 +61,14 @@ class RegisterToolClass:
         """
         self.process_metadata()
 
+        # skip writes that would not change anything
+        catalogue = get_tool_class_catalogue()
+        if self.data['id'] is not None and catalogue.is_current(self.data):
+            logger.debug(
+                f"Tool class with id '{self.data['id']}' is unchanged."
+            )
+            return
+
         # set unique ID, dependent values and register object
         i = 0
         while i < 10:
@@ -95,10 +76,7 @@ class RegisterToolClass:
             # set random ID unless ID is provided
             if self.data['id'] is None:
                 self.replace = False
-                self.data['id'] = generate_id(
-                    charset=self.id_charset,
-                    length=self.id_length
-                )
+                self.data['id'] = self.ids.generate()
 
             if self.replace:
                 # replace tool class in database
@@ -117,12 +95,18 @@ class RegisterToolClass:
             try:
                 self.db_coll_classes.insert_one(document=self.data)
             except DuplicateKeyError:
+                # generate new ID unless ID is provided; drop the object ID
+                # set by the failed insert
+                self.data.pop('_id', None)
+                if not self.replace:
+                    self.data['id'] = None
                 continue
 
             logger.info(f"Added tool class with id '{self.data['id']}'.")
             break
         else:
             raise InternalServerError
+        catalogue.invalidate()
         logger.debug(
             "Entry in 'toolclasses' collection: "
             f"{self.db_coll_classes.find_one({'id': self.data['id']})}"
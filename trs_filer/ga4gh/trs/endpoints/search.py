@@ -0,0 +1,99 @@
+"""Full-text search over tool metadata."""
+
+from base64 import (urlsafe_b64decode, urlsafe_b64encode)
+import binascii
+import struct
+from typing import (Dict, List, Optional, Tuple)
+
+from bson import ObjectId
+
+# field holding the relevance score of a search result; removed before
+# results are returned
+SCORE_FIELD = '_score'
+
+_SCORE_FORMAT = '>d'
+_SCORE_SIZE = struct.calcsize(_SCORE_FORMAT)
+
+
+def compile_search_pipeline(
+    q: str,
+    filt: Optional[Dict] = None,
+    limit: int = 1000,
+    after: Optional[Tuple[float, ObjectId]] = None,
+    projection: Optional[Dict] = None,
+) -> List[Dict]:
+    """Compile aggregation pipeline for searching tools by relevance.
+
+    Tools are matched against the text index of the tools collection and
+    ranked by decreasing relevance score, with ties broken by ascending object
+    ID, so that pages are stable and can be resumed with a cursor.
+
+    Args:
+        q: Search terms, in MongoDB text search syntax; phrases are enclosed
+            in double quotes and terms prefixed with a minus sign are
+            excluded.
+        filt: Additional database query, e.g., as compiled from `GET /tools`
+            filter parameters.
+        limit: Maximum number of results.
+        after: Relevance score and object ID of the last result of the
+            previous page.
+        projection: Fields to exclude from results.
+
+    Returns:
+        Aggregation pipeline yielding tools with their object ID and relevance
+        score in field `SCORE_FIELD`.
+    """
+    # `$text` is only allowed in the first stage
+    pipeline: List[Dict] = [
+        {'$match': {'$text': {'$search': q}, **(filt or {})}},
+        {'$addFields': {SCORE_FIELD: {'$meta': 'textScore'}}},
+    ]
+    if after is not None:
+        score, object_id = after
+        pipeline.append({'$match': {'$or': [
+            {SCORE_FIELD: {'$lt': score}},
+            {SCORE_FIELD: score, '_id': {'$gt': object_id}},
+        ]}})
+    pipeline.append({'$sort': {SCORE_FIELD: -1, '_id': 1}})
+    pipeline.append({'$limit': limit})
+    if projection:
+        pipeline.append({'$project': projection})
+    return pipeline
+
+
+def encode_search_cursor(score: float, object_id: ObjectId) -> str:
+    """Encode position in search results as opaque pagination cursor.
+
+    Args:
+        score: Relevance score of the last result served.
+        object_id: Database object identifier of the last result served.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    return urlsafe_b64encode(
+        struct.pack(_SCORE_FORMAT, score) + object_id.binary
+    ).decode('ascii')
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, ObjectId]:
+    """Decode opaque pagination cursor into position in search results.
+
+    Args:
+        cursor: Cursor string as returned by `encode_search_cursor()`.
+
+    Returns:
+        Relevance score and database object identifier of the last result
+        served.
+
+    Raises:
+        ValueError: Cursor is malformed.
+    """
+    try:
+        data = urlsafe_b64decode(cursor.encode('ascii'))
+    except (binascii.Error, UnicodeEncodeError) as exc:
+        raise ValueError(f"invalid cursor: '{cursor}'") from exc
+    if len(data) != _SCORE_SIZE + 12:
+        raise ValueError(f"invalid cursor: '{cursor}'")
+    score, = struct.unpack(_SCORE_FORMAT, data[:_SCORE_SIZE])
+    return score, ObjectId(data[_SCORE_SIZE:])
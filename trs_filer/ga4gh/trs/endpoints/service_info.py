@@ -1,17 +1,24 @@
 """Controller for service info endpoint."""
 
 import logging
-from typing import Dict
+from threading import Lock
+import time
+from typing import (Dict, Optional, Tuple)
 
 from flask import current_app
+from pymongo.collection import Collection
 
+from trs_filer.custom_config import ServiceInfoCacheConfig
 from trs_filer.errors.exceptions import (
     NotFound,
     ValidationError,
 )
+from trs_filer.ga4gh.trs.endpoints.utils import compute_etag
 
 logger = logging.getLogger(__name__)
 
+EXTENSION_KEY = 'trs_filer.service_info_cache'
+
 
 class RegisterServiceInfo:
     """Tool class for registering service info.
@@ -119,6 +126,7 @@ class RegisterServiceInfo:
             replacement=data,
             upsert=True,
         )
+        get_service_info_cache().invalidate()
 
     def _get_headers(self) -> Dict:
         """Build dictionary of response headers.
@@ -134,3 +142,97 @@ class RegisterServiceInfo:
             f"{self.api_path}/service-info"
         )
         return headers
+
+
+class ServiceInfoCache:
+    """Thread-safe, in-memory copy of the latest service info, serialized
+    for responses.
+    """
+
+    def __init__(
+        self,
+        db_coll_info: Collection,
+        ttl: float = 5,
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            db_coll_info: Database collection storing service info objects.
+            ttl: Time (in seconds) after which the service info is read from
+                the database again. Set to `0` to disable caching.
+
+        Attributes:
+            db_coll_info: Database collection storing service info objects.
+            ttl: Time (in seconds) after which the service info is read from
+                the database again.
+            loads: Number of times the service info was read from the
+                database.
+        """
+        self.db_coll_info = db_coll_info
+        self.ttl = ttl
+        self.loads: int = 0
+        self._entry: Optional[Tuple[bytes, str]] = None
+        self._expires: float = float('-inf')
+        self._lock = Lock()
+
+    def get(self) -> Tuple[bytes, str]:
+        """Get latest service info.
+
+        Returns:
+            Service info serialized as JSON, and its entity tag.
+
+        Raises:
+            trs_filer.errors.exceptions.NotFound: No service info available.
+        """
+        with self._lock:
+            if self._entry is not None and time.monotonic() < self._expires:
+                return self._entry
+        try:
+            data = self.db_coll_info.find(
+                {},
+                {'_id': False}
+            ).sort([('_id', -1)]).limit(1).next()
+        except StopIteration:
+            raise NotFound
+        entry = (
+            current_app.json.dumps(data).encode('utf-8'),
+            compute_etag(data),
+        )
+        with self._lock:
+            self.loads += 1
+            if self.ttl > 0:
+                self._entry = entry
+                self._expires = time.monotonic() + self.ttl
+        return entry
+
+    def invalidate(self) -> None:
+        """Read service info from the database on next use."""
+        with self._lock:
+            self._entry = None
+            self._expires = float('-inf')
+
+
+def get_service_info_cache() -> ServiceInfoCache:
+    """Get service info cache of the current app.
+
+    The cache is created on first use, from the `service_info_cache` section
+    of the custom app configuration, if available.
+
+    Returns:
+        Service info cache.
+    """
+    cache = current_app.extensions.get(EXTENSION_KEY)
+    if cache is None:
+        conf = getattr(current_app.config.foca, 'custom', None)
+        cache_conf = getattr(
+            conf, 'service_info_cache', ServiceInfoCacheConfig()
+        )
+        cache = current_app.extensions.setdefault(
+            EXTENSION_KEY,
+            ServiceInfoCache(
+                db_coll_info=current_app.config.foca.db.dbs['trsStore']
+                .collections['service_info'].client,
+                ttl=cache_conf.ttl,
+            ),
+        )
+    return cache
@@ -0,0 +1,56 @@
+"""Incremental serialization of database records."""
+
+import json
+from typing import (Dict, Iterable, Iterator)
+
+from trs_filer.ga4gh.trs.endpoints.utils import iter_batches
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def stream_ndjson(
+    records: Iterable[Dict],
+    batch_size: int = 100,
+) -> Iterator[bytes]:
+    """Serialize records as newline-delimited JSON, one batch at a time.
+
+    Only a single batch of records is held in memory at any time.
+
+    Args:
+        records: Records to serialize, e.g., a database cursor.
+        batch_size: Number of records serialized per chunk.
+
+    Yields:
+        Consecutive chunks of the serialized records, each record on a
+        separate line.
+    """
+    for batch in iter_batches(items=records, batch_size=batch_size):
+        yield ''.join(
+            f"{json.dumps(record)}\n" for record in batch
+        ).encode('utf-8')
+
+
+def stream_json_array(
+    records: Iterable[Dict],
+    batch_size: int = 100,
+) -> Iterator[bytes]:
+    """Serialize records as JSON array, one batch at a time.
+
+    Only a single batch of records is held in memory at any time.
+
+    Args:
+        records: Records to serialize, e.g., a database cursor.
+        batch_size: Number of records serialized per chunk.
+
+    Yields:
+        Consecutive chunks of the serialized array.
+    """
+    separator = '['
+    for batch in iter_batches(items=records, batch_size=batch_size):
+        parts = []
+        for record in batch:
+            parts.append(separator)
+            parts.append(json.dumps(record))
+            separator = ','
+        yield ''.join(parts).encode('utf-8')
+    yield b'[]' if separator == '[' else b']'
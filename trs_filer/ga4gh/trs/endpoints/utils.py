@@ -1,21 +1,239 @@
 """Utility functions for endpoint controllers."""
 
+from base64 import (urlsafe_b64decode, urlsafe_b64encode)
+import binascii
+from hashlib import sha256
+from itertools import islice
+import json
+import os
 from random import choice
+import secrets
 import string
+from threading import Lock
+import time
+from typing import (Any, Dict, Iterable, Iterator, List, Optional)
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from flask import (
+    after_this_request,
+    has_request_context,
+    request,
+    Response,
+)
+
+
+# Crockford's base32 alphabet, in ASCII order, so that ULIDs sort by time
+ULID_CHARSET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+ULID_LENGTH = 26
+
+_ULID_RANDOM_BITS = 80
+
+
+class UlidGenerator:
+    """Thread-safe generator of monotonic ULIDs.
+
+    ULIDs consist of a 48-bit timestamp in milliseconds and 80 random bits,
+    encoded as 26 characters of `ULID_CHARSET`. Within the same millisecond,
+    the random part of the previous ULID is incremented, so that ULIDs
+    generated by a process are strictly increasing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize generator."""
+        self._time: int = -1
+        self._random: int = 0
+        self._lock = Lock()
+
+    def __call__(self) -> str:
+        """Generate ULID.
+
+        Returns:
+            ULID string.
+        """
+        with self._lock:
+            now = time.time_ns() // 1000000
+            if now > self._time:
+                self._time = now
+                self._random = secrets.randbits(_ULID_RANDOM_BITS)
+            else:
+                # same millisecond or clock set back
+                self._random += 1
+                if self._random >> _ULID_RANDOM_BITS:
+                    self._time += 1
+                    self._random = secrets.randbits(_ULID_RANDOM_BITS)
+            value = self._time << _ULID_RANDOM_BITS | self._random
+        chars = []
+        for __ in range(ULID_LENGTH):
+            value, index = divmod(value, len(ULID_CHARSET))
+            chars.append(ULID_CHARSET[index])
+        return ''.join(reversed(chars))
+
+    def reset(self) -> None:
+        """Discard state, e.g., in forked worker processes, so that they do
+        not continue the sequence of their parent.
+        """
+        self._time = -1
+        self._random = 0
+        self._lock = Lock()
+
+
+generate_ulid = UlidGenerator()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=generate_ulid.reset)
 
 
 def generate_id(
     charset: str = ''.join([string.ascii_letters, string.digits]),
     length: int = 6,
+    strategy: str = 'random',
 ) -> str:
-    """Generate random string based on allowed set of characters.
+    """Generate identifier.
 
     Args:
-        charset: String of allowed characters.
-        length: Length of returned string.
+        charset: String of allowed characters; only used by the `random`
+            strategy.
+        length: Length of returned string; only used by the `random`
+            strategy.
+        strategy: Either `random`, for random strings of the allowed
+            characters, or `ulid`, for time-ordered ULIDs that do not collide
+            and are inserted at the end of database indexes.
 
     Returns:
         Random string of specified length and composed of defined set of
-        allowed characters.
+        allowed characters, or ULID.
     """
+    if strategy == 'ulid':
+        return generate_ulid()
     return ''.join(choice(charset) for __ in range(length))
+
+
+def iter_batches(
+    items: Iterable[Any],
+    batch_size: int,
+) -> Iterator[List[Any]]:
+    """Group items into lists of at most a given size.
+
+    Args:
+        items: Items to group, e.g., a database cursor.
+        batch_size: Maximum number of items per list.
+
+    Yields:
+        Consecutive lists of items.
+    """
+    items = iter(items)
+    while True:
+        batch = list(islice(items, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def encode_cursor(object_id: ObjectId) -> str:
+    """Encode database object identifier as opaque pagination cursor.
+
+    Args:
+        object_id: Database object identifier of the last record served.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    return urlsafe_b64encode(object_id.binary).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    """Decode opaque pagination cursor into database object identifier.
+
+    Args:
+        cursor: Cursor string as returned by `encode_cursor()`.
+
+    Returns:
+        Database object identifier of the last record served.
+
+    Raises:
+        ValueError: Cursor is malformed.
+    """
+    try:
+        return ObjectId(urlsafe_b64decode(cursor.encode('ascii')))
+    except (binascii.Error, InvalidId, TypeError, UnicodeEncodeError) as exc:
+        raise ValueError(f"invalid cursor: '{cursor}'") from exc
+
+
+def compute_etag(data: Dict) -> str:
+    """Compute strong entity tag for an object.
+
+    Args:
+        data: Object to compute entity tag for. Top-level keys starting with
+            an underscore (e.g., `_id` or `_etag`) are ignored.
+
+    Returns:
+        Hex digest of the SHA-256 hash of the object's canonical JSON
+        representation.
+    """
+    payload = {
+        key: value for key, value in data.items() if not key.startswith('_')
+    }
+    return sha256(
+        json.dumps(
+            payload,
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str,
+        ).encode('utf-8')
+    ).hexdigest()
+
+
+def get_if_none_match() -> List[str]:
+    """Get entity tags listed in `If-None-Match` header of current request.
+
+    Returns:
+        Entity tags, if any.
+    """
+    if not has_request_context():
+        return []
+    return sorted(request.if_none_match.as_set(include_weak=True))
+
+
+def is_not_modified(etag: Optional[str]) -> bool:
+    """Check whether current request is conditional on an entity tag that is
+    still current.
+
+    Args:
+        etag: Current entity tag of the requested resource.
+
+    Returns:
+        `True` if `If-None-Match` header matches the entity tag.
+    """
+    if etag is None or not has_request_context():
+        return False
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified(etag: str) -> Response:
+    """Build `304 Not Modified` response.
+
+    Args:
+        etag: Current entity tag of the requested resource.
+
+    Returns:
+        Response without body.
+    """
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def set_etag(etag: Optional[str]) -> None:
+    """Add `ETag` header to successful response of current request.
+
+    Args:
+        etag: Current entity tag of the requested resource.
+    """
+    if etag is None or not has_request_context():
+        return
+
+    @after_this_request
+    def _set_etag(response: Response) -> Response:
+        if response.status_code == 200:
+            response.set_etag(etag)
+        return response
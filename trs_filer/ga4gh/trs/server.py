@@ -1,75 +1,158 @@
 """"Controllers for TRS endpoints."""
 
 import logging
-from typing import (Optional, Dict, List, Tuple)
-from urllib.parse import unquote
+from typing import (Callable, Optional, Dict, List, Tuple, Union)
+from urllib.parse import (quote, unquote)
 
-from flask import (request, current_app)
+from bson import ObjectId
+from flask import (request, current_app, Response, send_file)
 from foca.utils.logging import log_traffic
+from pymongo.errors import OperationFailure
 
 from trs_filer.errors.exceptions import (
     BadRequest,
+    exceptions,
     InternalServerError,
     NotFound,
 )
+from trs_filer.ga4gh.trs.endpoints.archives import (
+    get_archive_cache,
+    stream_zip,
+)
+from trs_filer.ga4gh.trs.endpoints.cache import get_tool_cache
+from trs_filer.ga4gh.trs.endpoints.catalogue import get_tool_class_catalogue
+from trs_filer.ga4gh.trs.endpoints.codecs import get_content_codec
+from trs_filer.ga4gh.trs.endpoints.facets import (
+    count_facets,
+    get_facets,
+    PROJECTION_FACETS,
+    update_facets,
+)
+from trs_filer.ga4gh.trs.endpoints.files import (
+    delete_files,
+    migrate_files,
+    resolve_contents,
+)
+from trs_filer.ga4gh.trs.endpoints.filters import compile_tools_filter
+from trs_filer.ga4gh.trs.endpoints.jobs import (
+    get_job,
+    submit_job,
+)
 from trs_filer.ga4gh.trs.endpoints.register_objects import (
     RegisterTool,
+    RegisterTools,
     RegisterToolVersion,
 )
 from trs_filer.ga4gh.trs.endpoints.register_tool_classes import (
     RegisterToolClass
 )
+from trs_filer.ga4gh.trs.endpoints.search import (
+    compile_search_pipeline,
+    decode_search_cursor,
+    encode_search_cursor,
+    SCORE_FIELD,
+)
 from trs_filer.ga4gh.trs.endpoints.service_info import (
+    get_service_info_cache,
     RegisterServiceInfo,
 )
+from trs_filer.ga4gh.trs.endpoints.streams import (
+    NDJSON_MIMETYPE,
+    stream_json_array,
+    stream_ndjson,
+)
+from trs_filer.ga4gh.trs.endpoints.utils import (
+    compute_etag,
+    decode_cursor,
+    encode_cursor,
+    get_if_none_match,
+    is_not_modified,
+    not_modified,
+    set_etag,
+)
+from trs_filer.migrations import is_pending
 
 logger = logging.getLogger(__name__)
 
+# tool lists and representations do not include version files; exclude them
+# when reading from the database
+PROJECTION_TOOLS = {
+    'versions.files': False,
+    'versions._etag': False,
+}
+
+# number of tools read from the database and serialized at a time when
+# streaming tool lists
+STREAM_BATCH_SIZE = 100
+
+# descriptor types accepted in descriptor routes, e.g., `PLAIN_CWL` or `CWL`
+VALID_DESCRIPTOR_TYPES = [
+    *(f"PLAIN_{t}" for t in RegisterToolVersion.descriptor_types),
+    *RegisterToolVersion.descriptor_types,
+]
+
 
 @log_traffic
 def toolsIdGet(
     id: str
-) -> Dict:
+) -> Union[Dict, Response]:
     """List one specific tool, acts as an anchor for self references.
 
     Args:
         id: Tool identifier.
 
     Returns:
-        Tool object dict corresponding given tool id.
+        Tool object dict corresponding given tool id, or an empty
+        `304 Not Modified` response if the entity tag in the request's
+        `If-None-Match` header is current.
 
     Raise:
         NotFound if no object mapping with given id present.
     """
-    db_coll_tools = (
-        current_app.config.foca.db.dbs['trsStore']
-        .collections['tools'].client
-    )
-    obj = db_coll_tools.find_one({"id": id})
+    cache = get_tool_cache()
+    obj = cache.get((id, None))
     if obj is None:
-        raise NotFound
-    del obj["_id"]
-
-    if "versions" in obj:
-        for _version in obj["versions"]:
-            if "files" in _version:
-                del _version["files"]
+        db_coll_tools = (
+            current_app.config.foca.db.dbs['trsStore']
+            .collections['tools'].client
+        )
+        response = _check_not_modified(
+            db_coll=db_coll_tools,
+            filter=lambda etag: {'id': id, '_etag': etag},
+        )
+        if response is not None:
+            return response
+        obj = db_coll_tools.find_one(
+            filter={"id": id},
+            projection={**PROJECTION_TOOLS, '_id': False},
+        )
+        if obj is None:
+            raise NotFound
+        cache.set((id, None), obj)
+    etag = obj.pop('_etag', None)
+    if is_not_modified(etag):
+        return not_modified(etag)
+    set_etag(etag)
     return obj
 
 
 @log_traffic
 def toolsIdVersionsGet(
     id: str
-) -> List[Dict]:
+) -> Union[List[Dict], Response]:
     """List versions of a tool.
 
     Args:
         id: Tool identifier.
 
     Returns:
-        List of version dicts corresponding given tool id.
+        List of version dicts corresponding given tool id, or an empty
+        `304 Not Modified` response if the entity tag of the tool in the
+        request's `If-None-Match` header is current.
     """
     obj = toolsIdGet.__wrapped__(id)
+    if isinstance(obj, Response):
+        return obj
     return obj["versions"]
 
 
@@ -77,7 +160,7 @@ def toolsIdVersionsGet(
 def toolsIdVersionsVersionIdGet(
     id: str,
     version_id: str,
-) -> Dict:
+) -> Union[Dict, Response]:
     """
     List one specific tool version, acts as an anchor for self references.
 
@@ -86,35 +169,131 @@ def toolsIdVersionsVersionIdGet(
         version_id: Tool version identifier.
 
     Returns:
-        Specific version dict of the given tool.
+        Specific version dict of the given tool, or an empty
+        `304 Not Modified` response if the entity tag in the request's
+        `If-None-Match` header is current.
 
     Raises:
         NotFound if no tool object present for give id mapping. Also, if
         version with given id not found.
     """
-    db_coll_tools = (
-        current_app.config.foca.db.dbs['trsStore']
-        .collections['tools'].client
-    )
-    proj = {
-        '_id': False,
-        'versions': {
-            '$elemMatch': {
-                'id': version_id,
+    cache = get_tool_cache()
+    version = cache.get((id, version_id))
+    if version is None:
+        db_coll_tools = (
+            current_app.config.foca.db.dbs['trsStore']
+            .collections['tools'].client
+        )
+        response = _check_not_modified(
+            db_coll=db_coll_tools,
+            filter=lambda etag: _filter_version(id, version_id, etag=etag),
+        )
+        if response is not None:
+            return response
+        proj = {
+            '_id': False,
+            'versions': {
+                '$elemMatch': {
+                    'id': version_id,
+                },
             },
-        },
-    }
-    data = db_coll_tools.find_one(
-        filter={'id': id},
-        projection=proj,
-    )
-    try:
-        version = data['versions'][0]
-        if version and 'files' in version:
-            del version['files']
-        return version
-    except (KeyError, TypeError):
-        raise NotFound
+        }
+        data = db_coll_tools.find_one(
+            filter={'id': id},
+            projection=proj,
+        )
+        try:
+            version = data['versions'][0]
+            if version and 'files' in version:
+                del version['files']
+        except (KeyError, TypeError):
+            raise NotFound
+        cache.set((id, version_id), version)
+    etag = version.pop('_etag', None)
+    if is_not_modified(etag):
+        return not_modified(etag)
+    set_etag(etag)
+    return version
+
+
+@log_traffic
+def toolsBatchGet(
+    batch: Dict,
+) -> Dict:
+    """Get multiple tools and tool versions.
+
+    Items are looked up in the tool cache first; all remaining tools are
+    retrieved with a single database query.
+
+    Args:
+        batch: Request body, with a list of items, each identifying a tool by
+            its `id` or a tool version by its `id` and `version_id`.
+
+    Returns:
+        Response body, with a result for each requested item, in the order
+        requested. Each result holds the requested `tool` or `version`, as
+        returned by `toolsIdGet` and `toolsIdVersionsVersionIdGet`,
+        respectively, or an `error` if the item was not found.
+    """
+    cache = get_tool_cache()
+    objs: Dict[Tuple[str, Optional[str]], Optional[Dict]] = {}
+    missing: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+    for item in batch['items']:
+        key = (item['id'], item.get('version_id'))
+        if key in objs:
+            continue
+        objs[key] = cache.get(key)
+        if objs[key] is None:
+            missing.setdefault(key[0], []).append(key)
+
+    if missing:
+        db_coll_tools = (
+            current_app.config.foca.db.dbs['trsStore']
+            .collections['tools'].client
+        )
+        for data in db_coll_tools.find(
+            filter={'id': {'$in': list(missing)}},
+            projection={'_id': False, 'versions.files': False},
+        ):
+            versions = data.get('versions', [])
+            # tools are cached without version entity tags, cf.
+            # `PROJECTION_TOOLS`
+            tool = {
+                **data,
+                'versions': [
+                    {
+                        key: value for key, value in version.items()
+                        if key != '_etag'
+                    } for version in versions
+                ],
+            }
+            for key in missing.get(data['id'], []):
+                if key[1] is None:
+                    obj = tool
+                else:
+                    obj = next(
+                        (v for v in versions if v.get('id') == key[1]),
+                        None,
+                    )
+                if obj is not None:
+                    cache.set(key, obj)
+                    objs[key] = obj
+
+    results = []
+    for item in batch['items']:
+        key = (item['id'], item.get('version_id'))
+        result: Dict = {'id': key[0]}
+        if key[1] is not None:
+            result['version_id'] = key[1]
+        obj = objs[key]
+        if obj is None:
+            result['error'] = dict(exceptions[NotFound])
+        else:
+            result['tool' if key[1] is None else 'version'] = {
+                k: v for k, v in obj.items() if k != '_etag'
+            }
+        results.append(result)
+    return {'items': results}
 
 
 @log_traffic
@@ -132,12 +311,18 @@ def toolsGet(
     checker: Optional[bool] = None,
     limit: Optional[int] = 1000,  # default as per specs
     offset: Optional[str] = None,
-) -> Tuple[List, str, Dict]:
+    cursor: Optional[str] = None,
+    stream: Optional[bool] = False,
+) -> Union[Tuple[List, str, Dict], Response]:
     """List all tools.
 
     Filter parameters to subset the tools list can be specified. Filter
     parameters are additive.
 
+    Records are streamed from the database one batch at a time, rather than
+    loaded at once, if the client accepts newline-delimited JSON
+    (`application/x-ndjson`) or asks for a streamed JSON array.
+
     Args:
         id: Return only entries with the given identifier.
         alias: Return only entries with the given alias.
@@ -152,68 +337,36 @@ def toolsGet(
         checker: Return only checker workflows.
         limit: Number of records when paginating results.
         offset: Start index when paginating results.
+        cursor: Opaque cursor pointing to the last record of the previous
+            page when paginating results; an empty string starts at the
+            first record. Takes precedence over `offset`.
+        stream: Whether to stream the JSON array of tools.
 
     Returns:
-        List of all tools consistent with all filters, if specified.
+        List of all tools consistent with all filters, if specified, or a
+        response streaming them.
+
+    Raises:
+        BadRequest if the cursor is malformed.
     """
     # set filters
-    filt = {}
-    if id is not None:
-        filt['id'] = id
-    if alias is not None:
-        filt['aliases'] = {
-            '$in': [alias],
-        }
-    if toolClass is not None:
-        filt['toolclass.name'] = toolClass
-    if descriptorType:
-        filt['versions'] = {
-            '$elemMatch': {
-                'descriptor_type': {
-                    '$in': [descriptorType],
-                },
-            },
-        }
-    if registry is not None:
-        filt['versions'] = {
-            '$elemMatch': {
-                'images': {
-                    '$elemMatch': {
-                        'registry_host': registry,
-                    },
-                },
-            },
-        }
-    if organization is not None:
-        filt['organization'] = organization
-    if name is not None:
-        filt['versions'] = {
-            '$elemMatch': {
-                'images': {
-                    '$elemMatch': {
-                        'image_name': name,
-                    },
-                },
-            },
-        }
-    if toolname is not None:
-        filt['name'] = toolname
-    if description is not None:
-        filt['description'] = description
-    if author:
-        filt['versions'] = {
-            '$elemMatch': {
-                'author': {
-                    '$in': [author],
-                },
-            },
-        }
-    if checker is not None:
-        filt['has_checker'] = checker
+    filt = compile_tools_filter(
+        id=id,
+        alias=alias,
+        toolClass=toolClass,
+        descriptorType=descriptorType,
+        registry=registry,
+        organization=organization,
+        name=name,
+        toolname=toolname,
+        description=description,
+        author=author,
+        checker=checker,
+    )
 
-    logger.info(f"offset {offset} limit {limit} ")
+    logger.info(f"offset {offset} cursor {cursor} limit {limit} ")
     # offset validation
-    if(offset is None):
+    if(offset is None or cursor is not None):
         offset_int = 0
     elif (offset is not None and int(offset) < 0):
         return [], '422', {}
@@ -224,16 +377,41 @@ def toolsGet(
     if(limit is not None and int(limit) < 0):
         return [], '422', {}
 
+    # resume after last record of previous page
+    if cursor:
+        try:
+            filt['_id'] = {'$gt': decode_cursor(cursor)}
+        except ValueError:
+            logger.error(f"Invalid pagination cursor: '{cursor}'")
+            raise BadRequest
+
     # fetch data
     db_coll_tools = (
         current_app.config.foca.db.dbs['trsStore']
         .collections['tools'].client
     )
+    mimetype = _get_stream_mimetype(stream=stream)
+    next_cursor = cursor or ''
+    if mimetype is not None and cursor is not None:
+        # the cursor for the next page is needed before streaming the page;
+        # bound the page by its last record, so that both agree
+        last_id = _get_last_id(
+            db_coll=db_coll_tools,
+            filt=filt,
+            limit=limit,
+        )
+        if last_id is not None:
+            next_cursor = encode_cursor(last_id)
+            filt['_id'] = {**filt.get('_id', {}), '$lte': last_id}
     records = db_coll_tools.find(
         filter=filt,
-        projection={"_id": False},
+        projection={
+            **PROJECTION_TOOLS,
+            '_etag': False,
+            **({} if mimetype is None else {'_id': False}),
+        },
     ).sort(
-        # Sort results by descending object ID (+/- oldest to newest)
+        # Sort results by ascending object ID (+/- oldest to newest)
         '_id', 1
     ).skip(
         # Skip number of records by given offset
@@ -243,37 +421,197 @@ def toolsGet(
         limit
     )
 
-    records = list(records)
-    for record in records:
-        if 'versions' in record:
-            for _version in record['versions']:
-                if 'files' in _version:
-                    del _version['files']
+    if mimetype is None:
+        records = list(records)
+        for record in records:
+            next_cursor = encode_cursor(record.pop('_id'))
 
-    previous_page_url = (
-        f"{request.base_url}?offset={max(offset_int - limit, 0)}"
-        f"&limit={limit}"
-    )
-    next_page_url = (
-        f"{request.base_url}?offset={offset_int + limit}&limit={limit}"
-    )
+    if cursor is None:
+        previous_page_url = (
+            f"{request.base_url}?offset={max(offset_int - limit, 0)}"
+            f"&limit={limit}"
+        )
+        next_page_url = (
+            f"{request.base_url}?offset={offset_int + limit}&limit={limit}"
+        )
+        current_offset = str(offset_int)
+    else:
+        # cursors only point forward; link back to the first page instead
+        previous_page_url = f"{request.base_url}?cursor=&limit={limit}"
+        next_page_url = (
+            f"{request.base_url}?cursor={next_cursor}&limit={limit}"
+        )
+        current_offset = cursor
 
     headers = {}
     headers['next_page'] = next_page_url
     headers['last_page'] = previous_page_url
     headers['self_link'] = f"{request.url}"
-    headers['current_offset'] = str(offset_int)
+    headers['current_offset'] = current_offset
     headers['current_limit'] = limit
 
+    if mimetype is not None:
+        serialize = (
+            stream_ndjson if mimetype == NDJSON_MIMETYPE
+            else stream_json_array
+        )
+        return Response(
+            serialize(
+                records=records.batch_size(STREAM_BATCH_SIZE),
+                batch_size=STREAM_BATCH_SIZE,
+            ),
+            mimetype=mimetype,
+            headers=headers,
+            # do not buffer the records, e.g., for response validation
+            direct_passthrough=True,
+        )
     return records, '200', headers
 
 
+@log_traffic
+def toolsSearchGet(
+    q: str,
+    id: Optional[str] = None,
+    alias: Optional[str] = None,
+    toolClass: Optional[str] = None,
+    descriptorType: Optional[str] = None,
+    registry: Optional[str] = None,
+    organization: Optional[str] = None,
+    name: Optional[str] = None,
+    toolname: Optional[str] = None,
+    description: Optional[str] = None,
+    author: Optional[str] = None,
+    checker: Optional[bool] = None,
+    limit: int = 1000,
+    cursor: Optional[str] = None,
+) -> Tuple[List, str, Dict]:
+    """Search tools by text, most relevant first.
+
+    Tool names, descriptions, organizations, aliases and version names and
+    authors are searched via the text index of the tools collection. Filter
+    parameters are the same as for `toolsGet()` and are additive.
+
+    Args:
+        q: Search terms; phrases are enclosed in double quotes and terms
+            prefixed with a minus sign are excluded.
+        id: Return only entries with the given identifier.
+        alias: Return only entries with the given alias.
+        toolClass: Return only entries with the given subclass name.
+        descriptorType: Return only entries with the given descriptor type.
+        registry: Return only entries from the given registry.
+        organization: Return only entries from the given organization.
+        name: Return only entries with the given image name.
+        toolname: Return only entries with the given tool name.
+        description: Return only entries with the given description.
+        author: Return only entries from the given author.
+        checker: Return only checker workflows.
+        limit: Number of records when paginating results.
+        cursor: Opaque cursor pointing to the last record of the previous
+            page when paginating results; if not provided or empty, the first
+            page is returned.
+
+    Returns:
+        List of tools matching the search terms and all filters, if
+        specified, ordered by decreasing relevance.
+
+    Raises:
+        BadRequest if the cursor is malformed.
+        InternalServerError if the text index of the tools collection is
+            missing.
+    """
+    filt = compile_tools_filter(
+        id=id,
+        alias=alias,
+        toolClass=toolClass,
+        descriptorType=descriptorType,
+        registry=registry,
+        organization=organization,
+        name=name,
+        toolname=toolname,
+        description=description,
+        author=author,
+        checker=checker,
+    )
+    after = None
+    if cursor:
+        try:
+            after = decode_search_cursor(cursor)
+        except ValueError:
+            logger.error(f"Invalid pagination cursor: '{cursor}'")
+            raise BadRequest
+
+    db_coll_tools = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['tools'].client
+    )
+    try:
+        records = list(db_coll_tools.aggregate(compile_search_pipeline(
+            q=q,
+            filt=filt,
+            limit=limit,
+            after=after,
+            projection={**PROJECTION_TOOLS, '_etag': False},
+        )))
+    except OperationFailure:
+        logger.exception(
+            "Text search failed; check that the text index of the 'tools' "
+            "collection is configured."
+        )
+        raise InternalServerError
+    next_cursor = cursor or ''
+    for record in records:
+        next_cursor = encode_search_cursor(
+            score=record.pop(SCORE_FIELD),
+            object_id=record.pop('_id'),
+        )
+
+    base_url = f"{request.base_url}?q={quote(q)}"
+    headers = {
+        'next_page': f"{base_url}&cursor={next_cursor}&limit={limit}",
+        # cursors only point forward; link back to the first page instead
+        'last_page': f"{base_url}&cursor=&limit={limit}",
+        'self_link': f"{request.url}",
+        'current_offset': cursor or '',
+        'current_limit': limit,
+    }
+    return records, '200', headers
+
+
+@log_traffic
+def toolsFacetsGet() -> Dict[str, List[Dict]]:
+    """Count tools per tool class name, descriptor type, organization and
+    container registry.
+
+    Counts are read from the facets collection, which is kept up to date
+    whenever tools are written or deleted. Until the counts have been
+    materialized by the facets migration, they are computed from the tools
+    collection instead.
+
+    Returns:
+        Values and the number of tools with each value, by facet, most
+        frequent values first.
+    """
+    if is_pending('facets'):
+        return count_facets(
+            db_coll_tools=(
+                current_app.config.foca.db.dbs['trsStore']
+                .collections['tools'].client
+            ),
+        )
+    return get_facets(
+        db_coll_facets=(
+            current_app.config.foca.db.dbs['trsStore']
+            .collections['facets'].client
+        ),
+    )
+
+
 @log_traffic
 def toolsIdVersionsVersionIdTypeDescriptorGet(
     type: str,
     id: str,
     version_id: str,
-) -> Dict:
+) -> Union[Dict, Response]:
     """Get the tool descriptor for the specified tool.
 
     Args:
@@ -284,39 +622,53 @@ def toolsIdVersionsVersionIdTypeDescriptorGet(
 
     Returns:
         The tool descriptor. Plain types return the bare descriptor while the
-        "non-plain" types return a descriptor wrapped with metadata.
+        "non-plain" types return a descriptor wrapped with metadata. An empty
+        `304 Not Modified` response is returned instead if the entity tag in
+        the request's `If-None-Match` header is current.
     """
     validate_descriptor_type(type=type)
-    ret = {}
-    db_coll_tools = (
+    _migrate_tool_files(id=id)
+    db_coll_files = (
         current_app.config.foca.db.dbs['trsStore']
-        .collections['tools'].client
+        .collections['files'].client
     )
-    proj = {
-        '_id': False,
-        'versions': {
-            '$elemMatch': {
-                'id': version_id,
-            },
-        },
+    db_coll_blobs = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['blobs'].client
+    )
+    filt = {
+        'tool_id': id,
+        'version_id': version_id,
+        'type': type,
+        'tool_file.file_type': 'PRIMARY_DESCRIPTOR',
     }
-    data = db_coll_tools.find(
-        filter={'id': id},
-        projection=proj,
+    response = _check_not_modified(
+        db_coll=db_coll_files,
+        filter=lambda etag: {**filt, '_etag': etag},
     )
-    try:
-        version_files_data = data[0]['versions'][0]['files']
-        for _d in version_files_data:
-            if (
-                _d['tool_file']['file_type'] == 'PRIMARY_DESCRIPTOR' and
-                _d['type'] == type
-            ):
-                ret = _d['file_wrapper']
-    except (IndexError, KeyError, TypeError):
-        raise NotFound
-    if not ret:
+    if response is not None:
+        return response
+    data = db_coll_files.find_one(
+        filter=filt,
+        projection={
+            '_id': False,
+            'file_wrapper': True,
+            'blob': True,
+            '_etag': True,
+        },
+    )
+    if data is not None:
+        data = next(resolve_contents(
+            db_coll_blobs=db_coll_blobs,
+            files=[data],
+        ))
+    if not data or not data.get('file_wrapper'):
         raise NotFound
-    return ret
+    etag = data.get('_etag')
+    if is_not_modified(etag):
+        return not_modified(etag)
+    set_etag(etag)
+    return data['file_wrapper']
 
 
 @log_traffic
@@ -325,7 +677,7 @@ def toolsIdVersionsVersionIdTypeDescriptorRelativePathGet(
     id: str,
     version_id: str,
     relative_path: str,
-) -> Dict:
+) -> Union[Dict, Response]:
     """Get additional tool descriptor files relative to the main file.
 
     Args:
@@ -340,50 +692,62 @@ def toolsIdVersionsVersionIdTypeDescriptorRelativePathGet(
 
     Returns:
         Additional files associated with a given descriptor type of a given
-        tool version.
+        tool version, or an empty `304 Not Modified` response if the entity
+        tag in the request's `If-None-Match` header is current.
     """
     logger.debug(f"Encoded relative path: '{relative_path}'")
     relative_path = unquote(relative_path)
     logger.debug(f"Decoded relative path: '{relative_path}'")
-    ret = {}
     validate_descriptor_type(type=type)
-    db_coll_tools = (
+    _migrate_tool_files(id=id)
+    db_coll_files = (
         current_app.config.foca.db.dbs['trsStore']
-        .collections['tools'].client
+        .collections['files'].client
     )
-    proj = {
-        '_id': False,
-        'versions': {
-            '$elemMatch': {
-                'id': version_id,
-            },
-        },
-    }
-    data = db_coll_tools.find(
-        filter={'id': id},
-        projection=proj,
+    db_coll_blobs = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['blobs'].client
     )
-
     file_types = [
         'OTHER',
         'TEST_FILE',
         'PRIMARY_DESCRIPTOR',
         'SECONDARY_DESCRIPTOR',
     ]
-    try:
-        version_data = data[0]['versions'][0]['files']
-        for _d in version_data:
-            if (
-                _d['tool_file']['path'] == relative_path and
-                _d['tool_file']['file_type'] in file_types and
-                _d['type'] == type
-            ):
-                ret = _d['file_wrapper']
-    except (IndexError, KeyError, TypeError):
-        raise NotFound
-    if not ret:
+    filt = {
+        'tool_id': id,
+        'version_id': version_id,
+        'type': type,
+        'tool_file.path': relative_path,
+        'tool_file.file_type': {'$in': file_types},
+    }
+    response = _check_not_modified(
+        db_coll=db_coll_files,
+        filter=lambda etag: {**filt, '_etag': etag},
+    )
+    if response is not None:
+        return response
+    data = db_coll_files.find_one(
+        filter=filt,
+        projection={
+            '_id': False,
+            'file_wrapper': True,
+            'blob': True,
+            '_etag': True,
+        },
+    )
+    if data is not None:
+        data = next(resolve_contents(
+            db_coll_blobs=db_coll_blobs,
+            files=[data],
+        ))
+    if not data or not data.get('file_wrapper'):
         raise NotFound
-    return ret
+    etag = data.get('_etag')
+    if is_not_modified(etag):
+        return not_modified(etag)
+    set_etag(etag)
+    return data['file_wrapper']
 
 
 @log_traffic
@@ -405,42 +769,32 @@ def toolsIdVersionsVersionIdTypeTestsGet(
         tool version.
     """
     validate_descriptor_type(type=type)
+    _migrate_tool_files(id=id)
 
-    db_coll_tools = (
+    db_coll_files = (
         current_app.config.foca.db.dbs['trsStore']
-        .collections['tools'].client
+        .collections['files'].client
+    )
+    db_coll_blobs = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['blobs'].client
     )
 
-    proj = {
-        '_id': False,
-        'versions': {
-            '$elemMatch': {
-                'id': version_id,
-                'files': {
-                    '$elemMatch': {
-                        'type': type,
-                        'tool_file.file_type': 'TEST_FILE',
-                    },
-                },
-            },
+    data = db_coll_files.find(
+        filter={
+            'tool_id': id,
+            'version_id': version_id,
+            'type': type,
+            'tool_file.file_type': 'TEST_FILE',
         },
-    }
-
-    data = db_coll_tools.find(
-        filter={'id': id},
-        projection=proj,
+        projection={'_id': False, 'file_wrapper': True, 'blob': True},
     )
 
-    try:
-        ret_array = []
-        version_data = data[0]['versions'][0]['files']
-        for _d in version_data:
-            if (
-                _d['tool_file']['file_type'] == 'TEST_FILE' and
-                _d['type'] == type
-            ):
-                ret_array.append(_d['file_wrapper'])
-    except (IndexError, KeyError, TypeError):
+    ret_array = [
+        d['file_wrapper']
+        for d in resolve_contents(db_coll_blobs=db_coll_blobs, files=data)
+    ]
+    if not ret_array:
         raise NotFound
     return ret_array
 
@@ -451,7 +805,7 @@ def toolsIdVersionsVersionIdTypeFilesGet(
     id: str,
     version_id: str,
     format: Optional[str] = None,
-) -> List:
+) -> Union[List, Response]:
     """Get the tool_file specification(s) for the specified tool version.
 
     Args:
@@ -459,22 +813,17 @@ def toolsIdVersionsVersionIdTypeFilesGet(
             values are "CWL", "WDL", "NFL", "GALAXY".
         id: Tool identifier.
         version_id: Tool version identifier.
+        format: Set to "zip" to get a zip archive of all files instead.
 
     Returns:
-        List of file JSON responses.
+        List of file JSON responses, or a streamed zip archive of the files
+        if `format` is "zip".
     """
     validate_descriptor_type(type=type)
-    db_coll_tools = (
+    _migrate_tool_files(id=id)
+    db_coll_files = (
         current_app.config.foca.db.dbs['trsStore']
-        .collections['tools'].client
-    )
-    proj = {
-        '_id': False,
-        'versions': {'$elemMatch': {'id': version_id}},
-    }
-    data = db_coll_tools.find_one(
-        filter={'id': id},
-        projection=proj,
+        .collections['files'].client
     )
 
     file_types = [
@@ -483,15 +832,24 @@ def toolsIdVersionsVersionIdTypeFilesGet(
         'PRIMARY_DESCRIPTOR',
         'SECONDARY_DESCRIPTOR',
     ]
-    try:
-        data = data['versions'][0]
-        ret = [
-            d['tool_file'] for d in data['files']
-            if d['type'] == type and d['tool_file']['file_type'] in file_types
-        ]
-    except (IndexError, KeyError, TypeError):
-        raise NotFound
-    return ret
+    filt = {
+        'tool_id': id,
+        'version_id': version_id,
+        'type': type,
+        'tool_file.file_type': {'$in': file_types},
+    }
+    if format == 'zip':
+        return _get_files_archive(
+            db_coll_files=db_coll_files,
+            filter=filt,
+            name=f"{id}_{version_id}_{type}",
+        )
+    validate_version_exists(id=id, version_id=version_id)
+    data = db_coll_files.find(
+        filter=filt,
+        projection={'_id': False, 'tool_file': True},
+    )
+    return [d['tool_file'] for d in data]
 
 
 @log_traffic
@@ -508,26 +866,27 @@ def toolsIdVersionsVersionIdContainerfileGet(
     Returns:
         List of wrapped containerfile objects.
     """
-    db_coll_tools = (
+    _migrate_tool_files(id=id)
+    db_coll_files = (
         current_app.config.foca.db.dbs['trsStore']
-        .collections['tools'].client
+        .collections['files'].client
     )
-    proj = {
-        '_id': False,
-        'versions': {'$elemMatch': {'id': version_id}},
-    }
-    data = db_coll_tools.find_one(
-        filter={'id': id},
-        projection=proj,
+    db_coll_blobs = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['blobs'].client
     )
-    try:
-        data = data['versions'][0]
-        ret = [
-            d['file_wrapper'] for d in data['files']
-            if d['tool_file']['file_type'] == 'CONTAINERFILE'
-        ]
-    except (IndexError, KeyError, TypeError):
-        raise NotFound
+    data = db_coll_files.find(
+        filter={
+            'tool_id': id,
+            'version_id': version_id,
+            'tool_file.file_type': 'CONTAINERFILE',
+        },
+        projection={'_id': False, 'file_wrapper': True, 'blob': True},
+    )
+    ret = [
+        d['file_wrapper']
+        for d in resolve_contents(db_coll_blobs=db_coll_blobs, files=data)
+    ]
     if not ret:
         raise NotFound
     return ret
@@ -538,29 +897,31 @@ def toolClassesGet(
 ) -> List:
     """List all tool classes.
 
+    Tool classes are served from the process-local catalogue.
+
     Returns:
         List of tool class objects.
     """
-    db_collection_class = (
-        current_app.config.foca.db.dbs['trsStore']
-        .collections['toolclasses'].client
-    )
-    records = db_collection_class.find(
-        filter={},
-        projection={"_id": False},
-    )
-    return list(records)
+    return get_tool_class_catalogue().get_all()
 
 
 @log_traffic
-def getServiceInfo() -> Dict:
+def getServiceInfo() -> Response:
     """Show information about this service.
 
+    The service info is served from a process-local cache, already
+    serialized.
+
     Returns:
-        An empty 201 response with headers.
+        Service info, or an empty `304 Not Modified` response if the entity
+        tag in the request's `If-None-Match` header is current.
     """
-    service_info = RegisterServiceInfo()
-    return service_info.get_service_info()
+    body, etag = get_service_info_cache().get()
+    if is_not_modified(etag):
+        return not_modified(etag)
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
 
 
 @log_traffic
@@ -576,37 +937,77 @@ def postServiceInfo() -> Tuple[None, str, Dict]:
 
 
 @log_traffic
-def postTool() -> str:
+def postTool() -> Union[str, Tuple[Dict, str, Dict]]:
     """Add tool with an auto-generated ID.
 
     Returns:
-        Identifier of created tool.
+        Identifier of created tool or, if asynchronous processing was
+        requested, a 202 response describing the job that retrieves file
+        contents.
     """
-    tool = RegisterTool(data=request.json)
+    defer = _prefers_async()
+    tool = RegisterTool(
+        data=request.json,
+        defer_content=defer,
+    )
     tool.register_metadata()
+    if defer:
+        return _accept_job(
+            tool_id=tool.data['id'],
+            version_ids=[v['id'] for v in tool.data['versions']],
+        )
     return tool.data['id']
 
 
 @log_traffic
 def putTool(
     id: str,
-) -> str:
+) -> Union[str, Tuple[Dict, str, Dict]]:
     """Add/replace tool with a user-supplied ID.
 
     Args:
         id: Identifier of tool to be created/updated.
 
     Returns:
-        Identifier of created/updated tool.
+        Identifier of created/updated tool or, if asynchronous processing was
+        requested, a 202 response describing the job that retrieves file
+        contents.
     """
+    defer = _prefers_async()
     tool = RegisterTool(
         data=request.json,
         id=id,
+        defer_content=defer,
     )
     tool.register_metadata()
+    if defer:
+        return _accept_job(
+            tool_id=tool.data['id'],
+            version_ids=[v['id'] for v in tool.data['versions']],
+        )
     return tool.data['id']
 
 
+@log_traffic
+def toolsBatchRegister(
+    batch: Dict,
+) -> Dict:
+    """Add/replace multiple tools.
+
+    Args:
+        batch: Request body, with a list of items, each with tool metadata
+            under `tool` and, optionally, a user-supplied tool identifier
+            under `id`.
+
+    Returns:
+        Response body, with a result for each item, in the order requested.
+        Each result holds the `id` of the created/updated tool or an `error`
+        if the tool could not be registered.
+    """
+    tools = RegisterTools(items=batch['items'])
+    return {'items': tools.register_metadata()}
+
+
 @log_traffic
 def deleteTool(
     id: str,
@@ -623,9 +1024,32 @@ def deleteTool(
         current_app.config.foca.db.dbs['trsStore']
         .collections['tools'].client
     )
-    del_obj_tools = db_coll_tools.delete_one({'id': id})
-
-    if del_obj_tools.deleted_count:
+    db_coll_files = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['files'].client
+    )
+    deleted = db_coll_tools.find_one_and_delete(
+        filter={'id': id},
+        projection=PROJECTION_FACETS,
+    )
+    get_tool_cache().invalidate(id)
+
+    if deleted is not None:
+        update_facets(
+            db_coll_facets=(
+                current_app.config.foca.db.dbs['trsStore']
+                .collections['facets'].client
+            ),
+            before=[deleted],
+        )
+        delete_files(
+            db_coll_files=db_coll_files,
+            db_coll_blobs=(
+                current_app.config.foca.db.dbs['trsStore']
+                .collections['blobs'].client
+            ),
+            tool_id=id,
+        )
         return id
     else:
         raise NotFound
@@ -634,20 +1058,26 @@ def deleteTool(
 @log_traffic
 def postToolVersion(
     id: str,
-) -> str:
+) -> Union[str, Tuple[Dict, str, Dict]]:
     """Add tool version with an auto-generated ID.
 
     Args:
         id: Identifier of tool to be modified.
 
     Returns:
-        Identifier of created tool version.
+        Identifier of created tool version or, if asynchronous processing was
+        requested, a 202 response describing the job that retrieves file
+        contents.
     """
+    defer = _prefers_async()
     version = RegisterToolVersion(
         id=id,
         data=request.json,
+        defer_content=defer,
     )
     version.register_metadata()
+    if defer:
+        return _accept_job(tool_id=id, version_ids=[version.data['id']])
     return version.data['id']
 
 
@@ -655,7 +1085,7 @@ def postToolVersion(
 def putToolVersion(
     id: str,
     version_id: str,
-) -> str:
+) -> Union[str, Tuple[Dict, str, Dict]]:
     """Add/replace tool version with a user-supplied ID.
 
     Args:
@@ -663,14 +1093,20 @@ def putToolVersion(
         id: Identifier of tool to be created/updated.
 
     Returns:
-        Identifier of created tool version.
+        Identifier of created tool version or, if asynchronous processing was
+        requested, a 202 response describing the job that retrieves file
+        contents.
     """
+    defer = _prefers_async()
     version = RegisterToolVersion(
         id=id,
         version_id=version_id,
         data=request.json,
+        defer_content=defer,
     )
     version.register_metadata()
+    if defer:
+        return _accept_job(tool_id=id, version_ids=[version.data['id']])
     return version.data['id']
 
 
@@ -695,6 +1131,10 @@ def deleteToolVersion(
         .collections['tools'].client
     )
 
+    tool = db_coll_tools.find_one(
+        filter={'id': id},
+        projection={**PROJECTION_FACETS, '_etag': True, 'versions.id': True},
+    )
     filt = {
         'id': id,
         'versions.id': version_id,
@@ -703,17 +1143,50 @@ def deleteToolVersion(
         '$pull': {
             'versions': {'id': version_id},
         },
+        '$set': {
+            '_etag': compute_etag({
+                'tool': (tool or {}).get('_etag'),
+                'deleted_version': version_id,
+            }),
+        },
     }
     del_ver_tools = db_coll_tools.update_one(
         filter=filt,
         update=update,
     )
+    get_tool_cache().invalidate(id)
 
     if not del_ver_tools.matched_count:
         raise NotFound
     elif not del_ver_tools.modified_count:
         raise InternalServerError
     else:
+        update_facets(
+            db_coll_facets=(
+                current_app.config.foca.db.dbs['trsStore']
+                .collections['facets'].client
+            ),
+            before=[tool],
+            after=[{
+                **tool,
+                'versions': [
+                    version for version in tool.get('versions', [])
+                    if version.get('id') != version_id
+                ],
+            }],
+        )
+        delete_files(
+            db_coll_files=(
+                current_app.config.foca.db.dbs['trsStore']
+                .collections['files'].client
+            ),
+            db_coll_blobs=(
+                current_app.config.foca.db.dbs['trsStore']
+                .collections['blobs'].client
+            ),
+            tool_id=id,
+            version_id=version_id,
+        )
         return version_id
 
 
@@ -768,17 +1241,67 @@ def deleteToolClass(
         current_app.config.foca.db.dbs['trsStore']
         .collections['toolclasses'].client
     )
+    db_coll_tools = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['tools'].client
+    )
 
-    # do not allow deleting tool class associated with tool
-    if id in [t['toolclass']['id'] for t in toolsGet.__wrapped__()[0]]:
+    # do not allow deleting tool class associated with tool; a single lookup
+    # on the `toolclass.id` index
+    if db_coll_tools.find_one(
+        filter={'toolclass.id': id},
+        projection={'_id': True},
+    ) is not None:
+        logger.error(f"Tool class '{id}' is associated with tools.")
         raise BadRequest
 
     if db_coll_classes.delete_one({'id': id}).deleted_count:
+        get_tool_class_catalogue().invalidate()
         return id
     else:
         raise NotFound
 
 
+@log_traffic
+def getJob(
+    id: str,
+) -> Dict:
+    """Get status of a background job.
+
+    Args:
+        id: Job identifier.
+
+    Returns:
+        Job object.
+    """
+    return get_job(id=id)
+
+
+def validate_version_exists(
+    id: str,
+    version_id: str,
+) -> None:
+    """Validate that a tool version exists.
+
+    Args:
+        id: Tool identifier.
+        version_id: Tool version identifier.
+
+    Raises:
+        NotFound: Tool or tool version is not available.
+    """
+    db_coll_tools = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['tools'].client
+    )
+    data = db_coll_tools.find_one(
+        filter={'id': id, 'versions.id': version_id},
+        projection={'_id': True},
+    )
+    if data is None:
+        raise NotFound
+
+
 def validate_descriptor_type(type: str) -> None:
     """Validate tool descriptor type.
 
@@ -788,11 +1311,275 @@ def validate_descriptor_type(type: str) -> None:
     Raises:
         BadRequest: Provided descriptor type is invalid.
     """
-    valid_types = [f"PLAIN_{t}" for t in RegisterToolVersion.descriptor_types]
-    valid_types += RegisterToolVersion.descriptor_types
-
-    if type not in valid_types:
+    if type not in VALID_DESCRIPTOR_TYPES:
         logger.error(
-            f"Specified type '{type}' not among valid types: {valid_types}'"
+            f"Specified type '{type}' not among valid types: "
+            f"{VALID_DESCRIPTOR_TYPES}'"
         )
         raise BadRequest
+
+
+def _migrate_tool_files(id: str) -> None:
+    """Move files still embedded in a tool to the files collection.
+
+    Until the files migration has completed, tools stored by previous
+    versions of the app are migrated when their files are first accessed.
+
+    Args:
+        id: Tool identifier.
+    """
+    if not is_pending('files'):
+        return
+    migrate_files(
+        db_coll_tools=(
+            current_app.config.foca.db.dbs['trsStore']
+            .collections['tools'].client
+        ),
+        db_coll_files=(
+            current_app.config.foca.db.dbs['trsStore']
+            .collections['files'].client
+        ),
+        db_coll_blobs=(
+            current_app.config.foca.db.dbs['trsStore']
+            .collections['blobs'].client
+        ),
+        codec=get_content_codec(),
+        tool_id=id,
+    )
+
+
+def _check_not_modified(
+    db_coll,
+    filter: Callable[[str], Dict],
+) -> Optional[Response]:
+    """Answer a conditional request without loading the requested object.
+
+    Checks for each entity tag in the request's `If-None-Match` header
+    whether the database holds a matching object, projecting only the
+    object's identifier.
+
+    Args:
+        db_coll: Database collection to query.
+        filter: Callable returning the query filter for a given entity tag.
+
+    Returns:
+        An empty `304 Not Modified` response if any of the entity tags is
+        current, else `None`.
+    """
+    for etag in get_if_none_match():
+        if db_coll.find_one(
+            filter=filter(etag),
+            projection={'_id': True},
+        ) is not None:
+            return not_modified(etag)
+    return None
+
+
+def _filter_version(
+    id: str,
+    version_id: str,
+    etag: str,
+) -> Dict:
+    """Build query filter matching a tool version by its entity tag.
+
+    Args:
+        id: Tool identifier.
+        version_id: Tool version identifier.
+        etag: Entity tag of the tool version.
+
+    Returns:
+        Query filter.
+    """
+    return {
+        'id': id,
+        'versions': {
+            '$elemMatch': {
+                'id': version_id,
+                '_etag': etag,
+            },
+        },
+    }
+
+
+def _get_files_archive(
+    db_coll_files,
+    filter: Dict,
+    name: str,
+) -> Response:
+    """Get zip archive of tool version files.
+
+    Archives are built incrementally while being streamed to the client and
+    cached until the tool version changes.
+
+    Args:
+        db_coll_files: Database collection for storing file objects.
+        filter: Query filter selecting the files of a tool version.
+        name: Base name of archive file.
+
+    Returns:
+        Streamed zip archive, or an empty `304 Not Modified` response if the
+        entity tag in the request's `If-None-Match` header is current.
+
+    Raises:
+        NotFound: Tool or tool version is not available.
+    """
+    db_coll_tools = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['tools'].client
+    )
+    data = db_coll_tools.find_one(
+        filter={'id': filter['tool_id']},
+        projection={
+            '_id': False,
+            'versions': {'$elemMatch': {'id': filter['version_id']}},
+        },
+    )
+    try:
+        version = data['versions'][0]
+    except (IndexError, KeyError, TypeError):
+        raise NotFound
+    etag = compute_etag({
+        'filter': filter,
+        'meta_version': version.get('meta_version'),
+        'version': version.get('_etag'),
+    })
+    if is_not_modified(etag):
+        return not_modified(etag)
+
+    cache = get_archive_cache()
+    path = cache.get(etag)
+    if path is not None:
+        response = send_file(
+            path,
+            mimetype='application/zip',
+            as_attachment=True,
+            download_name=f"{name}.zip",
+            etag=etag,
+        )
+    else:
+        files = db_coll_files.find(
+            filter=filter,
+            projection={
+                '_id': False,
+                'tool_file.path': True,
+                'file_wrapper.content': True,
+                'blob': True,
+            },
+        )
+        entries = (
+            (
+                _f['tool_file']['path'],
+                _f.get('file_wrapper', {}).get('content', ''),
+            )
+            for _f in resolve_contents(
+                db_coll_blobs=(
+                    current_app.config.foca.db.dbs['trsStore']
+                    .collections['blobs'].client
+                ),
+                files=files,
+            )
+        )
+        response = Response(
+            cache.store(etag, stream_zip(entries)),
+            mimetype='application/zip',
+            headers={
+                'Content-Disposition': f'attachment; filename="{name}.zip"',
+            },
+            # do not buffer the archive, e.g., for response validation
+            direct_passthrough=True,
+        )
+        response.set_etag(etag)
+    return response
+
+
+def _get_stream_mimetype(stream: Optional[bool] = False) -> Optional[str]:
+    """Get media type of a streamed list of records.
+
+    Args:
+        stream: Whether the client asked for a streamed JSON array.
+
+    Returns:
+        `application/x-ndjson` if the client prefers newline-delimited JSON,
+        `application/json` if it asked for a streamed JSON array, else `None`.
+    """
+    best_match = request.accept_mimetypes.best_match(
+        ['application/json', NDJSON_MIMETYPE],
+    )
+    if best_match == NDJSON_MIMETYPE:
+        return NDJSON_MIMETYPE
+    if stream:
+        return 'application/json'
+    return None
+
+
+def _get_last_id(
+    db_coll,
+    filt: Dict,
+    limit: int,
+) -> Optional[ObjectId]:
+    """Get database object identifier of the last record of a page.
+
+    Only object identifiers are read from the database.
+
+    Args:
+        db_coll: Database collection.
+        filt: Filter selecting the records following the previous page.
+        limit: Number of records per page; `0` selects all records.
+
+    Returns:
+        Object identifier of the last record of the page, or `None` if there
+        are no records.
+    """
+    if limit:
+        for record in db_coll.find(
+            filter=filt,
+            projection={'_id': True},
+        ).sort('_id', 1).skip(limit - 1).limit(1):
+            return record['_id']
+    # fewer records than the page size
+    for record in db_coll.find(
+        filter=filt,
+        projection={'_id': True},
+    ).sort('_id', -1).limit(1):
+        return record['_id']
+    return None
+
+
+def _prefers_async() -> bool:
+    """Check whether the client asked for asynchronous processing.
+
+    Returns:
+        `True` if the request's `Prefer` header includes the `respond-async`
+        preference, else `False`.
+    """
+    preferences = request.headers.get('Prefer', '')
+    return any(
+        pref.split(';')[0].strip().lower() == 'respond-async'
+        for pref in preferences.split(',')
+    )
+
+
+def _accept_job(
+    tool_id: str,
+    version_ids: List[str],
+) -> Tuple[Dict, str, Dict]:
+    """Submit job retrieving file contents and build 202 response.
+
+    Args:
+        tool_id: Tool identifier.
+        version_ids: Identifiers of the tool versions whose file contents are
+            to be retrieved.
+
+    Returns:
+        Job object, status code and headers pointing to the job status.
+    """
+    conf = current_app.config.foca.custom.service
+    job = submit_job(tool_id=tool_id, version_ids=version_ids)
+    headers = {
+        'Location': (
+            f"{conf.url_prefix}://{conf.external_host}:{conf.external_port}/"
+            f"{conf.api_path}/jobs/{job['id']}"
+        ),
+        'Preference-Applied': 'respond-async',
+    }
+    return job, '202', headers
@@ -0,0 +1,109 @@
+"""Expected database indexes."""
+
+import logging
+from typing import (Any, Dict, List, Tuple, Union)
+
+from foca.models.config import DBConfig
+
+logger = logging.getLogger(__name__)
+
+# indexes backing the lookups and `GET /tools` filters; keep in sync with the
+# `db` section of `config.yaml`
+EXPECTED_INDEXES: Dict[str, List[List[Tuple[str, Union[int, str]]]]] = {
+    'tools': [
+        [('id', 1)],
+        [('aliases', 1)],
+        [('toolclass.id', 1)],
+        [('toolclass.name', 1)],
+        [('organization', 1)],
+        [('name', 1)],
+        [('description', 1)],
+        [('has_checker', 1)],
+        [('versions.descriptor_type', 1)],
+        [('versions.author', 1)],
+        [('versions.images.registry_host', 1)],
+        [('versions.images.image_name', 1)],
+        # text index backing `GET /tools/search`; fields in alphabetical order
+        [
+            ('aliases', 'text'),
+            ('description', 'text'),
+            ('name', 'text'),
+            ('organization', 'text'),
+            ('versions.author', 'text'),
+            ('versions.name', 'text'),
+        ],
+    ],
+    'toolclasses': [
+        [('id', 1)],
+    ],
+    'files': [
+        [
+            ('tool_id', 1),
+            ('version_id', 1),
+            ('type', 1),
+            ('tool_file.path', 1),
+        ],
+        [('blob', 1)],
+    ],
+    'blobs': [
+        [('refcount', 1)],
+    ],
+    'facets': [
+        [('facet', 1), ('value', 1)],
+    ],
+    'jobs': [
+        [('id', 1)],
+        [('state', 1)],
+    ],
+    'service_info': [
+        [('id', 1)],
+    ],
+}
+
+
+def check_indexes(
+    db: DBConfig,
+    expected: Dict[
+        str, List[List[Tuple[str, Union[int, str]]]]
+    ] = EXPECTED_INDEXES,
+) -> List[Tuple[str, List[Tuple[str, Union[int, str]]]]]:
+    """Check that all expected indexes are available.
+
+    A warning is logged for every missing index, as queries relying on it
+    will need to scan the entire collection.
+
+    Args:
+        db: Database config, with collection clients set up.
+        expected: Lists of index keys (field-direction tuples), by collection
+            name. Fields of text indexes are listed in alphabetical order.
+
+    Returns:
+        Tuples of collection name and index keys for every missing index.
+    """
+    missing = []
+    for coll_name, indexes in expected.items():
+        coll = db.collections[coll_name].client
+        available = [
+            _get_keys(info) for info in coll.index_information().values()
+        ]
+        for keys in indexes:
+            if keys not in available:
+                logger.warning(
+                    f"Index {keys} missing for collection '{coll_name}'. "
+                    "Queries on the indexed fields will scan the entire "
+                    "collection; add the index to the 'db' section of the "
+                    "app configuration."
+                )
+                missing.append((coll_name, keys))
+    return missing
+
+
+def _get_keys(info: Dict[str, Any]) -> List[Tuple[str, Union[int, str]]]:
+    """Get keys of an index from its description.
+
+    MongoDB keys text indexes by internal fields; the indexed fields are only
+    listed as weights.
+    """
+    if 'weights' in info:
+        return [(field, 'text') for field in sorted(info['weights'])]
+    return list(info['key'])
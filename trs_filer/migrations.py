@@ -0,0 +1,201 @@
+"""One-off migrations of data stored by previous versions of the app.
+
+Migrations are run by the `trs-filer migrate` command, rather than when the
+app starts, so that the service is available while they run. Until they have
+completed, endpoints handle data that is not migrated yet.
+"""
+
+from datetime import datetime
+import logging
+from typing import (Callable, List, Optional, Set, Tuple)
+
+from flask import current_app
+from foca.models.config import DBConfig
+from pymongo.collection import Collection
+
+from trs_filer.ga4gh.trs.endpoints.codecs import ContentCodec
+from trs_filer.ga4gh.trs.endpoints.facets import rebuild_facets
+from trs_filer.ga4gh.trs.endpoints.files import (
+    migrate_blobs,
+    migrate_files,
+)
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = 'trs_filer.completed_migrations'
+
+# prefix of the keys of completion markers in the generations collection
+MARKER_PREFIX = 'migration.'
+
+
+def _migrate_files(db: DBConfig, codec: Optional[ContentCodec]) -> bool:
+    """Move files embedded in tools; complete once no tool embeds files."""
+    db_coll_tools = db.collections['tools'].client
+    migrate_files(
+        db_coll_tools=db_coll_tools,
+        db_coll_files=db.collections['files'].client,
+        db_coll_blobs=db.collections['blobs'].client,
+        codec=codec,
+    )
+    return db_coll_tools.find_one(
+        filter={'versions.files': {'$exists': True}},
+        projection={'_id': True},
+    ) is None
+
+
+def _migrate_blobs(db: DBConfig, codec: Optional[ContentCodec]) -> bool:
+    """Move embedded contents; complete once no file embeds its content."""
+    db_coll_files = db.collections['files'].client
+    migrate_blobs(
+        db_coll_files=db_coll_files,
+        db_coll_blobs=db.collections['blobs'].client,
+        codec=codec,
+    )
+    return db_coll_files.find_one(
+        filter={'file_wrapper.content': {'$exists': True}},
+        projection={'_id': True},
+    ) is None
+
+
+def _rebuild_facets(db: DBConfig, codec: Optional[ContentCodec]) -> bool:
+    """Count tools per facet value; counts are maintained afterwards.
+
+    Counts are replaced, as tools written before the migration may have
+    been counted incrementally already.
+    """
+    rebuild_facets(
+        db_coll_tools=db.collections['tools'].client,
+        db_coll_facets=db.collections['facets'].client,
+        force=True,
+    )
+    return True
+
+
+# migrations in the order they are run
+MIGRATIONS: List[
+    Tuple[str, Callable[[DBConfig, Optional[ContentCodec]], bool]]
+] = [
+    ('files', _migrate_files),
+    ('blobs', _migrate_blobs),
+    ('facets', _rebuild_facets),
+]
+
+
+def run_migrations(
+    db: DBConfig,
+    codec: Optional[ContentCodec] = None,
+) -> List[str]:
+    """Run migrations that have not been completed before.
+
+    A migration is marked as completed in the generations collection once
+    no data is left to migrate, so that subsequent runs skip it. Migrations
+    process one object at a time, can run while the service is up and can be
+    interrupted and resumed.
+
+    Args:
+        db: Database config, with collection clients set up.
+        codec: Codec for compressing contents. If not provided, contents are
+            stored uncompressed.
+
+    Returns:
+        Names of migrations that were run.
+    """
+    db_coll_generations = db.collections['generations'].client
+    completed = _get_completed(db_coll_generations=db_coll_generations)
+    run = []
+    for name, migrate in MIGRATIONS:
+        if name in completed:
+            continue
+        run.append(name)
+        if not migrate(db, codec):
+            logger.info(
+                f"Migration '{name}' incomplete; resuming on next run."
+            )
+            continue
+        _mark_completed(db_coll_generations=db_coll_generations, name=name)
+    return run
+
+
+def check_migrations(db: DBConfig) -> List[str]:
+    """Check for migrations that have not been completed, without running
+    them.
+
+    If no tools are stored, there is nothing to migrate and all migrations
+    are marked as completed. Otherwise, a warning is logged for pending
+    migrations.
+
+    Args:
+        db: Database config, with collection clients set up.
+
+    Returns:
+        Names of pending migrations.
+    """
+    db_coll_generations = db.collections['generations'].client
+    completed = _get_completed(db_coll_generations=db_coll_generations)
+    pending = [name for name, _ in MIGRATIONS if name not in completed]
+    if not pending:
+        return []
+    if db.collections['tools'].client.find_one(
+        projection={'_id': True},
+    ) is None:
+        for name in pending:
+            _mark_completed(db_coll_generations=db_coll_generations, name=name)
+        return []
+    logger.warning(
+        f"Migrations {pending} of data stored by previous versions of the "
+        "app are pending; run 'trs-filer migrate' to complete them. Data "
+        "that is not migrated yet is handled on access in the meantime."
+    )
+    return pending
+
+
+def is_pending(name: str) -> bool:
+    """Check whether a migration has not been completed yet.
+
+    Completed migrations are remembered by the current app, so that the
+    completion marker is no longer read once it is set.
+
+    Args:
+        name: Name of migration.
+
+    Returns:
+        Whether migration is pending.
+    """
+    completed: Set[str] = current_app.extensions.setdefault(
+        EXTENSION_KEY,
+        set(),
+    )
+    if name in completed:
+        return False
+    db_coll_generations = (
+        current_app.config.foca.db.dbs['trsStore']
+        .collections['generations'].client
+    )
+    if db_coll_generations.find_one(
+        filter={'_id': f"{MARKER_PREFIX}{name}"},
+        projection={'_id': True},
+    ) is None:
+        return True
+    completed.add(name)
+    return False
+
+
+def _get_completed(db_coll_generations: Collection) -> Set[str]:
+    """Get names of completed migrations."""
+    return {
+        doc['_id'][len(MARKER_PREFIX):] for doc in db_coll_generations.find(
+            filter={'_id': {'$in': [
+                f"{MARKER_PREFIX}{name}" for name, _ in MIGRATIONS
+            ]}},
+            projection={'_id': True},
+        )
+    }
+
+
+def _mark_completed(db_coll_generations: Collection, name: str) -> None:
+    """Mark migration as completed."""
+    db_coll_generations.update_one(
+        filter={'_id': f"{MARKER_PREFIX}{name}"},
+        update={'$setOnInsert': {'completed_at': datetime.utcnow()}},
+        upsert=True,
+    )
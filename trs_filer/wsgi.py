@@ -1,5 +1,9 @@
 """WSGI entry point."""
 
 from trs_filer.app import init_app
+from trs_filer.ga4gh.trs.endpoints.jobs import recover_jobs
 
 app = init_app()
+
+# resume jobs of worker processes that have stopped
+recover_jobs(app=app.app)